@@ -0,0 +1,156 @@
+"""
+송신 경로(egress) 풀 검증/벤치마크 - 로컬 프록시 대역(stand-in)
+경로마다 총 대역폭이 제한된 로컬 HTTP 프록시를 띄워 IP별 속도 제한을 흉내내고,
+단일 경로 대비 경로 풀의 전체 처리량과 429 경로의 쿨다운(배제) 동작을 확인합니다.
+프록시 중 하나는 처음 몇 요청에 429를 돌려줍니다.
+
+사용법: python benchmarks/bench_egress.py [작업 수] [프록시 수]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yt_dlp.extractor.common import InfoExtractor
+
+from core.downloader import Downloader
+from core.egress import EgressPool
+from core.ydl_pool import YDLPool
+from utils import history
+from utils.storage import format_bytes
+
+FILE_SIZE = 256 * 1024
+RATE_PER_PROXY = 512 * 1024  # bytes/s (프록시 하나의 총 대역폭 = IP 하나의 속도 제한)
+THROTTLED_REQUESTS = 2       # 429 프록시가 거부할 요청 수
+CHUNK = 16 * 1024
+
+
+class MediaIE(InfoExtractor):
+    """'media:<id>' → 존재하지 않는 호스트의 단일 포맷 (프록시를 거치지 않으면 실패)"""
+    IE_NAME = 'media'
+    _VALID_URL = r'media:(?P<id>[\w-]+)'
+
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+        return {
+            'id': video_id, 'title': f"Media {video_id}",
+            'formats': [{
+                'format_id': 'av', 'ext': 'mp4', 'vcodec': 'avc1', 'acodec': 'mp4a', 'height': 360,
+                'filesize': FILE_SIZE, 'url': f"http://media.invalid/{video_id}.mp4?size={FILE_SIZE}",
+            }],
+        }
+
+
+class MediaPool(YDLPool):
+    def _create(self, opts):
+        ydl = super()._create(opts)
+        ydl.add_info_extractor(MediaIE())
+        # 범용(Generic) 추출기보다 먼저 매칭되도록 맨 앞으로
+        ydl._ies = {'Media': ydl._ies.pop('Media'), **ydl._ies}
+        return ydl
+
+
+class ThrottledProxy:
+    """총 대역폭을 제한하는 로컬 프록시 대역 (원본 서버 대신 요청 크기만큼 바이트를 직접 응답)"""
+
+    def __init__(self, reject_first: int = 0):
+        self.reject_left = reject_first
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with proxy.lock:
+                    reject = proxy.reject_left > 0
+                    if reject: proxy.reject_left -= 1
+                if reject:
+                    self.send_error(429, "Too Many Requests")
+                    return
+                size = int(parse_qs(urlparse(self.path).query).get('size', [FILE_SIZE])[0])
+                self.send_response(200)
+                self.send_header('Content-Type', 'video/mp4')
+                self.send_header('Content-Length', str(size))
+                self.end_headers()
+                sent = 0
+                while sent < size:
+                    n = min(CHUNK, size - sent)
+                    proxy.wait_for(n)
+                    self.wfile.write(b'\0' * n)
+                    sent += n
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def wait_for(self, n: int):
+        # 연결 수와 무관하게 프록시 전체 전송률을 RATE_PER_PROXY로 제한
+        with self.lock:
+            slot = max(self.next_slot, time.monotonic())
+            self.next_slot = slot + n / RATE_PER_PROXY
+        time.sleep(max(0.0, slot - time.monotonic()))
+
+    def close(self):
+        self.server.shutdown()
+
+
+def run_batch(proxies, jobs, threads, cooldown=5):
+    pool = EgressPool([p.url for p in proxies], cooldown=cooldown)
+    downloader = Downloader(ydl_pool=MediaPool(), egress_pool=pool)
+    out_dir = tempfile.mkdtemp()
+    # 성공 기록은 실제 download_history.csv 대신 임시 폴더에
+    history_file, history.HISTORY_FILE = history.HISTORY_FILE, os.path.join(out_dir, history.HISTORY_FILE)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(
+                lambda i: downloader.download([f"media:job{i:03d}"], out_dir, {'noplaylist': True})[0], range(jobs)))
+        elapsed = time.perf_counter() - start
+    finally:
+        history.HISTORY_FILE = history_file
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return elapsed, results, pool.get_stats()
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    threads = count * 2
+
+    single = [ThrottledProxy()]
+    multi = [ThrottledProxy(reject_first=THROTTLED_REQUESTS)] + [ThrottledProxy() for _ in range(count - 1)]
+    total = jobs * FILE_SIZE
+    print(f"jobs: {jobs} x {format_bytes(FILE_SIZE)}, threads: {threads}, "
+          f"per-egress cap: {format_bytes(RATE_PER_PROXY)}/s, egress #0 returns 429 for {THROTTLED_REQUESTS} requests")
+
+    ok = True
+    for label, proxies in (("single egress", single), (f"{count} egresses", multi)):
+        elapsed, results, stats = run_batch(proxies, jobs, threads)
+        succeeded = sum(r['status'] == 'success' for r in results)
+        ok = ok and succeeded == jobs
+        print(f"\n[{label}] {elapsed:.2f}s, {format_bytes(total / elapsed)}/s aggregate, {succeeded}/{jobs} succeeded")
+        for st in stats:
+            print(f"  {st['egress']:<24} jobs {st['jobs']:>3}  ok {st['successes']:>3}  fail {st['failures']}  "
+                  f"429 {st['throttled']}  health {st['health']:.2f}  {format_bytes(st['bytes']):>10}  "
+                  f"avg {format_bytes(st['avg_bps'])}/s")
+    benched = stats[0]['throttled'] > 0 and stats[0]['jobs'] < max(s['jobs'] for s in stats[1:])
+    ok = ok and benched
+
+    for p in single + multi: p.close()
+    print("\nresult:", "OK - all jobs completed, throttled egress was benched" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
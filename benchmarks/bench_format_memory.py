@@ -0,0 +1,89 @@
+"""
+포맷/메타데이터 보관 메모리 벤치마크
+가짜 추출기로 얻은 yt-dlp info를 세 가지 방식으로 N개 보관했을 때 1,000개 항목당 메모리를 비교합니다.
+추출은 추적 없이 한 번만 수행하고 JSON으로 직렬화해 두며, 측정 구간에서는 JSON을 다시 읽어
+보관 대상 객체가 모두 추적 중에 새로 할당되도록 합니다. (tracemalloc 아래에서 추출하면 매우 느림)
+  raw     : yt-dlp info dict를 그대로 보관
+  dict    : 기존 방식 (포맷마다 문자열 키 dict, 'res'="1080p")
+  compact : core.media_model.VideoMeta (slots + 숫자 타입 + intern된 문자열)
+
+사용법: python benchmarks/bench_format_memory.py [항목 수]
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+import yt_dlp
+
+from fake_extractor import ensure_fake_ie, fake_urls
+from core.media_model import VideoMeta
+
+YDL_OPTS = {'quiet': True, 'no_warnings': True, 'ignoreerrors': True, 'noplaylist': True}
+
+
+def legacy_parse(info):
+    """변경 전 MetadataAnalyzer의 반환 형태 (비교 기준)"""
+    parsed = {'video': [], 'audio': []}
+    for f in info.get('formats', []):
+        if not f.get('format_id') or not f.get('ext'): continue
+        filesize = f.get('filesize') or f.get('filesize_approx') or 0
+        if f.get('vcodec') == 'none' and f.get('acodec') != 'none':
+            parsed['audio'].append({'id': f['format_id'], 'ext': f['ext'], 'abr': f.get('abr', 0),
+                                    'codec': f.get('acodec'), 'asr': f.get('asr'), 'filesize': filesize})
+        elif f.get('vcodec') != 'none' and f.get('height'):
+            parsed['video'].append({'id': f['format_id'], 'ext': f['ext'], 'res': f"{f.get('height')}p",
+                                    'fps': f.get('fps'), 'codec': f.get('vcodec'), 'vbr': f.get('vbr', 0),
+                                    'filesize': filesize, 'hdr': 'HDR' in f.get('dynamic_range', '')})
+    parsed['video'].sort(key=lambda x: (int(x['res'][:-1]), x['fps']), reverse=True)
+    parsed['audio'].sort(key=lambda x: x['abr'] or 0, reverse=True)
+    return {'id': info.get('id'), 'title': info.get('title'), '_type': 'video', 'duration': info.get('duration'),
+            'thumbnail': info.get('thumbnail'), 'view_count': info.get('view_count'), 'formats': parsed}
+
+
+MODES = {
+    'raw': lambda info: info,
+    'dict': legacy_parse,
+    'compact': VideoMeta.from_info,
+}
+
+
+def measure(payloads, convert):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = []
+    for payload in payloads:
+        info = json.loads(payload)
+        kept.append(convert(info))
+        del info
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, elapsed, kept
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    urls = fake_urls(count)
+
+    with yt_dlp.YoutubeDL(YDL_OPTS) as ydl:
+        ensure_fake_ie(ydl)
+        payloads = [json.dumps(ydl.sanitize_info(ydl.extract_info(url, download=False, ie_key='Fake')))
+                    for url in urls]
+    print(f"entries: {count} (formats per entry: {len(json.loads(payloads[0])['formats'])})")
+
+    baseline = None
+    for name, convert in MODES.items():
+        current, elapsed, kept = measure(payloads, convert)
+        per_1k = current * 1000 / count
+        baseline = baseline or per_1k
+        print(f"{name:<8}: {per_1k / 1024 ** 2:8.2f} MiB / 1k entries  "
+              f"({per_1k / 1000:8.0f} B/entry, {baseline / per_1k:5.1f}x smaller than raw, parse {elapsed:.2f}s)")
+        del kept
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+공유 작업 저장소(SQLite) + 임대(lease) 워커 멀티 프로세스 검증/벤치마크
+여러 워커 프로세스가 같은 저장소를 비우는 동안, 한 프로세스를 작업 도중 강제 종료시켜
+만료된 임대가 회수되고 모든 작업이 정확히 한 번만 완료 처리되는지 확인합니다.
+
+사용법: python benchmarks/bench_job_store.py [작업 수] [프로세스 수]
+"""
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.job_store import SQLiteJobStore
+from core.worker import QueueWorker
+
+LEASE_SECONDS = 2
+WORK_SECONDS = 0.02
+
+
+class FakeRunner:
+    """다운로드 대신 짧게 대기하고 실행 기록만 남기는 가짜 러너"""
+
+    def __init__(self, log_path, crash_after=None):
+        self.log_path = log_path
+        self.crash_after = crash_after
+        self.count = 0
+
+    def run(self, item, options, progress_callback=None, job_id=None):
+        self.count += 1
+        if self.crash_after and self.count > self.crash_after:
+            os._exit(1)  # 임대를 쥔 채로 프로세스가 죽는 상황 재현
+        if progress_callback:
+            progress_callback({'status': 'downloading', 'percent': 50})
+        time.sleep(WORK_SECONDS)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(f"{item['url']}\n")
+        return [{'status': 'success', 'filepath': item['url']}]
+
+
+def worker_main(db_path, log_path, crash_after):
+    store = SQLiteJobStore(db_path)
+    worker = QueueWorker(store, runner=FakeRunner(log_path, crash_after), threads=2,
+                         lease_seconds=LEASE_SECONDS, poll_interval=0.2)
+    worker.run(exit_when_empty=True)
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    procs = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jobs.db')
+        log_path = os.path.join(tmp, 'executions.log')
+        store = SQLiteJobStore(db_path)
+        store.enqueue([{'url': f"fake:{i}", 'path': tmp} for i in range(jobs)], {})
+
+        start = time.perf_counter()
+        workers = [mp.Process(target=worker_main, args=(db_path, log_path, 5 if i == 0 else None))
+                   for i in range(procs)]
+        for p in workers: p.start()
+        for p in workers: p.join()
+        elapsed = time.perf_counter() - start
+
+        with open(log_path, encoding='utf-8') as f:
+            executed = [line.strip() for line in f if line.strip()]
+        counts = store.counts()
+        completed = store._conn().execute("SELECT COUNT(DISTINCT id) FROM jobs WHERE state = 'done'").fetchone()[0]
+
+        print(f"jobs: {jobs}, processes: {procs} (1 crashes after 5 jobs), lease: {LEASE_SECONDS}s")
+        print(f"elapsed   : {elapsed:.2f}s ({jobs / elapsed:.1f} jobs/s)")
+        print(f"store     : {counts}")
+        print(f"executions: {len(executed)} (unique {len(set(executed))})")
+        ok = completed == jobs and counts['queued'] == 0 and counts['leased'] == 0 and len(set(executed)) == jobs
+        print("result    :", "OK - every job completed exactly once" if ok else "FAILED")
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
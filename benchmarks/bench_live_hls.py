@@ -0,0 +1,171 @@
+"""
+라이브 녹화기(LiveRecorder) 검증/벤치마크 - 로컬 HLS 서버
+FFmpeg가 있으면 테스트 소스(testsrc + sine)를 실시간 HLS로 인코딩해 로컬 HTTP로 제공하고,
+없으면(--synthetic) 벽시계 기준으로 창이 움직이는 가짜 TS 세그먼트 재생목록을 만듭니다.
+합성 서버는 일부 세그먼트를 한 번 실패시키고, 중간에 재생목록을 잠시 503으로 막아 창에서 빠진 세그먼트(누락)를 만듭니다.
+롤링 파일 길이와 용량 상한이 지켜지는지, 누락 후 이어서 녹화하는지, 지연 지표를 확인합니다.
+
+사용법: python benchmarks/bench_live_hls.py [녹화 초] [--synthetic]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.live_recorder import LiveRecorder
+from utils.storage import format_bytes
+
+SEGMENT_SECONDS = 1
+WINDOW = 4  # 재생목록에 남는 세그먼트 수
+SEGMENT_BYTES = 188 * 600  # 합성 세그먼트 크기 (TS 패킷 600개)
+CHUNK_SECONDS = 5
+MAX_BYTES = SEGMENT_BYTES * 12  # 용량 상한: 롤링 파일 2~3개 분량
+FLAKY_EVERY = 7  # 합성 서버: 이 간격의 세그먼트는 첫 요청에 500
+STALL = (8, 8 + WINDOW * SEGMENT_SECONDS + 3)  # 합성 서버: 재생목록을 503으로 막는 구간(시작 후 초)
+
+
+class SyntheticHLS:
+    """벽시계 기준으로 세그먼트가 1초마다 하나씩 생기는 라이브 HLS 서버 (TS 동기 바이트로 채운 가짜 세그먼트)"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.failed_once = set()
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                elapsed = time.time() - server.started
+                if self.path.endswith('.m3u8'):
+                    if STALL[0] <= elapsed < STALL[1]:
+                        self.send_error(503)
+                        return
+                    self._send(server.playlist(elapsed).encode(), 'application/vnd.apple.mpegurl')
+                    return
+                seq = int(self.path.rsplit('/', 1)[1].split('.')[0][3:])
+                with server.lock:
+                    flaky = seq % FLAKY_EVERY == 0 and seq not in server.failed_once
+                    if flaky: server.failed_once.add(seq)
+                if flaky:
+                    self.send_error(500)
+                    return
+                self._send(bytes([0x47]) * SEGMENT_BYTES, 'video/mp2t')
+
+            def _send(self, body, content_type):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/live.m3u8"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def playlist(self, elapsed: float) -> str:
+        last = int(elapsed // SEGMENT_SECONDS) - 1  # 길이만큼 지난(완성된) 세그먼트까지만 공개
+        if last < 0:
+            return f'#EXTM3U\n#EXT-X-TARGETDURATION:{SEGMENT_SECONDS}\n'
+        first = max(0, last - WINDOW + 1)
+        lines = ['#EXTM3U', '#EXT-X-VERSION:3', f'#EXT-X-TARGETDURATION:{SEGMENT_SECONDS}', f'#EXT-X-MEDIA-SEQUENCE:{first}']
+        pdt = datetime.fromtimestamp(self.started + first * SEGMENT_SECONDS, timezone.utc)
+        lines.append(f"#EXT-X-PROGRAM-DATE-TIME:{pdt.isoformat(timespec='milliseconds')}")
+        for seq in range(first, last + 1):
+            lines += [f'#EXTINF:{SEGMENT_SECONDS:.3f},', f'seg{seq}.ts']
+        return '\n'.join(lines) + '\n'
+
+    def close(self):
+        self.server.shutdown()
+
+
+class FFmpegHLS:
+    """FFmpeg 테스트 소스를 실시간(-re) HLS로 인코딩해 로컬 HTTP로 제공 (오래된 세그먼트는 삭제되어 창이 움직임)"""
+
+    def __init__(self, ffmpeg: str):
+        self.dir = tempfile.mkdtemp(prefix='hls_src_')
+        self.proc = subprocess.Popen([
+            ffmpeg, '-v', 'error', '-re', '-f', 'lavfi', '-i', 'testsrc=size=640x360:rate=30',
+            '-f', 'lavfi', '-i', 'sine=frequency=440:sample_rate=48000',
+            '-c:v', 'libx264', '-preset', 'veryfast', '-g', str(30 * SEGMENT_SECONDS), '-c:a', 'aac',
+            '-f', 'hls', '-hls_time', str(SEGMENT_SECONDS), '-hls_list_size', str(WINDOW),
+            '-hls_flags', 'delete_segments+program_date_time', os.path.join(self.dir, 'live.m3u8'),
+        ])
+        handler = partial(SimpleHTTPRequestHandler, directory=self.dir)
+        handler.log_message = lambda *args: None
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/live.m3u8"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        while not os.path.exists(os.path.join(self.dir, 'live.m3u8')):
+            if self.proc.poll() is not None:
+                raise RuntimeError("FFmpeg HLS 소스 시작 실패")
+            time.sleep(0.2)
+
+    def close(self):
+        self.proc.terminate()
+        self.proc.wait()
+        self.server.shutdown()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    seconds = float(args[0]) if args else 25
+    ffmpeg = shutil.which('ffmpeg')
+    synthetic = '--synthetic' in sys.argv or not ffmpeg
+    source = SyntheticHLS() if synthetic else FFmpegHLS(ffmpeg)
+    out_dir = tempfile.mkdtemp(prefix='live_out_')
+    print(f"source: {'synthetic' if synthetic else 'ffmpeg testsrc'} ({source.url}), record {seconds:.0f}s, "
+          f"chunk {CHUNK_SECONDS}s, cap {format_bytes(MAX_BYTES)}")
+
+    recorder = LiveRecorder(source.url, out_dir, 'bench', chunk_seconds=CHUNK_SECONDS, max_bytes=MAX_BYTES,
+                            fetch_workers=4, max_seconds=seconds)
+    start = time.perf_counter()
+    try:
+        result = recorder.run()
+    finally:
+        source.close()
+    elapsed = time.perf_counter() - start
+    m = result['metrics']
+    sizes = [os.path.getsize(p) for p in result['files']]
+
+    print(f"\nrecorded {m['seconds']:.0f}s in {elapsed:.1f}s wall: {m['segments']} segments, {format_bytes(m['bytes'])}")
+    print(f"lag last {m['lag']}s / max {m['max_lag']}s, behind {m['behind']}s, edge_lag {m['edge_lag']}s")
+    print(f"gaps {m['gaps']} ({m['gap_seconds']:.0f}s), failed segments {m['failed_segments']}, retries {m['retries']}, "
+          f"restarts {m['restarts']}, stopped: {m['stopped']}")
+    print(f"files kept {len(sizes)} ({format_bytes(sum(sizes))}), deleted {m.get('deleted_files', 0)} "
+          f"({format_bytes(m.get('deleted_bytes', 0))})")
+    for path, size in zip(result['files'], sizes):
+        print(f"  {os.path.basename(path):<40} {format_bytes(size):>10}")
+
+    checks = {
+        'recorded up to the limit': m['seconds'] >= seconds,
+        'disk cap respected': sum(sizes) <= MAX_BYTES,
+        'rolled into several files': len(sizes) + m.get('deleted_files', 0) > 1,
+        'no leftover .part files': not any(name.endswith('.part') for name in os.listdir(out_dir)),
+    }
+    if synthetic:
+        checks['retried flaky segments'] = m['retries'] > 0 and m['failed_segments'] == 0
+        checks['recovered from manifest gap'] = m['gaps'] > 0 and m['stopped'] == 'max_seconds'
+    shutil.rmtree(out_dir, ignore_errors=True)
+
+    print()
+    for label, ok in checks.items():
+        print(f"  [{'OK' if ok else 'FAIL'}] {label}")
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+작업 스케줄링 정책(FIFO / SJF + aging) 벤치마크
+실제 다운로드 대신 예상 크기 / 대역폭만큼 대기하는 가짜 작업으로 JobController의 실행 순서를 측정합니다.
+  1) 혼합 배치: 3시간 4K 영상 1개 + 짧은 클립 여러 개 → 평균 완료 시간 비교
+  2) 연속 유입: 작은 작업이 계속 들어오는 동안 큰 작업이 굶지 않는지(aging) 확인
+
+사용법: python benchmarks/bench_scheduling.py [워커 수]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.job_control import AGING_BYTES_PER_SEC, JobController
+
+MB = 1024 ** 2
+BANDWIDTH = 4000 * MB  # 가짜 대역폭 (bytes/s, 시뮬레이션 시간 단축용)
+# 실제 대역폭(10MB/s) 대비 시간이 압축된 만큼 aging 속도도 같은 비율로 키움
+AGING = AGING_BYTES_PER_SEC * BANDWIDTH / (10 * MB)
+
+
+def mixed_batch():
+    rng = random.Random(7)
+    items = [{'url': 'fake:4k-3h', 'expected_bytes': 12_000 * MB}, {'url': 'fake:4k-2h', 'expected_bytes': 8_000 * MB}]
+    items += [{'url': f"fake:clip{i}", 'expected_bytes': rng.randint(20, 150) * MB} for i in range(10)]
+    items += [{'url': f"fake:mid{i}", 'expected_bytes': rng.randint(800, 2000) * MB} for i in range(3)]
+    return items
+
+
+def run(items, policy, workers, feeder=None, aging=AGING):
+    control = JobController(items, policy=policy, aging_bytes_per_sec=aging)
+    start = time.monotonic()
+    done = {}
+    started = {}
+
+    def worker():
+        while True:
+            job = control.next_job(wait_for_new=feeder is not None)
+            if job is None: return
+            started[job['item']['url']] = time.monotonic() - start
+            time.sleep(job['expected_bytes'] / BANDWIDTH)
+            control.finish(job['id'])
+            done[job['item']['url']] = time.monotonic() - job['enqueued']
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for t in threads: t.start()
+    if feeder:
+        feeder(control)
+        while any(j['state'] == 'pending' or j['state'] == 'running' for j in list(control.jobs.values())):
+            time.sleep(0.01)
+        control.close()
+    for t in threads: t.join()
+    return done, started
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    items = mixed_batch()
+    print(f"[mixed batch] {len(items)} jobs, {workers} workers, two 4K jobs (12GB, 8GB) first in input order")
+    for policy in ('fifo', 'sjf'):
+        done, _ = run([dict(i) for i in items], policy, workers)
+        mean = sum(done.values()) / len(done)
+        clips = [v for k, v in done.items() if 'clip' in k]
+        print(f"  {policy:<4}: mean completion {mean:.2f}s, mean clip completion {sum(clips) / len(clips):.2f}s, "
+              f"makespan {max(done.values()):.2f}s")
+
+    # 연속 유입: 작은 작업 몇 개 뒤에 큰 작업 하나, 이후 작은 작업이 처리 속도보다 빠르게 계속 추가됨
+    def feeder(control):
+        for i in range(150):
+            control.add_job({'url': f"fake:stream{i}", 'expected_bytes': 100 * MB})
+            time.sleep(0.015)
+
+    print("\n[continuous arrivals] 1 big job + 155 small jobs arriving faster than they are served, 1 worker")
+    head = [{'url': f"fake:head{i}", 'expected_bytes': 100 * MB} for i in range(5)]
+    for label, aging in (("sjf, no aging", 0), ("sjf, aging", AGING)):
+        _, started = run(head + [{'url': 'fake:big', 'expected_bytes': 2_000 * MB}], 'sjf', 1, feeder, aging)
+        order = sorted(started, key=started.get)
+        print(f"  {label:<14}: big job started {started['fake:big']:.2f}s after batch start "
+              f"(position {order.index('fake:big') + 1} of {len(order)})")
+
+
+if __name__ == '__main__':
+    main()
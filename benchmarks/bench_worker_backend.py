@@ -0,0 +1,58 @@
+"""
+스레드 백엔드 vs 프로세스 백엔드 처리량 비교 (오프라인 가짜 추출기 워크로드)
+추출 단계의 순수 파이썬 연산에서 GIL 경합이 얼마나 처리량을 깎는지 items/sec로 측정합니다.
+
+사용법: python benchmarks/bench_worker_backend.py [항목 수] [워커 수]
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_extractor import FakeRunner, fake_urls, make_fake_runner
+from core.config import DEFAULT_CONFIG
+from core.process_backend import ProcessBackend
+
+
+def run_threads(urls, workers):
+    runner = FakeRunner()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda u: runner.run({'url': u}, {}), urls))
+
+
+def run_processes(urls, workers):
+    backend = ProcessBackend(DEFAULT_CONFIG, workers, runner_factory=make_fake_runner)
+    events = []
+    backend.start_events(lambda job_id, d: events.append(job_id))
+    # 부모는 디스패처 스레드로 작업을 넘기기만 함 (컨트롤러의 run_next와 같은 구조)
+    with ThreadPoolExecutor(max_workers=workers) as dispatch:
+        list(dispatch.map(lambda a: backend.run(a[0], {'url': a[1]}, {}), enumerate(urls)))
+    backend.shutdown()
+    return len(events)
+
+
+def measure(fn, urls, workers):
+    start = time.perf_counter()
+    fn(urls, workers)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    urls = fake_urls(count)
+
+    # 예열: 추출기 import 등 1회성 비용 제외
+    run_threads(fake_urls(workers), workers)
+    run_processes(fake_urls(workers), workers)
+
+    thread_t = measure(run_threads, urls, workers)
+    process_t = measure(run_processes, urls, workers)
+
+    print(f"items: {count}, workers: {workers}")
+    print(f"thread  : {thread_t:.2f}s ({count / thread_t:.1f} items/s)")
+    print(f"process : {process_t:.2f}s ({count / process_t:.1f} items/s)")
+    print(f"speedup : {thread_t / process_t:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+YoutubeDL 인스턴스 풀 벤치마크
+짧은 항목을 연속 처리할 때, 매번 YoutubeDL을 생성하는 방식 대비 풀 재사용으로 절약되는 항목당 오버헤드를 측정합니다.
+
+사용법: python benchmarks/bench_ydl_pool.py [항목 수]
+"""
+import sys
+import time
+
+import yt_dlp
+
+from fake_extractor import ensure_fake_ie, fake_urls
+from core.ydl_pool import YDLPool
+
+YDL_OPTS = {'quiet': True, 'no_warnings': True, 'ignoreerrors': True, 'noplaylist': True}
+
+
+def run_fresh(urls):
+    for url in urls:
+        with yt_dlp.YoutubeDL(YDL_OPTS) as ydl:
+            ensure_fake_ie(ydl).extract_info(url, download=False, ie_key='Fake')
+
+
+def run_pooled(urls):
+    pool = YDLPool()
+    for url in urls:
+        with pool.acquire(YDL_OPTS) as ydl:
+            ensure_fake_ie(ydl).extract_info(url, download=False, ie_key='Fake')
+    pool.close_all()
+    return pool.stats
+
+
+def measure(fn, urls):
+    start = time.perf_counter()
+    result = fn(urls)
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    urls = fake_urls(count)
+    run_pooled(fake_urls(5))  # 추출기 모듈 import 등 1회성 비용 예열
+
+    fresh_t, _ = measure(run_fresh, urls)
+    pooled_t, stats = measure(run_pooled, urls)
+
+    fresh_ms = fresh_t / count * 1000
+    pooled_ms = pooled_t / count * 1000
+    print(f"items: {count}")
+    print(f"fresh  : {fresh_t:.3f}s ({fresh_ms:.2f} ms/item)")
+    print(f"pooled : {pooled_t:.3f}s ({pooled_ms:.2f} ms/item)  stats={stats}")
+    print(f"saved  : {fresh_ms - pooled_ms:.2f} ms/item ({fresh_t / pooled_t:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
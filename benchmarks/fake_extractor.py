@@ -0,0 +1,83 @@
+"""
+네트워크 없이 yt-dlp 추출 경로를 재현하는 벤치마크용 가짜 추출기
+'fake:<id>' 형태의 URL을 받아 플레이어 응답(JSON) 파싱과 포맷 정렬 비용을 흉내냅니다.
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yt_dlp.extractor.common import InfoExtractor
+
+HEIGHTS = [144, 240, 360, 480, 720, 1080, 1440, 2160]
+VCODECS = ['avc1.640028', 'vp09.00.40.08', 'av01.0.08M.08']
+ABRS = [48, 64, 128, 160]
+
+
+def fake_urls(count: int) -> list:
+    return [f"fake:vid{i:06d}" for i in range(count)]
+
+
+class FakeIE(InfoExtractor):
+    IE_NAME = 'fake'
+    _VALID_URL = r'fake:(?P<id>[\w-]+)'
+
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+
+        # 실제 추출기처럼 큰 JSON 응답을 직렬화/파싱하는 비용을 재현
+        raw_formats = []
+        for h in HEIGHTS:
+            for vc in VCODECS:
+                raw_formats.append({
+                    'format_id': f"{h}-{vc[:4]}", 'ext': 'mp4' if vc.startswith('avc') else 'webm',
+                    'height': h, 'width': h * 16 // 9, 'fps': 30 if h < 720 else 60,
+                    'vcodec': vc, 'acodec': 'none', 'vbr': h * 3,
+                    'filesize': h * 120_000, 'url': f"http://127.0.0.1/{video_id}/{h}/{vc}",
+                })
+        for abr in ABRS:
+            raw_formats.append({
+                'format_id': f"a{abr}", 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2',
+                'abr': abr, 'asr': 44100, 'filesize': abr * 40_000,
+                'url': f"http://127.0.0.1/{video_id}/a{abr}",
+            })
+        payload = json.dumps({'streamingData': {'adaptiveFormats': raw_formats}, 'padding': 'x' * 20_000})
+        formats = json.loads(payload)['streamingData']['adaptiveFormats']
+
+        return {
+            'id': video_id,
+            'title': f"Fake Video {video_id}",
+            'duration': 30,
+            'view_count': 1000,
+            'thumbnail': None,
+            'formats': formats,
+        }
+
+
+def ensure_fake_ie(ydl):
+    """YoutubeDL 인스턴스에 가짜 추출기를 한 번만 등록합니다."""
+    if 'Fake' not in ydl._ies:
+        ydl.add_info_extractor(FakeIE())
+    return ydl
+
+
+class FakeRunner:
+    """JobRunner와 같은 인터페이스로, 다운로드 대신 가짜 추출기로 메타데이터 추출만 수행합니다."""
+
+    def __init__(self):
+        from core.ydl_pool import YDLPool
+        self.pool = YDLPool()
+        self.opts = {'quiet': True, 'no_warnings': True, 'ignoreerrors': True, 'noplaylist': True}
+
+    def run(self, item, options, progress_callback=None, job_id=None):
+        with self.pool.acquire(self.opts) as ydl:
+            info = ensure_fake_ie(ydl).extract_info(item['url'], download=False, ie_key='Fake')
+        if progress_callback:
+            progress_callback({'status': 'finished', 'filename': info['title']})
+        return [{'status': 'success', 'filepath': info['title'], 'title': info['title']}]
+
+
+def make_fake_runner(config):
+    """ProcessBackend의 runner_factory로 사용 (자식 프로세스에서 호출)"""
+    return FakeRunner()
@@ -0,0 +1,143 @@
+import gzip
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.media_model import VideoMeta
+from core.metadata import MetadataAnalyzer
+from ui.logger import Logger
+from utils.system import extract_video_id, is_collection_url
+
+# 실행마다 별도 gzip 파일에 기록 (중단으로 잘린 gzip 멤버가 이전 결과를 손상시키지 않도록)
+CATALOG_JSONL = 'catalog.{stamp}.jsonl.gz'
+CATALOG_DB = 'catalog.sqlite'
+
+# 채널 → 탭(동영상/쇼츠/라이브) → 영상 순으로 중첩되므로 최대 두 단계까지 펼침
+MAX_EXPAND_DEPTH = 2
+
+
+def expand_collection(analyzer: MetadataAnalyzer, url: str, depth: int = MAX_EXPAND_DEPTH) -> list:
+    """재생목록/채널 URL을 개별 영상 항목({'url', 'id', 'title'}) 리스트로 펼칩니다. (단일 영상은 그대로)"""
+    if depth <= 0 or not is_collection_url(url):
+        return [{'url': url}]
+    entries = []
+    for item in analyzer.get_playlist_items(url):
+        if is_collection_url(item['url']):
+            entries.extend(expand_collection(analyzer, item['url'], depth - 1))
+        else:
+            entries.append(item)
+    return entries
+
+
+class CatalogExporter:
+    """
+    미디어를 받지 않고 메타데이터만 수집하는 카탈로그 모드
+    재생목록/채널/URL 목록을 펼쳐 MetadataAnalyzer를 병렬로 실행하고,
+    결과를 gzip JSONL과 SQLite 테이블에 스트리밍으로 기록합니다.
+    SQLite에 이미 기록된 영상 ID는 건너뛰므로 중단 후 다시 실행하면 이어서 진행합니다.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS catalog (
+            video_id     TEXT PRIMARY KEY,
+            url          TEXT NOT NULL,
+            source       TEXT,
+            status       TEXT NOT NULL,
+            title        TEXT,
+            uploader     TEXT,
+            upload_date  TEXT,
+            duration     INTEGER,
+            view_count   INTEGER,
+            max_height   INTEGER,
+            est_bytes    INTEGER,
+            formats      TEXT,
+            fetched_at   REAL NOT NULL
+        );
+    """
+
+    def __init__(self, analyzer: MetadataAnalyzer, output_dir: str, max_workers: int = 4):
+        self.analyzer = analyzer
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        os.makedirs(output_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(output_dir, CATALOG_DB))
+        self.db.executescript(self.SCHEMA)
+        self.stats = {'fetched': 0, 'skipped': 0, 'failed': 0}
+
+    def export(self, tasks: list, progress_callback=None) -> dict:
+        """parse_input_string 결과(작업 그룹 리스트)를 받아 카탈로그를 만듭니다."""
+        done_ids = {row[0] for row in self.db.execute("SELECT video_id FROM catalog WHERE status = 'ok'")}
+        targets = []
+        seen = set()
+        for group in tasks:
+            source = group.get('group_name') or 'arg'
+            for url in group['urls']:
+                for entry in expand_collection(self.analyzer, url):
+                    video_id = entry.get('id') or extract_video_id(entry['url'])
+                    key = video_id or entry['url']
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if video_id in done_ids:
+                        self.stats['skipped'] += 1
+                        continue
+                    targets.append((entry['url'], source))
+
+        Logger.info(f"카탈로그 대상 {len(targets)}개 (이미 수집됨 {self.stats['skipped']}개 건너뜀)")
+        jsonl_path = os.path.join(self.output_dir, CATALOG_JSONL.format(stamp=time.strftime('%Y%m%d-%H%M%S')))
+        with gzip.open(jsonl_path, 'wt', encoding='utf-8') as jsonl, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.analyzer.get_video_info, url): (url, source) for url, source in targets}
+            for fut in as_completed(futures):
+                url, source = futures.pop(fut)  # 처리한 결과는 바로 놓아 메모리 누적 방지
+                try:
+                    meta = fut.result()
+                except Exception:
+                    meta = None
+                record = self._to_record(url, source, meta)
+                self._write(jsonl, record)
+                if progress_callback:
+                    progress_callback(record)
+        self.stats['jsonl'] = jsonl_path
+        return self.stats
+
+    def close(self):
+        self.db.close()
+
+    # --- 내부 헬퍼 ---
+    def _to_record(self, url: str, source: str, meta: VideoMeta | None) -> dict:
+        now = time.time()
+        if not meta:
+            self.stats['failed'] += 1
+            return {'video_id': extract_video_id(url) or url, 'url': url, 'source': source,
+                    'status': 'error', 'fetched_at': now}
+
+        self.stats['fetched'] += 1
+        return {
+            'video_id': meta.id,
+            'url': url,
+            'source': source,
+            'status': 'ok',
+            'title': meta.title,
+            'uploader': meta.uploader,
+            'upload_date': meta.upload_date,
+            'duration': meta.duration,
+            'view_count': meta.view_count,
+            'max_height': meta.max_height or None,
+            'est_bytes': self.analyzer.estimate_download_size(meta.formats, {}, meta.duration),
+            'formats': meta.formats.to_dict(),
+            'fetched_at': now,
+        }
+
+    def _write(self, jsonl, record: dict):
+        jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+        row = dict(record, formats=json.dumps(record.get('formats')) if record.get('formats') else None)
+        columns = ['video_id', 'url', 'source', 'status', 'title', 'uploader', 'upload_date', 'duration',
+                   'view_count', 'max_height', 'est_bytes', 'formats', 'fetched_at']
+        self.db.execute(
+            f"INSERT OR REPLACE INTO catalog ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [row.get(c) for c in columns],
+        )
+        self.db.commit()
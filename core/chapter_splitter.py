@@ -0,0 +1,181 @@
+import os
+import re
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from core.parser import AUDIO_EXTS
+from ui.logger import Logger
+
+KEYFRAME_TOLERANCE = 0.05  # 챕터 시작이 키프레임과 이 간격(초) 안이면 스트림 복사로도 정확히 잘림
+MAX_TITLE_LENGTH = 80
+_UNSAFE_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def chapter_spans(info: dict) -> list:
+    """info dict의 챕터를 [(제목, 시작, 끝)]으로 정리합니다. (길이가 없는 항목 제외, 끝이 없으면 다음 챕터/영상 끝까지)"""
+    duration = info.get('duration')
+    chapters = sorted(info.get('chapters') or [], key=lambda c: c.get('start_time') or 0)
+    spans = []
+    for index, chapter in enumerate(chapters):
+        start = float(chapter.get('start_time') or 0)
+        end = chapter.get('end_time')
+        if end is None:
+            end = chapters[index + 1].get('start_time') if index + 1 < len(chapters) else duration
+        if end is None or float(end) <= start:
+            continue
+        spans.append((chapter.get('title') or '', start, float(min(end, duration) if duration else end)))
+    return spans
+
+
+def chapter_filename(source: str, index: int, title: str) -> str:
+    """'제목 - 03 챕터 제목.mp3' (파일 이름에 쓸 수 없는 문자는 제거)"""
+    base, ext = os.path.splitext(source)
+    safe = _UNSAFE_CHARS.sub('', title).strip(' .')[:MAX_TITLE_LENGTH].strip() or f"Chapter {index}"
+    return f"{base} - {index:02d} {safe}{ext}"
+
+
+def _cut_one(cmd: list, temp_path: str, output: str) -> dict:
+    """자식 프로세스에서 FFmpeg 컷 하나를 실행합니다. (임시 이름으로 쓴 뒤 교체)"""
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except OSError as e:
+        return {'ok': False, 'error': str(e)}
+    if proc.returncode != 0 or not os.path.exists(temp_path):
+        if os.path.exists(temp_path): os.remove(temp_path)
+        return {'ok': False, 'error': proc.stderr.decode('utf-8', errors='replace').strip()[-300:]}
+    os.replace(temp_path, output)
+    return {'ok': True}
+
+
+class ChapterSplitter:
+    """
+    다운로드한 파일 하나를 챕터별 파일로 나눕니다. (챕터 제목 / 트랙 번호 메타데이터 기록)
+    컷은 작업 간에 공유하는 크기 제한 프로세스 풀에서 병렬로 실행합니다.
+    챕터 시작이 키프레임에 맞으면 스트림 복사, 아니면 기본은 직전 키프레임부터 복사하고
+    정밀 분할(split_exact)을 요청한 경우에만 그 챕터를 다시 인코딩합니다.
+    """
+
+    def __init__(self, max_workers: int = None, ffmpeg_handler=None):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.ffmpeg_handler = ffmpeg_handler  # Downloader가 자신의 핸들러로 채움
+        self._pool = None
+        self._lock = threading.Lock()
+        self.stats = {'copied': 0, 'encoded': 0}
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(max_workers=config.get('chapter_workers') or None)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def split(self, source: str, info: dict, options: dict) -> list:
+        """
+        챕터별 파일 경로 리스트를 반환하고 원본은 지웁니다.
+        챕터가 두 개 미만이면 나누지 않고 [원본]을 그대로 반환합니다.
+        """
+        spans = chapter_spans(info)
+        if len(spans) < 2:
+            Logger.info(f"챕터 정보가 없어 한 파일로 저장합니다: {os.path.basename(source)}")
+            return [source]
+        handler = self.ffmpeg_handler
+        if not handler or not handler.ffmpeg_path:
+            raise RuntimeError("챕터 분할에는 FFmpeg가 필요합니다.")
+
+        audio_only = os.path.splitext(source)[1][1:].lower() in AUDIO_EXTS
+        keyframes = None if audio_only else self._keyframes(source)
+        exact = bool(options.get('split_exact'))
+        encoder = None
+        if exact and not audio_only:
+            encoder = handler.caps.resolve_encoder(options.get('video_codec') or 'h264', 'video') or 'libx264'
+
+        jobs, snapped = [], 0
+        for index, (title, start, end) in enumerate(spans, 1):
+            output = chapter_filename(source, index, title)
+            # 오디오 패킷은 모두 독립적으로 디코드 가능하므로 항상 복사
+            aligned = audio_only or start <= KEYFRAME_TOLERANCE or (
+                keyframes is not None and any(abs(k - start) <= KEYFRAME_TOLERANCE for k in keyframes))
+            encode = exact and not aligned
+            meta = {'title': title or f"Chapter {index}", 'track': f"{index}/{len(spans)}", 'album': info.get('title')}
+            base, ext = os.path.splitext(output)
+            temp_path = f"{base}.splitting{ext}"
+            cmd = self._cut_command(source, temp_path, start, end, meta, audio_only, encoder if encode else None)
+            jobs.append((output, temp_path, cmd, encode))
+            snapped += not (aligned or encode)
+
+        copied = sum(1 for job in jobs if not job[3])
+        Logger.stage('split')
+        Logger.info(f"[Chapters] {len(jobs)}개로 분할 (스트림 복사 {copied}, 재인코딩 {len(jobs) - copied}, "
+                    f"프로세스 {self.max_workers}개)")
+        if snapped:
+            Logger.debug(f"[Chapters] 키프레임에 맞지 않는 챕터 {snapped}개는 직전 키프레임부터 포함됩니다. (정밀 분할: split_exact)")
+
+        pool = self._executor()
+        futures = [pool.submit(_cut_one, cmd, temp_path, output) for output, temp_path, cmd, _ in jobs]
+        results = [f.result() for f in futures]
+        failed = [(job[0], r['error']) for job, r in zip(jobs, results) if not r['ok']]
+        if failed:
+            for output, *_ in jobs:
+                if os.path.exists(output): os.remove(output)
+            name, error = failed[0]
+            raise RuntimeError(f"챕터 분할 실패 ({os.path.basename(name)}): {error}")
+
+        with self._lock:
+            self.stats['copied'] += copied
+            self.stats['encoded'] += len(jobs) - copied
+        os.remove(source)
+        return [output for output, *_ in jobs]
+
+    def _cut_command(self, source: str, output: str, start: float, end: float, meta: dict, audio_only: bool,
+                     encoder: str | None) -> list:
+        # 입력 앞 -ss: 복사는 직전 키프레임부터, 재인코딩은 디코더가 시작점 이전 프레임을 버려 정확한 지점부터
+        cmd = [self.ffmpeg_handler.ffmpeg_path, '-y', '-v', 'error', '-ss', f"{start:.3f}", '-i', source,
+               '-t', f"{end - start:.3f}"]
+        if not audio_only:
+            cmd.extend(['-map', '0:v:0?'])
+        cmd.extend(['-map', '0:a:0?', '-map_metadata', '0', '-map_chapters', '-1'])
+        if encoder:
+            cmd.extend(['-c:v', encoder, '-c:a', 'copy'])
+            if 'libx264' in encoder or 'libx265' in encoder:
+                cmd.extend(['-pix_fmt', 'yuv420p'])
+        else:
+            cmd.extend(['-c', 'copy', '-avoid_negative_ts', 'make_zero'])
+        for key, value in meta.items():
+            if value:
+                cmd.extend(['-metadata', f"{key}={value}"])
+        cmd.append(output)
+        return cmd
+
+    def _keyframes(self, source: str) -> list | None:
+        """비디오 키프레임 시각 목록 (패킷 플래그만 읽으므로 디코드 없음). ffprobe가 없거나 실패하면 None"""
+        ffprobe = self.ffmpeg_handler.ffprobe_path
+        if not ffprobe:
+            return None
+        cmd = [ffprobe, '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'packet=pts_time,flags',
+               '-of', 'csv=p=0', source]
+        try:
+            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=300)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            Logger.warning(f"키프레임 조사 실패: {e}")
+            return None
+        if proc.returncode != 0:
+            return None
+        keyframes = []
+        for line in proc.stdout.decode('utf-8', errors='replace').splitlines():
+            pts, _, flags = line.partition(',')
+            if 'K' in flags:
+                try:
+                    keyframes.append(float(pts))
+                except ValueError:
+                    continue
+        return keyframes
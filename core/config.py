@@ -8,6 +8,34 @@ DEFAULT_CONFIG = {
     'default_output_dir': os.path.join(os.path.expanduser('~'), 'Downloads'),
     'max_retries': 3,
     'max_workers': 3,
+    'worker_backend': 'thread',  # 작업 실행 방식: 'thread' | 'process' (추출 부하가 클 때 GIL 회피)
+    'staging_dir': '',  # 중간 파일용 로컬 고속 디스크 경로 (빈 값: 출력 폴더에 직접 기록)
+    'stream_cache_dir': '',  # 원본 스트림 캐시 폴더 (빈 값: 사용 안 함)
+    'stream_cache_max_bytes': 20 * 1024 ** 3,  # 스트림 캐시 용량 예산 (기본 20GB)
+    'egress_pool': [],  # 송신 경로 목록: 로컬 IP('203.0.113.5') 또는 프록시('socks5://host:1080') (빈 값: 기본 경로)
+    'egress_cooldown': 120,  # 429/연속 실패 시 해당 경로를 쉬게 하는 시간(초)
+    'schedule_policy': 'fifo',  # 작업 순서: 'fifo' (입력 순) | 'sjf' (예상 크기가 작은 작업 먼저, 대기 시간 보정)
+    'verify_outputs': False,  # 결과물 검증: 내용 해시 + ffprobe 점검(길이/스트림/코덱), 손상 시 자동 재다운로드 (결과물을 한 번 더 읽음)
+    'verify_workers': 2,  # 검증(ffprobe) 동시 실행 수
+    'live_chunk_seconds': 600,  # 라이브 녹화 롤링 파일 하나의 길이(초)
+    'live_max_bytes': 20 * 1024 ** 3,  # 라이브 녹화 전체 용량 상한 (초과 시 오래된 파일부터 삭제; 0: 제한 없음)
+    'live_fetch_workers': 4,  # 라이브 세그먼트 동시 다운로드 수
+    'live_max_seconds': 0,  # 라이브 녹화 길이 상한(초) (0: 방송이 끝날 때까지)
+    'chapter_workers': 0,  # 챕터 분할(split) FFmpeg 동시 실행 프로세스 수 (0: CPU 코어 수, 최대 4)
+    'unavailable_cache': 'unavailable_cache.json',  # 접근 불가 영상 기록 파일 (빈 값: 사용 안 함)
+    'unavailable_ttl': {},  # 분류별 재확인 주기(초) 덮어쓰기 (예: {"private": 86400}); 기본값은 utils/unavailable.py
+    'plan_bandwidth': 0,  # dry-run 계획용 대역폭(bytes/s) (0: 실행 시 첫 항목으로 실측)
+    'log_level': 'info',  # 로그 레벨: 'debug' | 'info' | 'warning' | 'error' (운영 중 문제 추적 시 debug)
+    'log_file': '',  # 회전 로그 파일 경로 (빈 값: 파일 기록 안 함, 예: ytdl_pro.log)
+    'log_max_bytes': 5 * 1024 ** 2,  # 로그 파일 하나의 최대 크기
+    'log_backups': 3,  # 보관할 이전 로그 파일 수
+    'profile_mode': '',  # 배치 프로파일링: '' (끔) | 'light' (RSS/단계별 CPU, 30초 간격) | 'full' (+ tracemalloc 할당 추적)
+    'profile_interval': 0,  # 프로파일 샘플 간격(초) (0: 모드 기본값)
+    'profile_dir': 'profiles',  # 프로파일 보고서(JSON) 저장 폴더
+    'control_port': 0,  # 실행 중 배치 제어용 로컬 소켓 포트 (0: 사용 안 함; 인증이 없으므로 필요할 때만 켜기, 예: 47800)
+    'daemon_port': 47801,  # 데몬 모드 HTTP API 포트
+    'daemon_keep_finished': 1000,  # 데몬이 조회용으로 보관하는 끝난 작업 수 (초과 시 오래된 것부터 삭제)
+    'daemon_finished_ttl': 86400,  # 끝난 작업을 보관하는 시간(초) (0: 시간 기준 없음)
     'presets': {
         "FHD 60fps (MP4)": "1080p 60fps mp4",
         "High Quality Audio": "mp3 BR_320k",
@@ -1,21 +1,56 @@
 import sys
 import os
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from core.metadata import MetadataAnalyzer
 from core.parser import parse_quality_string
 from core.downloader import Downloader
+from core.catalog import CatalogExporter
+from core.chapter_splitter import ChapterSplitter
 from core.config import ConfigManager
-from ui.console import ConsoleUI
+from core.egress import EgressPool
+from core.live_recorder import live_settings_from_config
+from core.size_probe import SizeProber
+from core.stream_cache import StreamCache
+from core.verifier import OutputVerifier
+from core.ydl_pool import YDLPool
+from core.job_runner import JobRunner
+from core.process_backend import ProcessBackend
+from core.profiler import BatchProfiler, log_profile_summary
+from core.job_control import JobController, JobCancelled, ControlServer
+from ui.console import ConsoleUI, print_unavailable
+from ui.keyboard import KeyboardControl, HELP_TEXT as KEYBOARD_HELP
 from ui.logger import Logger
+from utils.dedupe import OutputIndex, group_duplicates
+from utils.storage import InsufficientSpaceError, check_free_space, format_bytes
 from utils.system import get_clipboard_url, parse_input_string, open_file_explorer
+from utils.unavailable import UnavailableCache
 
 class AppController:
     def __init__(self):
         self.config = ConfigManager()
         self.ui = ConsoleUI()
-        self.analyzer = MetadataAnalyzer()
-        self.downloader = Downloader()
+        # 분석기와 다운로더가 같은 YoutubeDL 풀을 공유합니다.
+        self.ydl_pool = YDLPool()
+        self.analyzer = MetadataAnalyzer(ydl_pool=self.ydl_pool)
+        self.stream_cache = None
+        if self.config.get('stream_cache_dir'):
+            self.stream_cache = StreamCache(self.config.get('stream_cache_dir'), self.config.get('stream_cache_max_bytes'))
+        self.egress_pool = EgressPool.from_config(self.config)
+        self.unavailable = UnavailableCache.from_config(self.config)
+        self.downloader = Downloader(
+            ydl_pool=self.ydl_pool,
+            staging_dir=self.config.get('staging_dir') or None,
+            stream_cache=self.stream_cache,
+            egress_pool=self.egress_pool,
+            verifier=OutputVerifier.from_config(self.config),
+            unavailable=self.unavailable,
+            chapter_splitter=ChapterSplitter.from_config(self.config),
+            live_settings=live_settings_from_config(self.config),
+        )
+        self.output_index = OutputIndex()
+        self.runner = JobRunner(self.downloader, self.output_index)
 
     def run(self):
         """메인 루프"""
@@ -24,6 +59,8 @@ class AppController:
             
             if not choice or "Exit" in choice:
                 Logger.info("프로그램을 종료합니다.")
+                self.ydl_pool.close_all()
+                self.downloader.chapter_splitter.shutdown()
                 sys.exit(0)
                 
             elif "Download" in choice:
@@ -75,6 +112,18 @@ class AppController:
             
             if not final_options: continue 
 
+            # [Catalog] 'meta' 키워드: 미디어 없이 메타데이터 카탈로그만 생성
+            if final_options.get('metadata'):
+                self._execute_catalog(tasks)
+                continue
+
+            if final_options.get('split_chapters') and not meta.chapters:
+                Logger.warning("분석한 영상에 챕터 정보가 없습니다. 챕터가 없는 영상은 한 파일로 저장됩니다.")
+
+            # [Preflight] 여유 공간 사전 점검
+            if not self._preflight_disk_space(meta, final_options, len(final_queue_items)):
+                continue
+
             # 1-4. 실행
             self._execute_download(final_queue_items, final_options)
 
@@ -83,7 +132,54 @@ class AppController:
             next_action = self.ui.ask_select("다음 작업:", ["1. 다른 영상 다운로드", "2. 메인 메뉴로"])
             if "메인" in next_action: break
 
+    def _execute_catalog(self, tasks):
+        out_dir = os.path.join(self.config.get('default_output_dir'), "Catalog")
+        exporter = CatalogExporter(self.analyzer, out_dir, self.config.get('max_workers'))
+        try:
+            with self.ui.get_progress_bar() as progress:
+                tid = progress.add_task("[magenta]Catalog", total=None, filename="Collecting metadata")
+                stats = exporter.export(tasks, lambda rec: progress.update(tid, advance=1, filename=rec.get('title') or rec['url']))
+        finally:
+            exporter.close()
+        Logger.success(f"카탈로그 완료: 수집 {stats['fetched']}, 건너뜀 {stats['skipped']}, 실패 {stats['failed']} → {out_dir}")
+
+    def _preflight_disk_space(self, meta, options, item_count):
+        """분석한 첫 영상의 예상 크기 x 항목 수로 배치 전체 필요 공간을 추정하여 점검합니다."""
+        per_item = self.analyzer.estimate_download_size(meta.formats, options, meta.duration)
+        if not per_item: return True
+
+        required = per_item * item_count
+        targets = [("출력 폴더", self.config.get('default_output_dir'), required)]
+        if self.downloader.staging_dir:
+            # 동시 작업 수만큼의 중간 파일(원본 + 변환본)만 스테이징에 머무름
+            concurrent = min(item_count, self.config.get('max_workers'))
+            targets.append(("작업 폴더", self.downloader.staging_dir, per_item * 2 * concurrent))
+
+        ok = True
+        for label, path, need in targets:
+            try:
+                check_free_space(path, need, label=label)
+            except InsufficientSpaceError as e:
+                Logger.warning(str(e))
+                ok = False
+
+        if ok:
+            Logger.info(f"예상 다운로드 용량: 약 {format_bytes(required)} ({item_count}개 항목)")
+            return True
+        return self.ui.ask_confirm("여유 공간이 부족할 수 있습니다. 계속하시겠습니까?")
+
     def _prepare_download_items(self, tasks):
+        queue_items = self._collect_download_items(tasks)
+        if not self.unavailable:
+            return queue_items
+
+        # [Negative cache] 최근 접근 불가(비공개/삭제/멤버십/지역 제한)로 기록된 영상은 큐에 넣지 않음
+        kept, skipped = self.unavailable.filter_items(queue_items)
+        if skipped:
+            print_unavailable(skipped)
+        return kept
+
+    def _collect_download_items(self, tasks):
         queue_items = []
         base_dir = self.config.get('default_output_dir')
 
@@ -102,7 +198,8 @@ class AppController:
                         if items:
                             pl_path = os.path.join(save_path, "Playlist_Download")
                             for item in items:
-                                queue_items.append({'url': item['url'], 'path': pl_path, 'flags': {}})
+                                queue_items.append({'url': item['url'], 'id': item.get('id'), 'title': item.get('title'),
+                                                    'path': pl_path, 'flags': {}})
                             continue
                         else:
                             Logger.warning("목록을 가져오지 못해 단일 영상으로 처리합니다.")
@@ -142,10 +239,11 @@ class AppController:
             if mode == 'audio':
                 blocked_keys = ['height', 'fps', 'video_codec', 'hdr', 'chroma_subsampling']
                 removed = []
-                for key in blocked_keys:
-                    if options.get(key):
-                        removed.append(key)
-                        options[key] = None
+                for target in [options] + options.get('renditions', []):  # 멀티 출력은 결과물마다
+                    for key in blocked_keys:
+                        if target.get(key):
+                            if key not in removed: removed.append(key)
+                            target[key] = None
                 
                 # 비디오 전용 확장자가 들어왔을 경우 오디오로 변경하지 않고 경고만 (사용자 의도일 수 있음)
                 # 하지만 보통은 mp3 등으로 변환을 원하므로, 
@@ -155,6 +253,12 @@ class AppController:
                 if removed:
                     Logger.warning(f"[Auto-Correction] 오디오 모드이므로 다음 비디오 설정이 무시되었습니다: {removed}")
 
+            # [Validate] 이 FFmpeg로 만들 수 없는 조합은 다운로드 전에 거부
+            problems = self.downloader.ffmpeg_handler.validate_options(options)
+            if problems:
+                for msg in problems: Logger.error(f"옵션 오류: {msg}")
+                continue
+
             # D. 확인
             confirm_action = self.ui.confirm_options(options)
             
@@ -165,47 +269,164 @@ class AppController:
     def _execute_download(self, queue_items, global_options):
         if not queue_items: return
         max_workers = self.config.get('max_workers')
-        
+
+        # [Dedupe] 같은 영상 + 같은 출력 옵션은 한 번만 받고 나머지 폴더에는 링크
+        all_items = queue_items
+        queue_items, merged = group_duplicates(queue_items, global_options)
+        if merged:
+            Logger.info(f"중복 항목 {merged}개는 한 번만 다운로드하고 각 폴더에 링크합니다.")
+        policy = self.config.get('schedule_policy')
+        control = JobController(queue_items, policy=policy)
+
+        # [SJF] 대기 작업의 예상 크기를 백그라운드에서 분석 (작은 작업부터 실행해 평균 완료 시간 단축)
+        prober = None
+        if policy == 'sjf':
+            prober = SizeProber(self.analyzer, control)
+            for job in control.jobs.values():
+                prober.probe(job['id'], job['item'], global_options)
+        batch_start = time.monotonic()
+        completion_times = []
+
+        # [Profile] 긴 배치의 메모리/CPU 추적 (profile_mode 또는 --profile로 켠 경우만)
+        profiler = BatchProfiler.from_config(self.config)
+        futures = []
+        if profiler:
+            profiler.watch('pending_futures', lambda: sum(1 for f in list(futures) if not f.done()))
+            profiler.watch('jobs', lambda: len(control.jobs))
+            profiler.watch('ydl_pool', lambda: self.ydl_pool.size())
+            profiler.start()
+
         with self.ui.get_progress_bar() as progress:
             total_task = progress.add_task("[magenta]Total", total=len(queue_items), filename="Batch Processing")
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {}
-                for item in queue_items:
-                    final_item_opts = global_options.copy()
-                    if item.get('flags'):
-                        final_item_opts.update(item['flags'])
-
-                    tid = progress.add_task("Waiting...", total=100, filename="Pending")
-                    
-                    def mk_cb(t):
-                        def cb(d):
-                            if d['status']=='downloading':
-                                progress.update(t, description="[cyan]DL", completed=d.get('percent',0), filename=d.get('filename','Downloading...'))
-                            elif d['status']=='finished':
-                                progress.update(t, description="[green]Conv", completed=100)
-                        return cb
-                    
-                    if not os.path.exists(item['path']):
-                        os.makedirs(item['path'])
-
-                    fut = executor.submit(
-                        self.downloader.download, 
-                        [item['url']], item['path'], final_item_opts, mk_cb(tid)
-                    )
-                    futures[fut] = tid
-                
-                for fut in as_completed(futures):
-                    tid = futures[fut]
+            task_ids = {
+                job_id: progress.add_task("Waiting...", total=100, filename=f"#{job_id} Pending")
+                for job_id in control.jobs
+            }
+            if profiler:
+                profiler.watch('progress_tasks', lambda: len(progress.tasks))
+
+            def refresh_states():
+                """일시정지/취소 상태를 대시보드에 반영"""
+                for job in control.snapshot():
+                    tid = task_ids[job['id']]
+                    if job['state'] == 'paused':
+                        progress.update(tid, description="[yellow]Paused")
+                    elif job['state'] == 'cancelled':
+                        progress.update(tid, description="[bold red]Cancelled")
+                paused_mark = " [PAUSED]" if control.batch_paused else ""
+                progress.update(total_task, filename=f"Batch Processing{paused_mark}")
+
+            def show_progress(job_id, d):
+                t = task_ids[job_id]
+                if d['status']=='downloading':
+                    progress.update(t, description="[cyan]DL", completed=d.get('percent',0), filename=d.get('filename','Downloading...'))
+                elif d['status']=='finished':
+                    progress.update(t, description="[green]Conv", completed=100)
+
+            def mk_cb(job_id):
+                def cb(d):
+                    # [Control] 협조적 일시정지/취소 지점
+                    if control.is_paused(job_id):
+                        progress.update(task_ids[job_id], description="[yellow]Paused")
+                    control.checkpoint(job_id)
+                    show_progress(job_id, d)
+                return cb
+
+            # [Backend] process: 워커 프로세스마다 Downloader를 두어 추출 단계의 GIL 경합을 피함
+            backend = None
+            if self.config.get('worker_backend') == 'process':
+                backend = ProcessBackend(self.config, max_workers)
+                backend.start_events(show_progress)
+                control.add_listener(lambda: backend.sync_flags(control.snapshot()))
+
+            def run_next():
+                """워커가 비는 시점에 우선순위가 가장 높은 대기 작업을 꺼내 실행"""
+                job = control.next_job()
+                if job is None: return None, None
+
+                item = job['item']
+                try:
+                    control.checkpoint(job['id'])
+                    if backend:
+                        res = backend.run(job['id'], item, global_options)
+                    else:
+                        res = self.runner.run(item, global_options, mk_cb(job['id']), job['id'])
+                    if res and res[0].get('deduped'):
+                        progress.update(task_ids[job['id']], completed=100, filename=os.path.basename(res[0]['filepath']))
+                except JobCancelled:
+                    res = [{'status': 'cancelled', 'url': item['url']}]
+                finally:
+                    control.finish(job['id'])
+                return job['id'], res
+
+            server = None
+            if self.config.get('control_port'):
+                server = ControlServer(control, self.config.get('control_port'))
+                if server.start():
+                    Logger.info(f"제어 소켓: 127.0.0.1:{server.port} (status / pause / resume / cancel / priority)")
+            keyboard = KeyboardControl(control, on_change=refresh_states)
+            if keyboard.start():
+                Logger.info(KEYBOARD_HELP)
+
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures.extend(executor.submit(run_next) for _ in queue_items)
                     try:
-                        res = fut.result()
-                        progress.update(tid, description="[bold green]Done")
-                    except Exception as e:
-                        progress.update(tid, description="[bold red]Error", filename="System Error")
-                    progress.advance(total_task)
-        
+                        for fut in as_completed(futures):
+                            try:
+                                job_id, res = fut.result()
+                                if job_id is None: continue
+                                completion_times.append(time.monotonic() - batch_start)
+                                tid = task_ids[job_id]
+                                status = res[0]['status'] if res else 'error'
+                                if status == 'success':
+                                    progress.update(tid, description="[bold green]Done")
+                                elif status == 'cancelled':
+                                    progress.update(tid, description="[bold red]Cancelled")
+                                else:
+                                    progress.update(tid, description="[bold red]Error", filename="Download Failed")
+                            except Exception as e:
+                                Logger.error(f"작업 실행 오류: {e}")
+                            progress.advance(total_task)
+                    except KeyboardInterrupt:
+                        # Ctrl-C: 프로세스를 죽이지 않고 남은 작업을 취소 (.part 파일 보존)
+                        Logger.warning("중단 요청됨: 남은 작업을 취소합니다. (부분 파일은 이어받기를 위해 보존)")
+                        control.cancel()
+                        control.resume()
+            finally:
+                keyboard.stop()
+                if server: server.stop()
+                if backend:
+                    backend.collect_counters(self.runner)  # 요약 통계는 자식 프로세스의 것을 합산
+                    backend.shutdown()
+                if prober: prober.shutdown()
+                if profiler: log_profile_summary(profiler.stop())
+
         Logger.success("다운로드 작업 완료!")
-        last_dir = queue_items[-1]['path'] if queue_items else self.config.get('default_output_dir')
+        if completion_times:
+            Logger.info(f"평균 완료 시간: {sum(completion_times) / len(completion_times):.1f}초 (스케줄링: {policy})")
+        if self.stream_cache:
+            st = self.stream_cache.get_stats()
+            Logger.info(
+                f"스트림 캐시: 적중 {st['hits']} / 실패 {st['misses']}, 저장 {st['stores']}, "
+                f"제거 {st['evictions']} ({format_bytes(st['evicted_bytes'])}), "
+                f"사용량 {format_bytes(st['bytes'])} / {format_bytes(st['max_bytes'])}"
+            )
+        if self.unavailable and self.unavailable.stats['recorded']:
+            Logger.info(f"접근 불가로 새로 기록된 영상: {self.unavailable.stats['recorded']}개 (다음 실행부터 건너뜀)")
+        verifier = self.downloader.verifier
+        if verifier and (verifier.stats['verified'] or verifier.stats['failed']):
+            Logger.info(f"결과물 검증: 통과 {verifier.stats['verified']} / 손상 감지 후 재다운로드 {verifier.stats['failed']}")
+        splitter = self.downloader.chapter_splitter
+        if splitter.stats['copied'] or splitter.stats['encoded']:
+            Logger.info(f"챕터 분할: 스트림 복사 {splitter.stats['copied']} / 재인코딩 {splitter.stats['encoded']}")
+        if self.egress_pool:
+            for st in self.egress_pool.get_stats():
+                Logger.info(
+                    f"송신 경로 {st['egress']}: 작업 {st['jobs']} (성공 {st['successes']}, 실패 {st['failures']}, "
+                    f"429 {st['throttled']}), {format_bytes(st['bytes'])} @ {format_bytes(st['avg_bps'])}/s"
+                )
+        last_dir = all_items[-1]['path'] if all_items else self.config.get('default_output_dir')
         if self.ui.ask_confirm("폴더를 여시겠습니까?"):
             open_file_explorer(last_dir)
 
@@ -224,6 +445,14 @@ class AppController:
                     self.config.set('default_output_dir', new_path)
                     Logger.success("저장되었습니다.")
 
+            elif "Staging" in choice:
+                curr = self.config.get('staging_dir')
+                new_path = self.ui.ask_settings_staging_directory(curr)
+                if new_path is not None:
+                    self.config.set('staging_dir', new_path)
+                    self.downloader.staging_dir = new_path or None
+                    Logger.success("저장되었습니다.")
+
             elif "작업 수" in choice:
                 curr = self.config.get('max_workers')
                 val = self.ui.ask_settings_workers(curr)
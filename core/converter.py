@@ -0,0 +1,191 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.loudness import hash_file
+from core.parser import AUDIO_EXTS, VIDEO_EXTS
+from ui.logger import Logger
+
+MANIFEST_NAME = '.convert_manifest.json'
+RESULT_LOG_NAME = 'convert_log.jsonl'
+MANIFEST_FLUSH_EVERY = 50  # 매니페스트 저장 주기 (완료 파일 수 기준)
+
+# 변환 결과에 영향을 주지 않는 옵션 (최신 여부 판별 키에서 제외)
+NON_OUTPUT_KEYS = ('noplaylist', 'metadata')
+
+# 자식 프로세스 전역 FFmpegHandler (프로세스마다 하나)
+_handler = None
+
+
+def _init_worker():
+    global _handler
+    from core.ffmpeg_handler import FFmpegHandler
+    _handler = FFmpegHandler()
+
+
+def _convert_one(src: str, dest: str, options: dict) -> dict:
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    base, ext = os.path.splitext(dest)
+    # 중단되더라도 완성본처럼 보이는 파일이 남지 않도록 임시 이름으로 쓴 뒤 교체
+    temp_output = f"{base}.converting{ext}"
+    extra_args = ['-vn'] if options.get('ext') in AUDIO_EXTS else None
+
+    ok = _handler.process_media([src], temp_output, options, extra_args)
+    if not ok:
+        if os.path.exists(temp_output): os.remove(temp_output)
+        return {'status': 'error', 'seconds': round(time.perf_counter() - start, 2)}
+    os.replace(temp_output, dest)
+    # 매니페스트용 원본 해시도 자식 프로세스에서 계산 (부모의 결과 처리 루프를 가볍게 유지)
+    return {'status': 'success', 'seconds': round(time.perf_counter() - start, 2), 'src_hash': hash_file(src)}
+
+
+def options_key(options: dict) -> str:
+    effective = {k: v for k, v in options.items() if k not in NON_OUTPUT_KEYS and v}
+    return json.dumps(effective, sort_keys=True, default=str)
+
+
+class LibraryConverter:
+    """
+    로컬 미디어 폴더에 옵션 문자열(또는 프리셋)을 일괄 적용하는 변환 전용 모드
+    폴더 구조를 그대로 유지해 출력 폴더에 기록하며, 코어 수만큼의 프로세스 풀에서 FFmpeg를 실행합니다.
+    출력 폴더의 매니페스트(원본 mtime/크기/해시 + 옵션)로 이미 최신인 결과물은 건너뜁니다.
+    """
+
+    def __init__(self, src_root: str, dest_root: str, options: dict, max_workers: int = None):
+        self.src_root = os.path.abspath(src_root)
+        self.dest_root = os.path.abspath(dest_root)
+        if self.src_root == self.dest_root:
+            raise ValueError("출력 폴더는 원본 폴더와 달라야 합니다.")
+        self.options = options
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.manifest_path = os.path.join(self.dest_root, MANIFEST_NAME)
+        self.log_path = os.path.join(self.dest_root, RESULT_LOG_NAME)
+        self.manifest = {}
+        self.stats = {'converted': 0, 'skipped': 0, 'failed': 0}
+        os.makedirs(self.dest_root, exist_ok=True)
+        self._load_manifest()
+
+    def scan(self) -> list:
+        """
+        원본 폴더에서 미디어 파일을 찾아 (원본, 출력) 경로 쌍을 반환합니다. (출력 폴더는 제외)
+        출력 이름이 겹치면(song.flac / song.mp3 → song.mp3) 출력과 확장자가 같은 원본(없으면 이름순 첫 파일)만
+        원래 이름을 쓰고, 나머지는 'song (flac).mp3'처럼 원본 확장자를 붙여 구분합니다.
+        """
+        pairs = []
+        for dirpath, dirnames, filenames in os.walk(self.src_root):
+            dirnames[:] = sorted(d for d in dirnames if os.path.join(dirpath, d) != self.dest_root)
+            rel_dir = os.path.relpath(dirpath, self.src_root)
+            groups = {}  # 출력 이름(대소문자 무시) → [(원본 이름, stem, 원본 확장자)]
+            for name in sorted(filenames):
+                stem, ext = os.path.splitext(name)
+                if ext[1:].lower() not in VIDEO_EXTS + AUDIO_EXTS:
+                    continue
+                out_ext = self.options.get('ext') or ext[1:]
+                groups.setdefault(f"{stem}.{out_ext}".lower(), []).append((name, stem, ext[1:]))
+
+            used = set(groups)
+            for sources in groups.values():
+                out_ext = self.options.get('ext') or sources[0][2]
+                # 출력과 확장자가 같은 원본이 원래 이름을 유지 (정렬이 안정적이므로 실행마다 같은 이름 → 매니페스트 유지)
+                sources.sort(key=lambda entry: entry[2].lower() != out_ext.lower())
+                for index, (name, stem, src_ext) in enumerate(sources):
+                    dest_name = f"{stem}.{out_ext}"
+                    if index:
+                        dest_name = f"{stem} ({src_ext}).{out_ext}"
+                        suffix = 2
+                        while dest_name.lower() in used:
+                            dest_name = f"{stem} ({src_ext} {suffix}).{out_ext}"
+                            suffix += 1
+                        used.add(dest_name.lower())
+                        Logger.warning(f"출력 이름이 겹쳐 '{dest_name}'(으)로 저장합니다: {os.path.join(rel_dir, name)}")
+                    dest = os.path.normpath(os.path.join(self.dest_root, rel_dir, dest_name))
+                    pairs.append((os.path.join(dirpath, name), dest))
+        return pairs
+
+    def run(self, progress_callback=None) -> dict:
+        pairs = self.scan()
+        key = options_key(self.options)
+        todo = []
+        for src, dest in pairs:
+            if self._is_up_to_date(src, dest, key):
+                self.stats['skipped'] += 1
+                self._log(src, dest, {'status': 'skipped'})
+            else:
+                todo.append((src, dest))
+
+        Logger.info(f"변환 대상 {len(todo)}개 (최신 상태로 건너뜀 {self.stats['skipped']}개, 프로세스 {self.max_workers}개)")
+        try:
+            self._convert_all(todo, key, progress_callback)
+        finally:
+            self._save_manifest()
+        return self.stats
+
+    def _convert_all(self, todo: list, key: str, progress_callback):
+        if todo:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker) as pool:
+                futures = {pool.submit(_convert_one, src, dest, self.options): (src, dest) for src, dest in todo}
+                for fut in as_completed(futures):
+                    src, dest = futures.pop(fut)
+                    try:
+                        result = fut.result()
+                    except Exception as e:
+                        result = {'status': 'error', 'error': str(e)}
+                    if result['status'] == 'success':
+                        self.stats['converted'] += 1
+                        self._record(src, dest, key, result.pop('src_hash'))
+                        if self.stats['converted'] % MANIFEST_FLUSH_EVERY == 0:
+                            self._save_manifest()
+                    else:
+                        self.stats['failed'] += 1
+                    self._log(src, dest, result)
+                    if progress_callback:
+                        progress_callback(src, result)
+
+    # --- 최신 여부 판별 ---
+    def _is_up_to_date(self, src: str, dest: str, key: str) -> bool:
+        entry = self.manifest.get(os.path.relpath(dest, self.dest_root))
+        if not entry or entry['options'] != key or not os.path.isfile(dest):
+            return False
+        st = os.stat(src)
+        if entry['src_mtime'] == st.st_mtime and entry['src_size'] == st.st_size:
+            return True
+        # mtime만 바뀐 경우(복사/터치)는 내용 해시로 재확인
+        if entry['src_size'] == st.st_size and entry['src_hash'] == hash_file(src):
+            entry['src_mtime'] = st.st_mtime
+            return True
+        return False
+
+    def _record(self, src: str, dest: str, key: str, src_hash: str):
+        st = os.stat(src)
+        self.manifest[os.path.relpath(dest, self.dest_root)] = {
+            'src': os.path.relpath(src, self.src_root),
+            'src_mtime': st.st_mtime,
+            'src_size': st.st_size,
+            'src_hash': src_hash,
+            'options': key,
+        }
+
+    def _log(self, src: str, dest: str, result: dict):
+        record = dict(result, src=src, dest=dest, time=time.strftime('%Y-%m-%d %H:%M:%S'))
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest.update(json.load(f))
+        except Exception as e:
+            Logger.warning(f"변환 매니페스트 로드 중 오류: {e}")
+
+    def _save_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception as e:
+            Logger.warning(f"변환 매니페스트 저장 실패: {e}")
@@ -0,0 +1,372 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.config import ConfigManager
+from core.job_control import CANCELLED, JobController, JobCancelled, execute_command
+from core.job_runner import JobRunner
+from core.metadata import MetadataAnalyzer
+from core.parser import parse_quality_string
+from core.size_probe import SizeProber
+from core.ydl_pool import YDLPool
+from ui.logger import Logger
+
+
+class EventBus:
+    """진행 이벤트를 구독자(/events 스트림)별 큐로 전달합니다. 느린 구독자는 오래된 이벤트부터 버립니다."""
+
+    def __init__(self, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self) -> queue.Queue:
+        q = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def publish(self, event: dict):
+        event = dict(event, ts=time.time())
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                    q.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+
+class DaemonService:
+    """
+    상주(데몬) 모드
+    Downloader / MetadataAnalyzer / YoutubeDL 풀 / 캐시를 한 번만 초기화해 두고,
+    로컬 HTTP API로 들어오는 작업을 워커 스레드가 계속 처리합니다.
+    """
+
+    def __init__(self, config: ConfigManager = None):
+        self.config = config if config else ConfigManager()
+        self.ydl_pool = YDLPool()
+        self.analyzer = MetadataAnalyzer(ydl_pool=self.ydl_pool)
+        self.runner = JobRunner.from_config(self.config, ydl_pool=self.ydl_pool)
+        self.downloader = self.runner.downloader
+        self.stream_cache = self.downloader.stream_cache
+        self.control = JobController(policy=self.config.get('schedule_policy'))
+        self.prober = SizeProber(self.analyzer, self.control) if self.control.policy == 'sjf' else None
+        self.events = EventBus()
+        self.records = {}  # job_id -> 작업 상세 (옵션, 진행률, 결과)
+        self._lock = threading.Lock()
+        self._workers = []
+
+    # --- 수명 주기 ---
+    def start(self):
+        for i in range(self.config.get('max_workers')):
+            t = threading.Thread(target=self._worker_loop, name=f"daemon-worker-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    def stop(self):
+        if self.prober: self.prober.shutdown()
+        self.control.cancel()
+        self.control.close()
+        for t in self._workers:
+            t.join(timeout=5)
+        self.ydl_pool.close_all()
+        self.downloader.chapter_splitter.shutdown()
+
+    # --- API ---
+    def submit(self, urls: list, option_str: str = None, preset: str = None, output_dir: str = None,
+               priority: int = 0, playlist: bool = False) -> list:
+        """작업을 등록하고 작업 번호 리스트를 반환합니다."""
+        if preset:
+            presets = self.config.get_presets()
+            if preset not in presets:
+                raise ValueError(f"프리셋을 찾을 수 없습니다: {preset}")
+            option_str = presets[preset]
+        options = parse_quality_string(option_str or "")
+        problems = self.runner.downloader.ffmpeg_handler.validate_options(options)
+        if problems:
+            raise ValueError('; '.join(problems))
+        save_path = output_dir or self.config.get('default_output_dir')
+
+        items = []
+        for url in urls:
+            if playlist and 'list=' in url:
+                entries = self.analyzer.get_playlist_items(url)
+                pl_path = os.path.join(save_path, "Playlist_Download")
+                items.extend({'url': e['url'], 'id': e.get('id'), 'path': pl_path, 'flags': {}} for e in entries)
+            else:
+                items.append({'url': url, 'path': save_path, 'flags': {'noplaylist': True}})
+
+        # [Negative cache] 최근 접근 불가로 기록된 영상은 워커에 보내지 않음
+        unavailable = self.downloader.unavailable
+        if unavailable:
+            items, skipped = unavailable.filter_items(items)
+            for entry in skipped:
+                self.events.publish({'event': 'skipped', 'url': entry['url'], 'reason': entry['reason']})
+            if skipped:
+                Logger.info(f"접근 불가 기록으로 {len(skipped)}개 항목을 건너뜀")
+
+        job_ids = []
+        for item in items:
+            item['priority'] = priority
+            item['options'] = options
+            with self._lock:
+                job_id = self.control.add_job(item)
+                self.records[job_id] = {
+                    'id': job_id, 'url': item['url'], 'path': item['path'], 'options': option_str or "",
+                    'percent': 0, 'speed': None, 'filename': None, 'result': None, 'submitted': time.time(),
+                }
+            if self.prober:
+                self.prober.probe(job_id, item, options)
+            job_ids.append(job_id)
+            self.events.publish({'event': 'submitted', 'id': job_id, 'url': item['url']})
+        return job_ids
+
+    def get_job(self, job_id: int) -> dict | None:
+        return self._job_view(job_id, self.control.get(job_id))
+
+    def list_jobs(self) -> list:
+        # 제어기 상태는 요청당 한 번만 복사 (워커가 쓰는 제어기 잠금을 오래 잡지 않도록)
+        states = {j['id']: j for j in self.control.snapshot()}
+        with self._lock:
+            ids = list(self.records)
+        jobs = (self._job_view(job_id, states.get(job_id)) for job_id in ids)
+        return [job for job in jobs if job]  # 조회 중 보관 기간이 지나 지워진 작업 제외
+
+    def _job_view(self, job_id: int, state: dict | None) -> dict | None:
+        with self._lock:
+            record = self.records.get(job_id)
+            if not record:
+                return None
+            record = dict(record)
+        state = state or {}
+        record['state'] = state.get('state')
+        record['priority'] = state.get('priority')
+        return record
+
+    def control_job(self, job_id: int, action: str) -> dict:
+        """작업 제어 (cancel / pause / resume)"""
+        reply = execute_command(self.control, f"{action} {job_id}")
+        if action == 'cancel' and reply.get('ok'):
+            self._finish_cancelled(job_id)
+        return reply
+
+    def _finish_cancelled(self, job_id: int):
+        """대기 중에 취소된 작업은 워커가 꺼내지 않으므로 여기서 결과를 남기고 완료 이벤트를 보냄 (submit --wait 종료)"""
+        state = self.control.get(job_id)
+        if not state or state['state'] != CANCELLED or not state['finished']:
+            return  # 실행 중 취소: 워커가 결과를 남김
+        result = {'status': 'cancelled', 'url': state['url'], 'msg': "Cancelled by user"}
+        with self._lock:
+            record = self.records.get(job_id)
+            if not record or record['result'] is not None:
+                return
+            record['result'] = result
+        self.events.publish({'event': 'finished', 'id': job_id, 'result': result})
+        self._prune_finished()
+
+    def stats(self) -> dict:
+        return {
+            'workers': len(self._workers),
+            'ydl_pool': dict(self.ydl_pool.stats),
+            'stream_cache': self.stream_cache.get_stats() if self.stream_cache else None,
+            'egress': self.downloader.egress_pool.get_stats() if self.downloader.egress_pool else None,
+        }
+
+    # --- 워커 ---
+    def _worker_loop(self):
+        while True:
+            job = self.control.next_job(wait_for_new=True)
+            if job is None:
+                return
+            job_id = job['id']
+            item = job['item']
+            self.events.publish({'event': 'started', 'id': job_id})
+            try:
+                self.control.checkpoint(job_id)
+                res = self.runner.run(item, item['options'], self._make_progress_cb(job_id), job_id)
+            except JobCancelled:
+                res = [{'status': 'cancelled', 'url': item['url']}]
+            except Exception as e:
+                res = [{'status': 'error', 'url': item['url'], 'msg': str(e)}]
+
+            # 결과를 먼저 남긴 뒤 finish() (끝난 작업 정리/대기 중 취소 처리와 겹치지 않도록)
+            result = res[0] if res else {'status': 'error', 'msg': 'No result'}
+            with self._lock:
+                record = self.records.get(job_id)
+                if record is not None:
+                    record['result'] = result
+                    if result.get('status') == 'success':
+                        record['percent'] = 100
+            self.control.finish(job_id)
+            self.events.publish({'event': 'finished', 'id': job_id, 'result': result})
+            self._prune_finished()
+
+    def _prune_finished(self):
+        """끝난 작업은 최근 daemon_keep_finished개 / daemon_finished_ttl초만 보관 (상주 프로세스의 메모리 증가 방지)"""
+        ttl = self.config.get('daemon_finished_ttl')
+        pruned = self.control.prune_finished(self.config.get('daemon_keep_finished'), ttl or None)
+        if pruned:
+            with self._lock:
+                for job_id in pruned:
+                    self.records.pop(job_id, None)
+
+    def _make_progress_cb(self, job_id):
+        last = {'percent': -1}
+
+        def cb(d):
+            self.control.checkpoint(job_id)
+            with self._lock:
+                record = self.records[job_id]
+                if d['status'] == 'downloading':
+                    record.update(percent=d.get('percent', 0), speed=d.get('speed'), filename=d.get('filename'))
+                elif d['status'] == 'finished':
+                    record['filename'] = d.get('filename')
+            # 이벤트 폭주 방지: 1% 단위 변화 또는 상태 변화만 전송
+            percent = int(d.get('percent') or 0)
+            if d['status'] != 'downloading' or percent != last['percent']:
+                last['percent'] = percent
+                self.events.publish({'event': 'progress', 'id': job_id, 'status': d['status'],
+                                     'percent': d.get('percent'), 'speed': d.get('speed')})
+        return cb
+
+
+class DaemonServer:
+    """
+    로컬 HTTP API (127.0.0.1)
+      POST /jobs                 작업 제출 {"urls": [...], "options": "...", "preset": "...", "output_dir": "...", "priority": 0, "playlist": false}
+      GET  /jobs                 작업 목록
+      GET  /jobs/<id>            작업 상태
+      POST /jobs/<id>/cancel     작업 취소 (pause / resume 도 동일 형식)
+      GET  /events               진행 이벤트 스트림 (NDJSON)
+      GET  /stats                풀/캐시 통계
+    """
+
+    def __init__(self, service: DaemonService, port: int, host: str = '127.0.0.1'):
+        self.service = service
+        self.host = host
+        self.port = port
+        self._httpd = None
+
+    def serve_forever(self):
+        service = self.service
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                pass  # 접근 로그는 출력하지 않음
+
+            def _send_json(self, payload, status=200):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if not length:
+                    return {}
+                body = json.loads(self.rfile.read(length).decode('utf-8'))
+                if not isinstance(body, dict):
+                    raise ValueError("JSON object required")
+                return body
+
+            def do_GET(self):
+                if self.path == '/jobs':
+                    return self._send_json({'jobs': service.list_jobs()})
+                if match := re.match(r'^/jobs/(\d+)$', self.path):
+                    job = service.get_job(int(match.group(1)))
+                    return self._send_json(job) if job else self._send_json({'error': 'not found'}, 404)
+                if self.path == '/stats':
+                    return self._send_json(service.stats())
+                if self.path == '/events':
+                    return self._stream_events()
+                self._send_json({'error': 'not found'}, 404)
+
+            def do_POST(self):
+                try:
+                    body = self._read_json()
+                except (ValueError, UnicodeDecodeError):
+                    return self._send_json({'error': 'invalid json (object required)'}, 400)
+
+                if self.path == '/jobs':
+                    urls = body.get('urls') or ([body['url']] if body.get('url') else [])
+                    if not urls:
+                        return self._send_json({'error': 'urls required'}, 400)
+                    try:
+                        ids = service.submit(
+                            urls, body.get('options'), body.get('preset'), body.get('output_dir'),
+                            int(body.get('priority') or 0), bool(body.get('playlist')),
+                        )
+                    except (ValueError, TypeError) as e:
+                        return self._send_json({'error': str(e)}, 400)
+                    except Exception as e:
+                        # 재생목록 조회 실패 등: 연결을 끊지 않고 원인을 돌려줌
+                        Logger.error(f"작업 제출 실패: {e}")
+                        return self._send_json({'error': str(e)}, 500)
+                    return self._send_json({'jobs': ids}, 201)
+
+                if match := re.match(r'^/jobs/(\d+)/(cancel|pause|resume)$', self.path):
+                    job_id, action = match.group(1), match.group(2)
+                    reply = service.control_job(int(job_id), action)
+                    return self._send_json(reply, 200 if reply.get('ok') else 409)
+
+                self._send_json({'error': 'not found'}, 404)
+
+            def _stream_events(self):
+                q = service.events.subscribe()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.end_headers()
+                try:
+                    while True:
+                        try:
+                            event = q.get(timeout=15)
+                        except queue.Empty:
+                            event = {'event': 'heartbeat'}
+                        self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode('utf-8'))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    service.events.unsubscribe(q)
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.serve_forever()
+
+    def shutdown(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+
+def run_daemon(port: int = None):
+    """데몬 진입점: 서비스 워커를 띄우고 HTTP API를 블로킹으로 제공합니다."""
+    service = DaemonService()
+    port = port or service.config.get('daemon_port')
+    service.start()
+    server = DaemonServer(service, port)
+    Logger.info(f"데몬 시작: http://127.0.0.1:{port} (워커 {service.config.get('max_workers')}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        Logger.info("데몬을 종료합니다...")
+    finally:
+        server.shutdown()
+        service.stop()
@@ -1,59 +1,460 @@
+import json
 import os
+import re
 import time
-import yt_dlp
+from yt_dlp.networking import Request
+from yt_dlp.utils import DownloadCancelled, download_range_func
+from core.chapter_splitter import ChapterSplitter, chapter_spans
+from core.egress import EgressLease, EgressPool, YdlErrorLog
 from core.ffmpeg_handler import FFmpegHandler
+from core.live_recorder import LIVE_DEFAULTS, LiveRecorder
+from core.parser import AUDIO_EXTS, fanout_source_options
+from core.stream_cache import StreamCache
+from core.verifier import OutputVerifier
+from core.ydl_pool import YDLPool
+from ui.logger import Logger
 from utils.history import log_success
+from utils.storage import (InsufficientSpaceError, check_free_space, find_job_outputs, finalize_file, get_staging_dir,
+                           remove_empty_dir)
+from utils.system import extract_video_id
+from utils.unavailable import UnavailableCache, classify_unavailable
+
+
+class CorruptOutputError(RuntimeError):
+    """결과물 검증(ffprobe/크기) 실패 - 지우고 다시 받음"""
+
 
 class Downloader:
-    def __init__(self, ffmpeg_handler: FFmpegHandler = None):
+    def __init__(self, ffmpeg_handler: FFmpegHandler = None, ydl_pool: YDLPool = None, staging_dir: str = None,
+                 stream_cache: StreamCache = None, egress_pool: EgressPool = None, verifier: OutputVerifier = None,
+                 unavailable: UnavailableCache = None, chapter_splitter: ChapterSplitter = None, live_settings: dict = None):
         self.ffmpeg_handler = ffmpeg_handler if ffmpeg_handler else FFmpegHandler()
+        self.ydl_pool = ydl_pool if ydl_pool else YDLPool()
+        self.staging_dir = staging_dir  # 중간 파일(조각/병합/변환)을 쓸 로컬 고속 디스크 (None: 출력 폴더 사용)
+        self.stream_cache = stream_cache  # 원본 스트림 캐시 (None: 사용 안 함)
+        self.egress_pool = egress_pool  # 송신 경로(source_address/프록시) 풀 (None: 기본 경로)
+        self.verifier = verifier  # 결과물 해시/ffprobe 검증 풀 (None: 검증 안 함)
+        self.unavailable = unavailable  # 실행 간 접근 불가 영상 목록 (None: 사용 안 함)
+        if verifier and not verifier.ffprobe_path:
+            verifier.ffprobe_path = self.ffmpeg_handler.ffprobe_path
+        # 챕터 분할 프로세스 풀 (split 옵션을 쓰는 작업이 처음 나올 때 생성; 작업 간 공유로 동시 컷 수 제한)
+        self.chapter_splitter = chapter_splitter if chapter_splitter else ChapterSplitter()
+        if not self.chapter_splitter.ffmpeg_handler:
+            self.chapter_splitter.ffmpeg_handler = self.ffmpeg_handler
+        self.live_settings = dict(LIVE_DEFAULTS, **(live_settings or {}))  # 라이브 녹화 (롤링 길이/용량 상한 등)
         self.max_retries = 3
 
     def download(self, urls: list, output_dir: str, options: dict, progress_callback=None) -> list:
+        # 진행 단계 표시(Logger.stage)가 이 호출이 끝나면 원복되도록 문맥 안에서 실행 (프로파일러의 단계별 집계)
+        with Logger.context(stage='prepare'):
+            return self._download(urls, output_dir, options, progress_callback)
+
+    def _download(self, urls: list, output_dir: str, options: dict, progress_callback) -> list:
+        # 만들 수 없는 옵션 조합(없는 인코더/필터 등)은 한 바이트도 받기 전에 실패 처리
+        problems = self.ffmpeg_handler.validate_options(options)
+        if problems:
+            return [{'status': 'error', 'url': url, 'msg': '; '.join(problems)} for url in urls]
+
         results = []
-        ydl_opts = self._build_ydl_opts(output_dir, options, progress_callback)
-        
-        if options.get('noplaylist'):
-            ydl_opts['noplaylist'] = True
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            for url in urls:
-                retries = 0
-                success = False
-                
-                while retries < self.max_retries:
-                    try:
-                        info = ydl.extract_info(url, download=True)
-                        filename = ydl.prepare_filename(info)
-                        final_path = self._get_actual_filename(filename, options)
-
-                        # 심화 후처리 (Upscale, DSP 등)
-                        if options.get('use_enhance') or options.get('audio_channels') or options.get('use_upscale'):
-                            # print(f"[Post-Process] 심화 변환 시작: {final_path}")
-                            temp_output = final_path.replace('.', '_fixed.')
-                            
-                            # FFmpegHandler 호출
-                            if self.ffmpeg_handler.process_media([final_path], temp_output, options):
-                                if os.path.exists(final_path): os.remove(final_path)
-                                os.rename(temp_output, final_path)
-
-                        log_success(info.get('title'), url, final_path)
-                        
-                        results.append({'status': 'success', 'filepath': final_path, 'title': info.get('title')})
-                        success = True
+        for url in urls:
+            # [Staging] 모든 중간 I/O는 작업 전용 스테이징 폴더에서 수행하고, 완성본만 출력 폴더로 한 번 이동
+            # (같은 URL + 옵션은 같은 폴더 → 중단된 .part 이어받기)
+            work_dir = output_dir
+            if self.staging_dir:
+                job_key = f"{url}|{json.dumps(options, sort_keys=True, default=str)}"
+                work_dir = get_staging_dir(self.staging_dir, output_dir, job_key)
+            retries = 0
+            success = False
+            cancelled = False
+            error_msg = "Max retries exceeded"
+            unavailable = None
+
+            # [Negative cache] 최근 접근 불가로 기록된 영상은 추출/재시도 없이 바로 실패 처리
+            video_id = extract_video_id(url)
+            known = self.unavailable.check(video_id) if self.unavailable else None
+            if known:
+                results.append({'status': 'error', 'url': url, 'unavailable': known['reason'],
+                                'msg': f"접근 불가 기록으로 건너뜀 ({known['reason']}): {known['message']}"})
+                continue
+
+            while retries < self.max_retries:
+                # [Egress] 시도마다 송신 경로를 새로 배정 (429/네트워크 실패 후 재시도는 다른 경로로)
+                lease = self.egress_pool.acquire() if self.egress_pool else None
+                outcome = None
+                ydl_opts = self._build_ydl_opts(work_dir, options, progress_callback, lease)
+                error_log = lease or YdlErrorLog()  # 송신 경로 풀이 없을 때도 오류 메시지 수집
+                ydl_opts.setdefault('logger', error_log)  # 송신 경로가 있으면 lease가 logger
+                Logger.debug(f"다운로드 시도 {retries + 1}/{self.max_retries}: {url} (경로: {lease.egress.spec if lease else '기본'})")
+
+                if options.get('noplaylist'):
+                    ydl_opts['noplaylist'] = True
+
+                try:
+                    # [성능] 작업마다 YoutubeDL을 새로 만들지 않고 스레드별 풀에서 재사용
+                    with self.ydl_pool.acquire(ydl_opts) as ydl:
+                        info, final_paths = self._download_one(ydl, url, work_dir, output_dir, options, progress_callback,
+                                                              lease, error_log)
+
+                    # [Verify] 결과물마다 해시 + ffprobe 점검 (검증 풀에서 병렬); 잘리거나 손상되면 지우고 다시 받음
+                    checks = self._verify_outputs(info, options, final_paths)
+                    for final_path, check in zip(final_paths, checks):
+                        if not check.get('ok', True):
+                            self._discard_outputs(info, final_paths)
+                            raise CorruptOutputError(f"출력 검증 실패 ({os.path.basename(final_path)}): {check['problem']}")
+
+                    for final_path, check in zip(final_paths, checks):
+                        log_success(info.get('title'), url, final_path, check)
+
+                    result = {'status': 'success', 'filepath': final_paths[0], 'title': info.get('title')}
+                    if checks[0].get('hash'):
+                        result['hash'] = checks[0]['hash']
+                    if info.get('live_metrics'):
+                        result['live'] = info['live_metrics']  # 라이브 녹화 지연/누락 지표
+                    if len(final_paths) > 1:
+                        result['filepaths'] = final_paths  # 구간/챕터별 또는 멀티 출력 결과물
+                    results.append(result)
+                    success = outcome = True
+                    if self.unavailable: self.unavailable.forget(video_id)
+                    break
+
+                except DownloadCancelled:
+                    # 사용자 취소: 재시도하지 않으며 .part 파일은 이어받기를 위해 남겨둡니다.
+                    cancelled = True
+                    break
+
+                except InsufficientSpaceError as e:
+                    # 공간 부족은 재시도해도 해결되지 않으므로 즉시 실패 처리
+                    error_msg = str(e)
+                    break
+
+                except CorruptOutputError as e:
+                    retries += 1
+                    error_msg = str(e)
+                    Logger.warning(f"{e} - 다시 받습니다. ({retries}/{self.max_retries})")
+
+                except Exception as e:
+                    # 비공개/삭제/멤버십/지역 제한 등 영상 자체의 문제는 재시도해도 같으므로 기록 후 즉시 실패
+                    message = error_log.errors[-1] if error_log.errors else str(e)
+                    unavailable = classify_unavailable(message)
+                    if unavailable:
+                        error_msg = message
+                        if self.unavailable: self.unavailable.record(video_id, unavailable, message)
                         break
 
-                    except Exception as e:
-                        retries += 1
-                        # print(f"[Warning] 다운로드 실패. 재시도 중 ({retries}/{self.max_retries})... 원인: {e}")
-                        time.sleep(2)
-                
-                if not success:
-                    results.append({'status': 'error', 'url': url, 'msg': "Max retries exceeded"})
-        
+                    retries += 1
+                    Logger.debug(f"다운로드 실패. 재시도 중 ({retries}/{self.max_retries})... 원인: {e}")
+                    if lease:
+                        # 경로 건강도 반영 후 대기 (실패한 경로는 대기 중 다른 작업에 배정되지 않도록 먼저 반납)
+                        error_msg = lease.errors[-1] if lease.errors else str(e)
+                        self.egress_pool.release(lease, False, str(e))
+                        lease = None
+                    time.sleep(2)
+
+                finally:
+                    if lease: self.egress_pool.release(lease, outcome)
+
+            if success and work_dir != output_dir:
+                remove_empty_dir(work_dir)
+            if cancelled:
+                results.append({'status': 'cancelled', 'url': url, 'msg': "Cancelled by user"})
+            elif unavailable:
+                results.append({'status': 'error', 'url': url, 'msg': error_msg, 'unavailable': unavailable})
+            elif not success:
+                results.append({'status': 'error', 'url': url, 'msg': error_msg})
+
         return results
 
-    def _build_ydl_opts(self, output_dir: str, options: dict, progress_callback) -> dict:
+    def _verify_outputs(self, info: dict, options: dict, final_paths: list) -> list:
+        """검증 결과 리스트 (검증을 끈 경우 빈 dict)"""
+        if not self.verifier:
+            return [{} for _ in final_paths]
+        formats = info.get('requested_formats') or [info]
+        has_video = any(f.get('vcodec') not in (None, 'none') for f in formats)
+        has_audio = any(f.get('acodec') not in (None, 'none') for f in formats)
+        # 구간 파일은 각각 길이가 달라 길이 점검 생략 (스트림 구성/코덱/읽기 가능 여부만)
+        duration = None if self._has_sections(options) else info.get('duration')
+        # 챕터 파일은 분할할 때 기록한 각자의 챕터 길이로 점검 (이동 후에도 파일 이름은 같음)
+        chapter_durations = info.get('_chapter_durations') or {}
+        futures = []
+        for path in final_paths:
+            expected = chapter_durations.get(os.path.basename(path), duration)
+            ext = os.path.splitext(path)[1][1:].lower()
+            video = has_video and ext not in AUDIO_EXTS
+            futures.append(self.verifier.submit(path, {'duration': expected, 'video': video, 'audio': has_audio}))
+        Logger.stage('verify')
+        return [f.result() for f in futures]
+
+    def _discard_outputs(self, info: dict, final_paths: list):
+        for path in final_paths:
+            if os.path.exists(path): os.remove(path)
+        # 캐시 스트림에서 만든 결과물이었을 수 있으므로 캐시도 비움
+        if self.stream_cache and info.get('id'):
+            self.stream_cache.discard(info['id'])
+
+    def _download_one(self, ydl, url: str, work_dir: str, output_dir: str, options: dict, progress_callback, lease=None,
+                      error_log=None):
+        """URL 하나를 받아 후처리/최종 이동까지 수행하고 (info, 최종 경로 리스트)를 반환합니다."""
+        Logger.stage('extract')
+        info = ydl.extract_info(url, download=False)
+        if not info: raise RuntimeError("정보 추출 실패")
+
+        # [Live] 진행 중인 방송은 VOD 경로 대신 HLS 녹화기로 (DASH 전용이면 yt-dlp 기본 라이브 다운로드)
+        if info.get('is_live'):
+            manifest = self._live_manifest(info, options)
+            if manifest:
+                return info, self._record_live(ydl, info, manifest, work_dir, output_dir, options, progress_callback)
+            Logger.warning("HLS 라이브 매니페스트가 없어 yt-dlp 기본 라이브 다운로드로 진행합니다.")
+
+        # [Cache] 필요한 원본 스트림이 이미 로컬에 있으면 다운로드 없이 변환만 수행
+        cached_streams = self._resolve_cached_streams(info, options)
+        if cached_streams:
+            Logger.stage('render')
+            final_path = self._render_from_cache(ydl, info, cached_streams, options, progress_callback)
+        else:
+            # [Preflight] 선택된 포맷 크기로 여유 공간 사전 점검
+            expected = self._check_disk_space(info, work_dir, output_dir, options)
+            if lease: lease.expect(expected)
+
+            Logger.stage('download')
+            info = ydl.process_ie_result(info, download=True)
+            # ignoreerrors 설정으로 삼켜진 다운로드 오류(429 등)를 실패로 처리 (송신 경로가 있으면 경로 실패)
+            error_log = error_log or lease
+            if error_log and error_log.errors:
+                raise RuntimeError(error_log.errors[-1])
+            if self._has_sections(options):
+                return info, self._finish_sections(info, work_dir, output_dir, options)
+            if options.get('renditions'):
+                paths = self._fan_out(info, ydl.prepare_filename(info), options)
+                return info, self._finalize_all(work_dir, output_dir, self._split_chapters(info, paths, options), paths)
+            filename = ydl.prepare_filename(info)
+            final_path = self._get_actual_filename(filename, options)
+
+            # [Loudnorm] 오디오 모드는 원본 스트림에서 바로 인코딩 (측정 캐시 키 = 원본 내용 해시)
+            source = filename if self._skips_extract_audio(options) else final_path
+            # 심화 후처리 (Upscale, DSP, 음량 정규화 등) - 캐시 변환 시에는 같은 패스에서 이미 적용됨
+            self._post_process(source, final_path, options)
+
+        if options.get('split_chapters'):
+            paths = self._split_chapters(info, [final_path], options)
+            return info, self._finalize_all(work_dir, output_dir, paths, [final_path])
+        if work_dir != output_dir:
+            Logger.stage('finalize')
+            final_path = self._finalize(work_dir, output_dir, final_path)
+        return info, [final_path]
+
+    def _finish_sections(self, info: dict, work_dir: str, output_dir: str, options: dict) -> list:
+        """구간/챕터별로 받은 파일마다 정밀 컷 + 후처리 패스와 최종 이동을 수행하고 경로 리스트를 반환합니다."""
+        downloads = [d['filepath'] for d in info.get('requested_downloads') or [] if d.get('filepath')]
+        if not downloads:
+            raise RuntimeError("요청한 구간/챕터를 찾지 못했습니다.")
+        if options.get('renditions'):
+            # 구간마다 한 패스로 모든 결과물 생성 (비디오는 정밀 컷을 위해 스트림 복사하지 않음)
+            paths = [p for source in downloads for p in self._fan_out(info, source, options, copy_video=False)]
+            return self._finalize_all(work_dir, output_dir, paths)
+        paths = []
+        for source in downloads:
+            final_path = source
+            if self._skips_extract_audio(options):
+                final_path = f"{os.path.splitext(source)[0]}.{options['ext']}"
+            # 구간은 스트림 복사로 받아 앞부분이 직전 키프레임부터 들어 있음 (mp4 편집 목록으로 표시 시작점만 지정)
+            # 비디오는 재인코딩 패스에서 디코더가 시작점 이전 프레임을 버리므로 정확한 지점에서 잘림
+            # (오디오 모드는 yt-dlp의 오디오 변환이 이미 디코드 → 인코딩하므로 추가 패스 불필요)
+            final_path = self._post_process(source, final_path, options, force=not self._is_audio_mode(options))
+            if work_dir != output_dir:
+                Logger.stage('finalize')
+                final_path = self._finalize(work_dir, output_dir, final_path)
+            paths.append(final_path)
+        return paths
+
+    def _post_process(self, source: str, final_path: str, options: dict, force: bool = False) -> str:
+        """FFmpeg 한 패스로 심화 후처리를 적용합니다. (force: 후처리 옵션이 없어도 재인코딩)"""
+        if not (force or options.get('use_enhance') or options.get('audio_channels') or options.get('use_upscale') or options.get('loudnorm')):
+            return final_path
+        Logger.stage('postprocess')
+        base, ext = os.path.splitext(final_path)
+        temp_output = f"{base}_fixed{ext}"
+        extra_args = ['-vn'] if self._is_audio_mode(options) else None
+
+        # FFmpegHandler 호출
+        if self.ffmpeg_handler.process_media([source], temp_output, options, extra_args):
+            os.replace(temp_output, final_path)
+            if source != final_path: os.remove(source)
+        elif source != final_path:
+            raise RuntimeError("음량 정규화 변환 실패")
+        return final_path
+
+    def _fan_out(self, info: dict, source: str, options: dict, copy_video: bool = True) -> list:
+        """
+        받은 원본 하나로 결과물(renditions)을 모두 만들고 원본은 지웁니다. (FFmpeg 한 번 실행)
+        결과물 이름은 '제목.확장자'이고, 확장자가 겹치면 '제목 [720p].mp4'처럼 구분합니다.
+        """
+        Logger.stage('postprocess')
+        base, src_ext = os.path.splitext(source)
+        master = f"{base}.source{src_ext}"  # mkv 결과물 등과 이름이 겹치지 않도록
+        os.replace(source, master)
+
+        outputs, used = [], set()
+        for index, rendition in enumerate(options['renditions'], 1):
+            ext = rendition.get('ext') or 'mp4'
+            path = f"{base}.{ext}"
+            if path in used:
+                label = f"{rendition['height']}p" if rendition.get('height') else str(index)
+                path = f"{base} [{label}].{ext}"
+                if path in used:
+                    path = f"{base} [{label} {index}].{ext}"
+            used.add(path)
+            outputs.append((path, rendition))
+
+        formats = info.get('requested_formats') or [info]
+        videos = [f for f in formats if f.get('vcodec') not in (None, 'none')]
+        streams = {
+            'vcodec': videos[0]['vcodec'] if videos else None,
+            'acodec': next((f['acodec'] for f in formats if f.get('acodec') not in (None, 'none')), None),
+            'height': videos[0].get('height') if videos else None,
+        }
+        if not self.ffmpeg_handler.fan_out(master, outputs, streams, copy_video=copy_video):
+            for path, _ in outputs:
+                if os.path.exists(path): os.remove(path)
+            os.replace(master, source)
+            raise RuntimeError("멀티 출력 변환 실패")
+        os.remove(master)
+        return [path for path, _ in outputs]
+
+    def _live_manifest(self, info: dict, options: dict) -> dict | None:
+        """녹화할 HLS 포맷 (화질 상한 이하에서 가장 높은 것; 오디오 모드는 오디오 전용 또는 가장 낮은 화질)"""
+        formats = [f for f in info.get('formats') or [] if (f.get('protocol') or '').startswith('m3u8') and f.get('url')]
+        if not formats:
+            return None
+        if self._is_audio_mode(options):
+            return min(formats, key=lambda f: (f.get('vcodec') not in (None, 'none'), f.get('height') or 0))
+        height = options.get('height')
+        fitting = [f for f in formats if not height or (f.get('height') or 0) <= height]
+        return max(fitting or formats, key=lambda f: (f.get('height') or 0, f.get('tbr') or 0))
+
+    def _record_live(self, ydl, info: dict, fmt: dict, work_dir: str, output_dir: str, options: dict,
+                     progress_callback) -> list:
+        """
+        라이브 방송을 롤링 파일로 녹화하고 완성 파일 경로 리스트를 반환합니다. (변환/후처리 옵션은 적용하지 않음)
+        요청은 ydl.urlopen을 거치므로 송신 경로(source_address/프록시)와 쿠키가 그대로 적용됩니다.
+        """
+        Logger.stage('live')
+        Logger.info(f"[Live] 라이브 녹화 시작: {info.get('title')} ({fmt.get('format_id')}, {fmt.get('height') or '?'}p)")
+        recorder = LiveRecorder(
+            fmt['url'], work_dir, os.path.splitext(os.path.basename(ydl.prepare_filename(info)))[0], output_dir=output_dir,
+            headers=fmt.get('http_headers') or info.get('http_headers'),
+            opener=lambda url, headers: ydl.urlopen(Request(url, headers=headers)).read(),
+            progress_callback=progress_callback, **self.live_settings,
+        )
+        result = recorder.run()
+        info['live_metrics'] = result['metrics']
+        if not result['files']:
+            raise RuntimeError("녹화된 세그먼트가 없습니다.")
+        return result['files']
+
+    def _split_chapters(self, info: dict, paths: list, options: dict) -> list:
+        """결과물마다 챕터별 파일로 나눕니다. (split 옵션이 없거나 챕터가 없는 영상은 그대로)"""
+        if not options.get('split_chapters'):
+            return paths
+        spans = chapter_spans(info)
+        durations = info.setdefault('_chapter_durations', {})
+        chapters = []
+        for path in paths:
+            outputs = self.chapter_splitter.split(path, info, options)
+            if outputs != [path]:
+                # 결과물 검증에서 파일마다 자기 챕터 길이로 점검하도록 기록
+                durations.update((os.path.basename(p), end - start) for p, (_, start, end) in zip(outputs, spans))
+            chapters.extend(outputs)
+        return chapters
+
+    def _resolve_cached_streams(self, info: dict, options: dict) -> list | None:
+        if not self.stream_cache or info.get('_type', 'video') != 'video' or self._has_sections(options):
+            return None
+        if options.get('renditions'):
+            return None  # 멀티 출력은 받은 원본 하나를 한 패스로 나눔
+        # 자막/썸네일은 yt-dlp 다운로드 경로에서만 받으므로 캐시 변환 대상에서 제외
+        if options.get('subtitles') or options.get('thumbnail'):
+            return None
+        return self.stream_cache.resolve(info)
+
+    def _render_from_cache(self, ydl, info: dict, streams: list, options: dict, progress_callback) -> str:
+        final_path = self._get_actual_filename(ydl.prepare_filename(info), options)
+        audio_only = self._is_audio_mode(options)
+        render_opts = options.copy()
+        if audio_only and not render_opts.get('ext'):
+            render_opts['ext'] = 'mp3'
+
+        if not self.ffmpeg_handler.render_from_streams(streams, final_path, render_opts, audio_only=audio_only):
+            raise RuntimeError("캐시 스트림 변환 실패")
+        if progress_callback:
+            progress_callback({'status': 'finished', 'filename': final_path})
+        return final_path
+
+    @staticmethod
+    def _is_audio_mode(options: dict) -> bool:
+        return options.get('ext') in ['mp3', 'flac', 'wav', 'aac', 'm4a']
+
+    @staticmethod
+    def _has_sections(options: dict) -> bool:
+        return bool(options.get('time_ranges') or options.get('chapters'))
+
+    @staticmethod
+    def _section_seconds(info: dict, options: dict) -> float | None:
+        """요청한 구간/챕터의 총 길이(초). 영상 길이를 모르면 None"""
+        duration = info.get('duration')
+        if not duration:
+            return None
+        spans = [(start, end if end is not None else duration) for start, end in options.get('time_ranges') or []]
+        for regex in options.get('chapters') or []:
+            spans += [(c['start_time'], c['end_time']) for c in info.get('chapters') or [] if re.search(f"(?i){regex}", c.get('title') or '')]
+        return sum(max(0.0, min(end, duration) - start) for start, end in spans)
+
+    @classmethod
+    def _skips_extract_audio(cls, options: dict) -> bool:
+        """음량 정규화 시 yt-dlp 변환을 생략하고 원본에서 한 번만 인코딩 (이중 손실 인코딩 방지)"""
+        return cls._is_audio_mode(options) and bool(options.get('loudnorm'))
+
+    def _check_disk_space(self, info: dict, work_dir: str, output_dir: str, options: dict) -> int:
+        """예상 다운로드 크기를 계산해 여유 공간을 점검하고, 그 크기(bytes)를 반환합니다."""
+        formats = info.get('requested_formats') or [info]
+        expected = sum((f.get('filesize') or f.get('filesize_approx') or 0) for f in formats)
+        if not expected: return 0
+        if self._has_sections(options):
+            # 구간 다운로드는 길이 비율만큼만 받음
+            seconds = self._section_seconds(info, options)
+            if seconds is not None:
+                expected = int(expected * min(1.0, seconds / info['duration']))
+
+        # 병합/변환 단계에서 원본과 결과물이 잠시 공존하므로 작업 폴더는 2배를 요구
+        check_free_space(work_dir, expected * 2, label="작업 폴더")
+        if work_dir != output_dir:
+            check_free_space(output_dir, expected, label="출력 폴더")
+        return expected
+
+    def _finalize(self, work_dir: str, output_dir: str, final_path: str) -> str:
+        """스테이징 폴더의 완성 파일(영상 + 자막/썸네일)을 출력 폴더로 원자적 이동"""
+        stem = os.path.splitext(os.path.basename(final_path))[0]
+        moved_main = final_path
+        for path in find_job_outputs(work_dir, stem):
+            dest = finalize_file(path, output_dir)
+            if os.path.abspath(path) == os.path.abspath(final_path):
+                moved_main = dest
+        return moved_main
+
+    def _finalize_all(self, work_dir: str, output_dir: str, paths: list, sources: list = ()) -> list:
+        """
+        결과물 여러 개(멀티 출력/구간/챕터)를 부속 파일과 함께 출력 폴더로 옮기고 최종 경로 리스트를 반환합니다.
+        sources: 챕터로 나뉘어 지워진 원본 경로 (같은 이름의 자막/썸네일도 함께 이동)
+        """
+        if work_dir == output_dir:
+            return paths
+        Logger.stage('finalize')
+        moved = {}
+        for stem in dict.fromkeys(os.path.splitext(os.path.basename(p))[0] for p in list(paths) + list(sources)):
+            for path in find_job_outputs(work_dir, stem):
+                moved[os.path.abspath(path)] = finalize_file(path, output_dir)
+        return [moved.get(os.path.abspath(p), p) for p in paths]
+
+    def _build_ydl_opts(self, output_dir: str, options: dict, progress_callback, lease: EgressLease = None) -> dict:
         ydl_opts = {
             'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
             'quiet': True,
@@ -75,8 +476,18 @@ class Downloader:
         video_fmt = ""
         audio_fmt = ""
         
+        # 0. 멀티 출력: 모든 결과물을 만들 수 있는 원본만 받음 (병합만, 변환은 FFmpegHandler.fan_out에서 한 번에)
+        if options.get('renditions'):
+            source = fanout_source_options(options['renditions'])
+            if source['audio_only']:
+                ydl_opts['format'] = "bestaudio/best"
+            else:
+                video_fmt = f"bestvideo[height<={source['height']}]" if source['height'] else "bestvideo"
+                ydl_opts['format'] = video_fmt + "+bestaudio/best"
+                ydl_opts['merge_output_format'] = 'mkv'  # 어떤 코덱 조합도 담을 수 있는 중간 컨테이너
+
         # 1. 비디오 모드
-        if options.get('ext') not in ['mp3', 'flac', 'wav', 'aac', 'm4a']:
+        elif not self._is_audio_mode(options):
             if options.get('height'):
                 video_fmt = f"bestvideo[height<={options['height']}]"
             else:
@@ -102,11 +513,19 @@ class Downloader:
             target_ext = options.get('ext', 'mp3')
             
             # [Fix] m4a 변환 시 코덱 호환성 문제 방지 (Opus -> AAC 자동 변환 유도)
-            ydl_opts['postprocessors'].append({
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': target_ext,
-                'preferredquality': str(options.get('audio_bitrate', 192)),
-            })
+            if not self._skips_extract_audio(options):
+                ydl_opts['postprocessors'].append({
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': target_ext,
+                    'preferredquality': str(options.get('audio_bitrate', 192)),
+                })
+
+        # [Sections] 필요한 구간만 받기 (yt-dlp가 FFmpeg로 해당 조각만 요청해 스트림 복사)
+        if self._has_sections(options):
+            ranges = [(start, end if end is not None else float('inf')) for start, end in options.get('time_ranges') or []]
+            chapters = [f"(?i){regex}" for regex in options.get('chapters') or []]
+            ydl_opts['download_ranges'] = download_range_func(chapters, ranges)
+            ydl_opts['outtmpl'] = os.path.join(output_dir, '%(title)s [%(section_start)d-%(section_end)d].%(ext)s')
 
         # 부가 기능
         if options.get('thumbnail'): ydl_opts['writethumbnail'] = True
@@ -114,6 +533,12 @@ class Downloader:
             ydl_opts['writesubtitles'] = True
             ydl_opts['subtitleslangs'] = ['ko', 'en']
 
+        # [Egress] 배정된 송신 경로 적용 + 경로별 바이트 추적 / 오류 수집
+        if lease:
+            ydl_opts.update(lease.egress.ydl_params())
+            ydl_opts['progress_hooks'].append(lease.hook)
+            ydl_opts['logger'] = lease
+
         # 진행률 콜백
         if progress_callback:
             def hook(d):
@@ -131,6 +556,14 @@ class Downloader:
                     progress_callback({'status': 'finished', 'filename': d.get('filename')})
             ydl_opts['progress_hooks'].append(hook)
 
+        # 완료된 원본 스트림을 병합/변환으로 삭제되기 전에 캐시에 등록 (일부 구간만 받은 파일은 제외)
+        if self.stream_cache and not self._has_sections(options):
+            def cache_hook(d):
+                if d['status'] == 'finished':
+                    f_info = d.get('info_dict') or {}
+                    self.stream_cache.store(f_info.get('id'), f_info.get('format_id'), d.get('filename'))
+            ydl_opts['progress_hooks'].append(cache_hook)
+
         return ydl_opts
 
     def _get_actual_filename(self, prepared_filename, options):
@@ -0,0 +1,181 @@
+import ipaddress
+import threading
+import time
+
+from ui.logger import Logger
+
+# 실패 분류: 송신 경로(IP/프록시) 문제로 볼 수 있는 오류만 경로 건강도에 반영
+THROTTLE_MARKERS = ('http error 429', 'too many requests')
+NETWORK_MARKERS = ('timed out', 'connection', 'proxy', 'unable to download', 'http error 403', 'http error 5',
+                   'network is unreachable', 'remote end closed')
+
+FAILURE_PENALTY = 0.5    # 실패 시 건강도 배수
+RECOVERY_WEIGHT = 0.2    # 성공 시 건강도 회복 비율 (EWMA)
+BENCH_AFTER_FAILURES = 2  # 연속 실패가 이 횟수에 이르면 쿨다운
+
+
+def classify_error(message: str) -> str:
+    """오류 메시지를 'throttled' | 'network' | 'content'(영상 자체 문제, 경로 무관)로 분류합니다."""
+    text = (message or '').lower()
+    if any(m in text for m in THROTTLE_MARKERS):
+        return 'throttled'
+    if any(m in text for m in NETWORK_MARKERS):
+        return 'network'
+    return 'content'
+
+
+class Egress:
+    """송신 경로 하나 (source_address 또는 프록시)와 그 상태"""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        value = spec[len('source:'):] if spec.startswith('source:') else spec
+        if '://' in value:
+            self.kind, self.value = 'proxy', value
+        else:
+            ipaddress.ip_address(value)  # 잘못된 설정은 시작 시점에 바로 드러나도록
+            self.kind, self.value = 'source_address', value
+        self.health = 1.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.leases = set()
+        self.counters = {'jobs': 0, 'successes': 0, 'failures': 0, 'throttled': 0, 'bytes': 0, 'busy_seconds': 0.0}
+
+    def ydl_params(self) -> dict:
+        return {self.kind: self.value}
+
+    @property
+    def active_bytes(self) -> int:
+        return sum(lease.remaining for lease in self.leases)
+
+
+class YdlErrorLog:
+    """yt-dlp logger: 오류 메시지를 모아 삼켜진 다운로드 오류와 실패 원인(429/네트워크/접근 불가 등)을 판별합니다."""
+
+    def __init__(self):
+        self.errors = []
+
+    def debug(self, msg):
+        Logger.debug(msg)
+
+    def info(self, msg):
+        pass
+
+    def warning(self, msg):
+        pass
+
+    def error(self, msg):
+        self.errors.append(msg)
+        Logger.error(msg)  # logger가 없을 때와 같이 오류는 계속 표시
+
+
+class EgressLease(YdlErrorLog):
+    """
+    작업 하나에 배정된 송신 경로
+    진행 훅으로 남은 바이트/속도를 추적하고, yt-dlp logger(YdlErrorLog)로 오류 메시지를 수집해 실패 원인을 분류합니다.
+    """
+
+    def __init__(self, egress: Egress):
+        super().__init__()
+        self.egress = egress
+        self.started = time.monotonic()
+        self.expected = 0
+        self._streams = {}  # filename -> (downloaded, total)
+        self.speed = 0.0
+
+    # --- 바이트 추적 ---
+    def expect(self, expected_bytes: int):
+        self.expected = expected_bytes or 0
+
+    @property
+    def downloaded(self) -> int:
+        return sum(done for done, _ in list(self._streams.values()))
+
+    @property
+    def remaining(self) -> int:
+        known_total = sum(total for _, total in list(self._streams.values()))
+        return max(max(self.expected, known_total) - self.downloaded, 0)
+
+    def hook(self, d):
+        if d['status'] not in ('downloading', 'finished'):
+            return
+        total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+        done = d.get('downloaded_bytes') or (total if d['status'] == 'finished' else 0)
+        self._streams[d.get('filename')] = (done, max(total, done))
+        self.speed = (d.get('speed') or 0) if d['status'] == 'downloading' else 0.0
+
+
+class EgressPool:
+    """
+    송신 경로(source_address/프록시) 풀
+    작업마다 쿨다운 중이 아닌 경로 중 진행 중인 바이트가 가장 적은(건강도로 가중) 경로를 배정하고,
+    실패/429는 경로를 일정 시간 제외시킵니다. 경로별 처리량 통계를 제공합니다.
+    """
+
+    def __init__(self, specs: list, cooldown: float = 120):
+        self.egresses = [Egress(spec) for spec in specs]
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        specs = config.get('egress_pool') or []
+        return cls(specs, config.get('egress_cooldown')) if specs else None
+
+    def acquire(self) -> EgressLease:
+        now = time.monotonic()
+        with self._lock:
+            ready = [e for e in self.egresses if e.cooldown_until <= now]
+            if ready:
+                egress = min(ready, key=lambda e: ((e.active_bytes + 1) / e.health, len(e.leases) / e.health))
+            else:
+                # 전부 쿨다운 중이면 가장 먼저 풀리는 경로를 사용
+                egress = min(self.egresses, key=lambda e: e.cooldown_until)
+            lease = EgressLease(egress)
+            egress.leases.add(lease)
+            egress.counters['jobs'] += 1
+            return lease
+
+    def release(self, lease: EgressLease, ok: bool | None, error: str = None):
+        """ok=True 성공, False 실패(오류 분류에 따라 건강도/쿨다운 반영), None 중립(취소 등)"""
+        egress = lease.egress
+        failure = classify_error(' '.join(lease.errors[-1:]) or error) if ok is False else None
+        with self._lock:
+            egress.leases.discard(lease)
+            egress.counters['bytes'] += lease.downloaded
+            egress.counters['busy_seconds'] += time.monotonic() - lease.started
+
+            if ok:
+                egress.counters['successes'] += 1
+                egress.consecutive_failures = 0
+                egress.health = min(1.0, egress.health * (1 - RECOVERY_WEIGHT) + RECOVERY_WEIGHT)
+            elif failure in ('throttled', 'network'):
+                egress.counters['failures'] += 1
+                egress.consecutive_failures += 1
+                egress.health = max(0.05, egress.health * FAILURE_PENALTY)
+                if failure == 'throttled':
+                    egress.counters['throttled'] += 1
+                if failure == 'throttled' or egress.consecutive_failures >= BENCH_AFTER_FAILURES:
+                    egress.cooldown_until = time.monotonic() + self.cooldown
+
+    def get_stats(self) -> list:
+        now = time.monotonic()
+        with self._lock:
+            stats = []
+            for e in self.egresses:
+                c = e.counters
+                stats.append({
+                    'egress': e.spec,
+                    'active_jobs': len(e.leases),
+                    'active_bytes': e.active_bytes,
+                    'current_bps': sum(lease.speed for lease in e.leases),
+                    'avg_bps': c['bytes'] / c['busy_seconds'] if c['busy_seconds'] else 0,
+                    'bytes': c['bytes'],
+                    'jobs': c['jobs'],
+                    'successes': c['successes'],
+                    'failures': c['failures'],
+                    'throttled': c['throttled'],
+                    'health': round(e.health, 2),
+                    'cooldown_left': max(0.0, round(e.cooldown_until - now, 1)),
+                })
+            return stats
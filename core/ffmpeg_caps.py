@@ -0,0 +1,239 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from ui.logger import Logger
+
+CAPS_CACHE_FILE = 'ffmpeg_caps.json'
+
+# 파서 코덱 토큰 → 실제 FFmpeg 인코더 후보 (앞쪽 우선; 소프트웨어 인코더를 하드웨어보다 먼저)
+VIDEO_ENCODERS = {
+    'h264': ['libx264', 'h264_nvenc', 'h264_qsv', 'h264_videotoolbox', 'h264_amf', 'h264_vaapi'],
+    'h265': ['libx265', 'hevc_nvenc', 'hevc_qsv', 'hevc_videotoolbox', 'hevc_amf', 'hevc_vaapi'],
+    'hevc': ['libx265', 'hevc_nvenc', 'hevc_qsv', 'hevc_videotoolbox', 'hevc_amf', 'hevc_vaapi'],
+    'av1': ['libsvtav1', 'libaom-av1', 'librav1e', 'av1_nvenc', 'av1_qsv', 'av1_amf'],
+    'vp9': ['libvpx-vp9', 'vp9_qsv', 'vp9_vaapi'],
+    'vp8': ['libvpx', 'vp8_vaapi'],
+    'prores': ['prores_ks', 'prores', 'prores_aw', 'prores_videotoolbox'],
+    'theora': ['libtheora'],
+    'mpeg4': ['mpeg4', 'libxvid'],
+}
+AUDIO_ENCODERS = {
+    'aac': ['libfdk_aac', 'aac'],
+    'opus': ['libopus', 'opus'],
+    'vorbis': ['libvorbis', 'vorbis'],
+    'mp3': ['libmp3lame'],
+    'flac': ['flac'],
+    'alac': ['alac'],
+    'pcm': ['pcm_s16le'],
+    'ac3': ['ac3'],
+    'eac3': ['eac3'],
+}
+# FFmpeg 네이티브 실험적 인코더: '-strict -2' 없이는 인코딩 단계에서 실패하므로 후보에서 제외
+EXPERIMENTAL_ENCODERS = {'opus', 'vorbis'}
+# 오디오 출력 확장자 → 필요한 코덱 토큰
+AUDIO_EXT_CODECS = {'mp3': 'mp3', 'm4a': 'aac', 'aac': 'aac', 'flac': 'flac', 'wav': 'pcm', 'opus': 'opus',
+                    'ogg': 'vorbis', 'alac': 'alac'}
+# 컨테이너가 담을 수 있는 비디오 코덱 (목록에 없는 컨테이너는 제한 없음으로 간주)
+CONTAINER_VIDEO_CODECS = {
+    'mp4': {'h264', 'h265', 'hevc', 'av1', 'vp9', 'mpeg4'},
+    'webm': {'vp8', 'vp9', 'av1'},
+    'ogv': {'theora', 'vp8'},
+    'mov': {'h264', 'h265', 'hevc', 'prores', 'mpeg4'},
+}
+# 컨테이너가 담을 수 있는 오디오 코덱 (스트림 복사 판단용; 목록에 없는 컨테이너는 제한 없음)
+CONTAINER_AUDIO_CODECS = {
+    'mp4': {'aac', 'mp3', 'ac3', 'eac3', 'alac', 'opus', 'flac'},
+    'mov': {'aac', 'mp3', 'ac3', 'alac'},
+    'webm': {'opus', 'vorbis'},
+    'ogv': {'opus', 'vorbis'},
+}
+# yt-dlp 코덱 문자열 접두어(avc1.640028, mp4a.40.2 ...) → 코덱 토큰
+CODEC_FAMILIES = {
+    'avc1': 'h264', 'avc3': 'h264', 'h264': 'h264', 'hev1': 'hevc', 'hvc1': 'hevc', 'h265': 'hevc', 'hevc': 'hevc',
+    'vp09': 'vp9', 'vp9': 'vp9', 'vp8': 'vp8', 'av01': 'av1', 'av1': 'av1',
+    'mp4a': 'aac', 'aac': 'aac', 'opus': 'opus', 'vorbis': 'vorbis', 'mp3': 'mp3', 'flac': 'flac',
+    'ac-3': 'ac3', 'ac3': 'ac3', 'ec-3': 'eac3', 'eac3': 'eac3',
+}
+
+_LIST_LINE = re.compile(r'^\s*([A-Z.]{3,6})\s+(\S+)\s')
+
+
+def codec_family(codec: str | None) -> str | None:
+    """'avc1.640028' / 'h265' 같은 코덱 표기를 비교용 토큰(h264, hevc ...)으로 통일합니다."""
+    if not codec or codec == 'none':
+        return None
+    prefix = codec.lower().split('.')[0]
+    return CODEC_FAMILIES.get(prefix, prefix)
+
+
+class FFmpegCapabilities:
+    """
+    FFmpeg 바이너리의 인코더/필터 목록
+    `-encoders`/`-filters`를 한 번만 실행하고 결과를 (바이너리 경로, mtime, 크기) 키로 디스크에 캐시합니다.
+    FFmpeg가 교체되면 키가 바뀌어 자동으로 다시 조사합니다.
+    """
+
+    def __init__(self, ffmpeg_path: str | None, cache_path: str = CAPS_CACHE_FILE):
+        self.ffmpeg_path = ffmpeg_path
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._caps = None
+
+    @property
+    def encoders(self) -> dict:
+        """인코더 이름 → 종류('V' | 'A' | 'S')"""
+        return self._load()['encoders']
+
+    @property
+    def filters(self) -> set:
+        return set(self._load()['filters'])
+
+    def resolve_encoder(self, token: str, kind: str = 'video') -> str | None:
+        """
+        코덱 토큰(h264, av1 ...)을 이 FFmpeg에서 쓸 수 있는 인코더 이름으로 바꿉니다.
+        후보 표의 우선순위(libfdk_aac 우선 등)를 먼저 따르고, 표에 없는 토큰만 인코더 이름으로 보고 그대로 씁니다.
+        실험적 인코더(EXPERIMENTAL_ENCODERS)는 고르지 않습니다.
+        """
+        if not token:
+            return None
+        encoders = self.encoders
+        table = VIDEO_ENCODERS if kind == 'video' else AUDIO_ENCODERS
+        candidates = table.get(token, [token])
+        return next((name for name in candidates if name in encoders and name not in EXPERIMENTAL_ENCODERS), None)
+
+    def validate(self, options: dict) -> list:
+        """다운로드 전에 옵션 조합을 점검해 문제 목록(빈 리스트면 통과)을 반환합니다."""
+        if options.get('renditions'):
+            # 멀티 출력: 결과물마다 점검 (구간/챕터 분할 옵션은 작업 단위이므로 함께 적용) + 분기 필터
+            errors = [] if self.ffmpeg_path else ["멀티 출력에는 FFmpeg가 필요하지만 FFmpeg를 찾을 수 없습니다."]
+            for index, rendition in enumerate(options['renditions'], 1):
+                job_level = {key: options.get(key) for key in ('time_ranges', 'chapters', 'split_chapters', 'split_exact')}
+                errors += [f"[{index}] {e}" for e in self.validate(dict(rendition, **job_level))]
+            if self.ffmpeg_path:
+                errors += [f"이 FFmpeg에는 {name} 필터가 없습니다. (멀티 출력)" for name in ('split', 'asplit')
+                           if name not in self.filters]
+            return list(dict.fromkeys(errors))
+        errors = []
+        ext = options.get('ext')
+        audio_mode = ext in AUDIO_EXT_CODECS
+        v_codec = options.get('video_codec')
+        sections = bool(options.get('time_ranges') or options.get('chapters'))
+        needs_ffmpeg = bool(options.get('use_enhance') or options.get('audio_channels') or options.get('use_upscale')
+                            or options.get('loudnorm') or audio_mode or v_codec or options.get('audio_codec') or sections
+                            or options.get('split_chapters'))
+
+        if options.get('use_upscale') and not options.get('height'):
+            errors.append("upscale에는 목표 해상도(예: 2160p)가 필요합니다.")
+        for start, end in options.get('time_ranges') or []:
+            if end is not None and end <= start:
+                errors.append(f"구간의 끝이 시작보다 앞섭니다: {start:g}초-{end:g}초 (RANGE_시작-끝)")
+        if options.get('split_chapters') and sections:
+            errors.append("챕터 분할(split)은 구간/챕터 선택(RANGE_/CHAPTER_)과 함께 쓸 수 없습니다. (구간마다 이미 별도 파일)")
+        if v_codec and ext in CONTAINER_VIDEO_CODECS and v_codec in VIDEO_ENCODERS \
+                and v_codec not in CONTAINER_VIDEO_CODECS[ext]:
+            errors.append(f"{ext} 컨테이너에는 {v_codec} 비디오를 담을 수 없습니다.")
+        if not needs_ffmpeg:
+            return errors
+        if not self.ffmpeg_path:
+            return errors + ["이 옵션에는 FFmpeg가 필요하지만 FFmpeg를 찾을 수 없습니다."]
+
+        # 심화 후처리/구간 정밀 컷/챕터 정밀 분할 패스는 비디오를 다시 인코딩 (코덱 미지정 시 libx264)
+        reencodes = options.get('use_upscale') or ((sections or options.get('split_exact')) and not audio_mode)
+        if reencodes and not v_codec:
+            v_codec = 'h264'
+        if v_codec and not self.resolve_encoder(v_codec, 'video'):
+            errors.append(f"이 FFmpeg에는 {v_codec} 인코더가 없습니다. (후보: {', '.join(VIDEO_ENCODERS.get(v_codec, [v_codec]))})")
+        for token in filter(None, {options.get('audio_codec'), AUDIO_EXT_CODECS.get(ext)}):
+            if self.resolve_encoder(token, 'audio'):
+                continue
+            candidates = AUDIO_ENCODERS.get(token, [token])
+            experimental = [name for name in candidates if name in EXPERIMENTAL_ENCODERS and name in self.encoders]
+            if experimental:
+                stable = [name for name in candidates if name not in EXPERIMENTAL_ENCODERS]
+                errors.append(f"이 FFmpeg에는 {token} 오디오용 실험적 인코더({', '.join(experimental)})만 있습니다. "
+                              f"({', '.join(stable)} 포함 빌드 필요)")
+            else:
+                errors.append(f"이 FFmpeg에는 {token} 오디오 인코더가 없습니다.")
+
+        required_filters = {'use_upscale': 'scale', 'use_enhance': 'crystalizer', 'loudnorm': 'loudnorm'}
+        filters = self.filters
+        for key, name in required_filters.items():
+            if options.get(key) and name not in filters:
+                errors.append(f"이 FFmpeg에는 {name} 필터가 없습니다. ({key})")
+        return errors
+
+    # --- 조사 / 캐시 ---
+    def _binary_key(self) -> str | None:
+        path = shutil.which(self.ffmpeg_path) or self.ffmpeg_path
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return f"{os.path.realpath(path)}|{st.st_mtime_ns}|{st.st_size}"
+
+    def _load(self) -> dict:
+        with self._lock:
+            if self._caps is not None:
+                return self._caps
+            empty = {'encoders': {}, 'filters': []}
+            key = self._binary_key() if self.ffmpeg_path else None
+            if not key:
+                self._caps = empty
+                return self._caps
+
+            cache = self._read_cache()
+            if key in cache:
+                self._caps = cache[key]
+                return self._caps
+
+            caps = self._probe()
+            if caps:
+                cache = {k: v for k, v in self._read_cache().items() if k.split('|')[0] != key.split('|')[0]}
+                cache[key] = caps
+                self._write_cache(cache)
+            self._caps = caps or empty
+            return self._caps
+
+    def _probe(self) -> dict | None:
+        try:
+            encoders = self._run_list('-encoders')
+            filters = self._run_list('-filters')
+        except (OSError, subprocess.CalledProcessError) as e:
+            Logger.warning(f"FFmpeg 기능 조사 실패: {e}")
+            return None
+        Logger.debug(f"FFmpeg 기능 조사: 인코더 {len(encoders)}개, 필터 {len(filters)}개")
+        return {'encoders': {name: flags[0] for name, flags in encoders.items()}, 'filters': sorted(filters)}
+
+    def _run_list(self, flag: str) -> dict:
+        proc = subprocess.run([self.ffmpeg_path, '-hide_banner', flag], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, check=True)
+        entries = {}
+        # 목록 줄 형식: " V....D libx264  설명" / " ... loudnorm  A->A  설명" (범례 줄 " V..... = Video"는 제외)
+        for line in proc.stdout.decode('utf-8', errors='replace').splitlines():
+            match = _LIST_LINE.match(line)
+            if match and match.group(2) != '=':
+                entries[match.group(2)] = match.group(1)
+        return entries
+
+    def _read_cache(self) -> dict:
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            Logger.warning(f"FFmpeg 기능 캐시 로드 중 오류: {e}")
+            return {}
+
+    def _write_cache(self, cache: dict):
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            Logger.warning(f"FFmpeg 기능 캐시 저장 실패: {e}")
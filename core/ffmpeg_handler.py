@@ -3,13 +3,22 @@ import os
 import shutil
 import sys
 
+from core.ffmpeg_caps import (AUDIO_EXT_CODECS, CONTAINER_AUDIO_CODECS, CONTAINER_VIDEO_CODECS, FFmpegCapabilities,
+                              codec_family)
+from core.loudness import DEFAULT_TARGET, LOUDNESS_CACHE_FILE, LoudnessAnalyzer, build_loudnorm_filter
+from core.parser import AUDIO_EXTS
+from ui.logger import Logger
+
 class FFmpegHandler:
-    def __init__(self):
+    def __init__(self, loudness_cache_path: str = LOUDNESS_CACHE_FILE):
         """
         시스템에 설치된 FFmpeg보다, 프로젝트 내부의 bin 폴더에 있는 FFmpeg를 우선적으로 사용합니다.
         """
         self.ffmpeg_path = self._find_ffmpeg_binary()
+        self.ffprobe_path = self._find_ffprobe_binary()
         self._check_ffmpeg()
+        self.loudness = LoudnessAnalyzer(self.ffmpeg_path, loudness_cache_path)
+        self.caps = FFmpegCapabilities(self.ffmpeg_path)  # 인코더/필터 목록 (처음 필요할 때 조사, 디스크 캐시)
     
     def _find_ffmpeg_binary(self) -> str | None:
         """FFmpeg 실행 파일의 경로를 찾습니다. (Dev / OneDir / OneFile 모두 호환)"""
@@ -41,21 +50,43 @@ class FFmpegHandler:
 
         return None
 
+    def _find_ffprobe_binary(self) -> str | None:
+        """FFmpeg와 같은 폴더의 ffprobe를 우선 사용합니다. (결과물 검증용)"""
+        if self.ffmpeg_path and os.path.dirname(self.ffmpeg_path):
+            name = 'ffprobe.exe' if self.ffmpeg_path.endswith('.exe') else 'ffprobe'
+            local_path = os.path.join(os.path.dirname(self.ffmpeg_path), name)
+            if os.path.exists(local_path):
+                return local_path
+        return "ffprobe" if shutil.which("ffprobe") else None
+
     def _check_ffmpeg(self):
         if not self.ffmpeg_path:
             # exe 실행 시 콘솔이 바로 꺼지는 것을 방지하기 위해 input() 추가 가능
-            print("[Error] FFmpeg를 찾을 수 없습니다.")
-            print(f"현재 실행 위치: {os.getcwd()}")
-            print("해결법: 실행 파일과 같은 폴더에 'bin' 폴더를 두고 그 안에 ffmpeg.exe를 넣으세요.")
+            Logger.error("FFmpeg를 찾을 수 없습니다.")
+            Logger.info(f"현재 실행 위치: {os.getcwd()}")
+            Logger.info("해결법: 실행 파일과 같은 폴더에 'bin' 폴더를 두고 그 안에 ffmpeg.exe를 넣으세요.")
             return # 혹은 raise
 
-    def process_media(self, input_files: list, output_path: str, options: dict):
+    def validate_options(self, options: dict) -> list:
+        """옵션 조합이 이 FFmpeg로 처리 가능한지 점검합니다. (다운로드 전에 호출; 문제 메시지 리스트 반환)"""
+        return self.caps.validate(options)
+
+    def _video_encoder(self, options: dict) -> str:
+        """코덱 토큰(h264, av1 ...)을 실제 인코더 이름(libx264, libsvtav1 ...)으로 바꿉니다."""
+        token = options.get('video_codec') or 'h264'
+        return self.caps.resolve_encoder(token, 'video') or options.get('video_codec') or 'libx264'
+
+    def process_media(self, input_files: list, output_path: str, options: dict, extra_args: list = None):
         """
         입력된 미디어 파일들에 필터와 변환 옵션을 적용하여 최종 파일을 생성합니다.
         """
         if not self.ffmpeg_path:
             return False
 
+        # [Loudnorm] 2패스 정규화용 측정값 (오디오는 마지막 입력; 원본 해시 기준 캐시 조회)
+        if options.get('loudnorm') and 'loudnorm_measured' not in options:
+            options = dict(options, loudnorm_measured=self.loudness.submit(input_files[-1]).result())
+
         cmd = [self.ffmpeg_path, '-y']
         for f in input_files: cmd.extend(['-i', f])
 
@@ -66,12 +97,12 @@ class FFmpegHandler:
         if options.get('use_upscale') and options.get('height'):
             target_h = options['height']
             vf_filters.append(f"scale=-2:{target_h}:flags=lanczos")
-            print(f"[Info] Video Upscale 적용: 높이 {target_h}p (Lanczos)")
+            Logger.info(f"Video Upscale 적용: 높이 {target_h}p (Lanczos)")
 
         # 2. 비디오 코덱 및 필터 적용
         if vf_filters:
             cmd.extend(['-vf', ','.join(vf_filters)])
-            v_codec = options.get('video_codec', 'libx264')
+            v_codec = self._video_encoder(options)
             cmd.extend(['-c:v', v_codec])
             
             if 'libx264' in v_codec or 'libx265' in v_codec:
@@ -80,16 +111,21 @@ class FFmpegHandler:
             if len(input_files) > 1 and not options.get('video_codec'):
                  cmd.extend(['-c:v', 'copy']) 
             elif options.get('video_codec'):
-                 cmd.extend(['-c:v', options['video_codec']])
+                 cmd.extend(['-c:v', self._video_encoder(options)])
 
         # 3. 오디오 옵션 적용
         cmd.extend(self._build_audio_options(options))
+        if extra_args:
+            cmd.extend(extra_args)
         
         cmd.append(output_path)
 
         # 4. 실행
-        print(f"[FFmpeg] 처리 시작: {output_path}")
-        
+        Logger.info(f"[FFmpeg] 처리 시작: {output_path}")
+        return self._run(cmd)
+
+    def _run(self, cmd: list) -> bool:
+        Logger.debug(f"[FFmpeg] 명령: {subprocess.list2cmdline(cmd)}")
         try:
             # subprocess 실행 시 콘솔 창 숨기기 (윈도우용) - 선택 사항
             startupinfo = None
@@ -98,22 +134,141 @@ class FFmpegHandler:
                 startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             
             subprocess.run(cmd, check=True, stderr=subprocess.PIPE, startupinfo=startupinfo)
-            print("[FFmpeg] 변환 성공!")
+            Logger.info("[FFmpeg] 변환 성공!")
             return True
         except subprocess.CalledProcessError as e:
-            print(f"[Error] FFmpeg 변환 실패: {e.stderr.decode('utf-8', errors='replace')}")
+            Logger.error(f"FFmpeg 변환 실패: {e.stderr.decode('utf-8', errors='replace')}")
+            return False
+
+    def fan_out(self, source: str, outputs: list, source_streams: dict, copy_video: bool = True) -> bool:
+        """
+        원본 하나를 한 번만 디코드해 여러 결과물을 동시에 씁니다. (filter_complex split/asplit으로 분기)
+        outputs: [(출력 경로, 옵션)], source_streams: 원본의 {'vcodec', 'acodec', 'height'} (yt-dlp 포맷 정보)
+        필터/코덱 변경이 없고 컨테이너가 원본 코덱을 담을 수 있는 스트림은 디코드 없이 복사합니다.
+        """
+        if not self.ffmpeg_path:
             return False
+        v_family = codec_family(source_streams.get('vcodec'))
+        a_family = codec_family(source_streams.get('acodec'))
+
+        # [Loudnorm] 측정은 원본 기준 한 번만 (결과물마다 목표 음량만 다름)
+        measured = None
+        if any(opts.get('loudnorm') for _, opts in outputs):
+            measured = self.loudness.submit(source).result()
+
+        plans = []
+        for path, opts in outputs:
+            if opts.get('loudnorm'):
+                opts = dict(opts, loudnorm_measured=measured)
+            ext = os.path.splitext(path)[1][1:].lower()
+            video = None
+            if v_family and ext not in AUDIO_EXTS:
+                video = self._fan_out_video(opts, ext, v_family, source_streams.get('height'), copy_video)
+            audio = self._fan_out_audio(opts, ext, a_family) if a_family else None
+            plans.append((path, opts, video, audio))
+
+        # 디코드가 필요한 분기만 split/asplit으로 나눔
+        graph = []
+        for kind, split, index in (('v', 'split', 2), ('a', 'asplit', 3)):
+            branches = [i for i, plan in enumerate(plans) if plan[index] and plan[index][0] == 'encode']
+            if not branches:
+                continue
+            graph.append(f"[0:{kind}]{split}={len(branches)}" + ''.join(f"[{kind}s{i}]" for i in branches))
+            for i in branches:
+                filters = plans[i][index][1]
+                if filters:
+                    graph.append(f"[{kind}s{i}]{','.join(filters)}[{kind}{i}]")
+
+        cmd = [self.ffmpeg_path, '-y', '-i', source]
+        if graph:
+            cmd.extend(['-filter_complex', ';'.join(graph)])
+        for i, (path, opts, video, audio) in enumerate(plans):
+            if video and video[0] == 'copy':
+                cmd.extend(['-map', '0:v:0', '-c:v', 'copy'])
+            elif video:
+                v_codec = self._video_encoder(opts)
+                cmd.extend(['-map', f"[v{i}]" if video[1] else f"[vs{i}]", '-c:v', v_codec])
+                if 'libx264' in v_codec or 'libx265' in v_codec:
+                    cmd.extend(['-pix_fmt', 'yuv420p'])
+            if audio and audio[0] == 'copy':
+                cmd.extend(['-map', '0:a:0', '-c:a', 'copy'])
+            elif audio:
+                cmd.extend(['-map', f"[a{i}]" if audio[1] else f"[as{i}]"])
+                cmd.extend(self._build_audio_options(opts, with_filters=False))
+            cmd.append(path)
+            Logger.info(f"[FFmpeg] 결과물: {os.path.basename(path)} (비디오 {video[0] if video else '-'}, "
+                        f"오디오 {audio[0] if audio else '-'})")
 
-    def _build_audio_options(self, options: dict) -> list:
+        Logger.info(f"[FFmpeg] 멀티 출력 처리 시작: {len(plans)}개")
+        return self._run(cmd)
+
+    @staticmethod
+    def _fan_out_video(options: dict, ext: str, family: str, source_height: int | None, copy_video: bool) -> tuple:
+        """결과물 하나의 비디오 처리 방식: ('copy', None) 또는 ('encode', [필터])"""
+        height = options.get('height')
+        filters = []
+        if height and source_height and height < source_height:
+            filters.append(f"scale=-2:{height}")
+        elif options.get('use_upscale') and height and height != source_height:
+            filters.append(f"scale=-2:{height}:flags=lanczos")
+        wanted = codec_family(options.get('video_codec'))
+        fits = ext not in CONTAINER_VIDEO_CODECS or family in CONTAINER_VIDEO_CODECS[ext]
+        if copy_video and not filters and fits and wanted in (None, family):
+            return 'copy', None
+        return 'encode', filters
+
+    def _fan_out_audio(self, options: dict, ext: str, family: str) -> tuple:
+        """결과물 하나의 오디오 처리 방식: ('copy', None) 또는 ('encode', [필터])"""
+        filters = self._audio_filters(options)
+        changed = filters or any(options.get(key) for key in ('audio_bitrate', 'sample_rate', 'bit_depth', 'audio_channels'))
+        wanted = codec_family(options.get('audio_codec')) or AUDIO_EXT_CODECS.get(ext)
+        fits = wanted == family if wanted else (ext not in CONTAINER_AUDIO_CODECS or family in CONTAINER_AUDIO_CODECS[ext])
+        if not changed and fits:
+            return 'copy', None
+        return 'encode', filters
+
+    def render_from_streams(self, stream_files: list, output_path: str, options: dict, audio_only: bool = False):
+        """
+        캐시된 원본 스트림(비디오/오디오)으로 새 결과물을 만듭니다. (재다운로드 없이 병합/변환만 수행)
+        업스케일·DSP 등 심화 옵션도 같은 패스에서 적용됩니다.
+        """
+        render_opts = options.copy()
+        if audio_only:
+            # yt-dlp FFmpegExtractAudio의 기본 품질(192k)과 동일하게 맞춤
+            if not render_opts.get('audio_bitrate'):
+                render_opts['audio_bitrate'] = 192
+            render_opts['video_codec'] = None
+            render_opts['use_upscale'] = False
+        return self.process_media(stream_files, output_path, render_opts, extra_args=['-vn'] if audio_only else None)
+
+    @staticmethod
+    def _audio_filters(options: dict) -> list:
+        """오디오 필터 (DSP / 음량 정규화) 목록"""
+        af_filters = []
+        if options.get('use_enhance'):
+            af_filters.append("crystalizer=i=2.0")
+            Logger.info("DSP: Crystalizer 필터 적용됨")
+
+        # EBU R128 음량 정규화 (측정값이 없으면 1패스 dynamic 모드로 대체)
+        if options.get('loudnorm'):
+            target = dict(DEFAULT_TARGET)
+            if options.get('loudnorm_target') is not None:
+                target['I'] = options['loudnorm_target']
+            af_filters.append(build_loudnorm_filter(target, options.get('loudnorm_measured')))
+        return af_filters
+
+    def _build_audio_options(self, options: dict, with_filters: bool = True) -> list:
+        """오디오 인코딩 인자 (with_filters=False: 필터는 호출 측 filter_complex에서 적용)"""
         cmds = []
         ext = options.get('ext', 'mp3')
         
         # --- A. 오디오 필터 (DSP) ---
-        af_filters = []
-        
-        if options.get('use_enhance'):
-            af_filters.append("crystalizer=i=2.0")
-            print("[Info] DSP: Crystalizer 필터 적용됨")
+        af_filters = self._audio_filters(options) if with_filters else []
+
+        sample_rate = options.get('sample_rate')
+        if options.get('loudnorm'):
+            # loudnorm은 내부적으로 192kHz로 업샘플링하므로 출력 샘플레이트를 명시
+            sample_rate = sample_rate or 48000
 
         channels = options.get('audio_channels')
         if channels:
@@ -128,19 +283,27 @@ class FFmpegHandler:
         is_lossless = ext in ['wav', 'flac', 'alac', 'aiff']
         
         if is_lossless:
-            if options.get('sample_rate'):
-                cmds.extend(['-ar', str(options['sample_rate'])])
+            if sample_rate:
+                cmds.extend(['-ar', str(sample_rate)])
             
             if options.get('bit_depth'):
                 if ext == 'wav':
                     depth_map = {24: 'pcm_s24le', 16: 'pcm_s16le', 32: 'pcm_s32le'}
                     if options['bit_depth'] in depth_map:
                         cmds.extend(['-c:a', depth_map[options['bit_depth']]])
+                elif ext == 'flac':
+                    # FLAC 인코더는 24bit를 s32 샘플 + 유효 비트 수로 표현
+                    depth_map = {16: ['-sample_fmt', 's16'], 24: ['-sample_fmt', 's32', '-bits_per_raw_sample', '24']}
+                    cmds.extend(depth_map.get(options['bit_depth'], []))
         else:
+            # 오디오 코덱 토큰(aac, opus ...)은 이 FFmpeg에 있는 인코더로 변환 (libfdk_aac 우선 등)
+            a_codec = self.caps.resolve_encoder(options.get('audio_codec'), 'audio')
+            if a_codec:
+                cmds.extend(['-c:a', a_codec])
             if options.get('audio_bitrate'):
                 cmds.extend(['-b:a', f"{options['audio_bitrate']}k"])
             
-            if options.get('sample_rate'):
-                cmds.extend(['-ar', str(options['sample_rate'])])
+            if sample_rate:
+                cmds.extend(['-ar', str(sample_rate)])
 
         return cmds
\ No newline at end of file
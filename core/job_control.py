@@ -0,0 +1,322 @@
+import itertools
+import json
+import socketserver
+import threading
+import time
+
+from yt_dlp.utils import DownloadCancelled
+
+from ui.logger import Logger
+
+# 작업 상태
+PENDING = 'pending'
+RUNNING = 'running'
+PAUSED = 'paused'
+DONE = 'done'
+CANCELLED = 'cancelled'
+
+# 스케줄링 정책: 'fifo' (우선순위 → 입력 순) | 'sjf' (우선순위 → 예상 크기가 작은 순, 대기 시간 보정)
+SCHEDULE_POLICIES = ('fifo', 'sjf')
+
+# SJF 기아 방지(aging): 대기 1초마다 예상 크기에서 이만큼 빼서 오래 기다린 큰 작업도 결국 실행되게 함
+AGING_BYTES_PER_SEC = 8 * 1024 ** 2
+
+
+class JobCancelled(DownloadCancelled):
+    """사용자 취소 요청. yt-dlp가 재시도 없이 그대로 전파하도록 DownloadCancelled를 상속합니다."""
+    msg = 'The job was cancelled by user'
+
+
+class JobController:
+    """
+    실행 중인 배치의 작업 상태를 관리합니다.
+    - 배치 전체/개별 작업 일시정지 및 재개
+    - 작업 취소 (진행률 훅에서 협조적으로 중단, .part 파일은 이어받기를 위해 보존)
+    - 우선순위 변경 (대기 중인 작업의 실행 순서 조정)
+    - 스케줄링 정책 (같은 우선순위 안에서 입력 순 또는 예상 크기 순)
+    """
+
+    def __init__(self, queue_items: list = None, policy: str = 'fifo', aging_bytes_per_sec: float = AGING_BYTES_PER_SEC):
+        if policy not in SCHEDULE_POLICIES:
+            raise ValueError(f"알 수 없는 스케줄링 정책: {policy}")
+        self.policy = policy
+        self.aging_bytes_per_sec = aging_bytes_per_sec
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self.batch_paused = False
+        self.closed = False
+        self.jobs = {}
+        self._listeners = []
+        for item in queue_items or []:
+            self.add_job(item)
+
+    def add_job(self, item: dict) -> int:
+        """작업을 대기열에 추가하고 작업 번호를 반환합니다. (데몬 모드에서는 실행 중에도 추가됨)"""
+        with self._cond:
+            job_id = next(self._ids)
+            self.jobs[job_id] = {
+                'id': job_id,
+                'item': item,
+                'priority': item.get('priority', 0),
+                'seq': next(self._seq),
+                'expected_bytes': item.get('expected_bytes'),
+                'enqueued': time.monotonic(),
+                'state': PENDING,
+                'paused': False,
+            }
+            self._cond.notify_all()
+            return job_id
+
+    def add_listener(self, fn):
+        """일시정지/재개/취소/우선순위 변경 시 호출될 콜백을 등록합니다. (예: 프로세스 워커에 상태 전파)"""
+        self._listeners.append(fn)
+
+    def _notify(self, changed):
+        if changed:
+            for fn in self._listeners:
+                fn()
+        return changed
+
+    def close(self):
+        """새 작업을 기다리는 워커를 깨워 종료시킵니다."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    # --- 워커 측 API ---
+    def next_job(self, wait_for_new: bool = False):
+        """
+        실행할 다음 작업을 꺼냅니다. (우선순위 높은 순 → 정책에 따라 입력 순 또는 예상 크기 순)
+        일시정지된 작업만 남았다면 재개되거나 취소될 때까지 대기하고, 남은 작업이 없으면 None을 반환합니다.
+        wait_for_new=True이면 대기열이 비어도 새 작업이 들어오거나 close()가 호출될 때까지 기다립니다.
+        """
+        with self._cond:
+            while True:
+                if self.closed:
+                    return None
+                pending = [j for j in self.jobs.values() if j['state'] == PENDING]
+                if not pending and not wait_for_new:
+                    return None
+                ready = [j for j in pending if not j['paused']]
+                if ready and not self.batch_paused:
+                    job = min(ready, key=self._schedule_key(pending))
+                    job['state'] = RUNNING
+                    return job
+                self._cond.wait()
+
+    def _schedule_key(self, pending: list):
+        if self.policy != 'sjf':
+            return lambda j: (-j['priority'], j['seq'])
+
+        # 크기를 아직 모르는 작업은 대기 중인 작업의 알려진 크기 중앙값으로 취급 (과도한 우대/차별 방지)
+        # 끝난 작업은 제외 - 데몬에서 오래전에 끝난 크기로 치우치거나 계산량이 계속 늘지 않도록
+        now = time.monotonic()
+        known = sorted(j['expected_bytes'] for j in pending if j['expected_bytes'])
+        default = known[len(known) // 2] if known else 0
+
+        def key(j):
+            size = j['expected_bytes'] or default
+            return (-j['priority'], size - self.aging_bytes_per_sec * (now - j['enqueued']), j['seq'])
+        return key
+
+    def set_expected_bytes(self, job_id, expected_bytes: int):
+        """SJF용 예상 다운로드 크기를 기록합니다. (백그라운드 분석 결과)"""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job and expected_bytes:
+                job['expected_bytes'] = expected_bytes
+
+    def checkpoint(self, job_id):
+        """
+        진행률 훅에서 호출됩니다.
+        일시정지 중이면 재개될 때까지 블록하고, 취소되었으면 JobCancelled를 발생시킵니다.
+        """
+        with self._cond:
+            job = self.jobs[job_id]
+            while (self.batch_paused or job['paused']) and job['state'] != CANCELLED:
+                self._cond.wait()
+            if job['state'] == CANCELLED:
+                raise JobCancelled()
+
+    def finish(self, job_id):
+        with self._cond:
+            job = self.jobs[job_id]
+            if job['state'] != CANCELLED:
+                job['state'] = DONE
+            job['finished'] = time.monotonic()
+            self._cond.notify_all()
+
+    def prune_finished(self, keep: int = None, max_age: float = None) -> list:
+        """
+        끝난 작업(DONE/CANCELLED)을 목록에서 지우고 지운 작업 번호를 반환합니다. (데몬처럼 오래 도는 프로세스용)
+        가장 최근에 끝난 keep개만 남기고, 끝난 지 max_age초가 지난 작업도 지웁니다. (None: 해당 기준 없음)
+        실행 중에 취소된 작업은 워커가 finish()를 호출한 뒤에만 지웁니다.
+        """
+        with self._cond:
+            finished = sorted((j for j in self.jobs.values() if j.get('finished') is not None),
+                              key=lambda j: j['finished'])
+            cut = max(0, len(finished) - keep) if keep is not None else 0
+            if max_age is not None:
+                now = time.monotonic()
+                while cut < len(finished) and now - finished[cut]['finished'] > max_age:
+                    cut += 1
+            for job in finished[:cut]:
+                del self.jobs[job['id']]
+            return [job['id'] for job in finished[:cut]]
+
+    def is_paused(self, job_id) -> bool:
+        job = self.jobs[job_id]
+        return self.batch_paused or job['paused']
+
+    # --- 제어 측 API (키보드 / 제어 소켓) ---
+    def pause(self, job_id=None):
+        return self._set_paused(job_id, True)
+
+    def resume(self, job_id=None):
+        return self._set_paused(job_id, False)
+
+    def toggle_pause(self, job_id=None):
+        with self._cond:
+            if job_id is None:
+                paused = not self.batch_paused
+            elif job_id in self.jobs:
+                paused = not self.jobs[job_id]['paused']
+            else:
+                return False
+        return self._set_paused(job_id, paused)
+
+    def cancel(self, job_id=None):
+        """job_id가 None이면 아직 끝나지 않은 모든 작업을 취소합니다."""
+        with self._cond:
+            targets = self.jobs.values() if job_id is None else [self.jobs.get(job_id)]
+            changed = False
+            for job in targets:
+                if job and job['state'] in (PENDING, RUNNING):
+                    if job['state'] == PENDING:
+                        job['finished'] = time.monotonic()  # 워커가 꺼내지 않으므로 여기서 종료 처리
+                    job['state'] = CANCELLED
+                    changed = True
+            self._cond.notify_all()
+        return self._notify(changed)
+
+    def set_priority(self, job_id, priority: int):
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if not job:
+                return False
+            job['priority'] = priority
+            self._cond.notify_all()
+        return self._notify(True)
+
+    def bump_priority(self, job_id, delta: int):
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if not job:
+                return False
+            job['priority'] += delta
+            self._cond.notify_all()
+        return self._notify(True)
+
+    def snapshot(self) -> list:
+        with self._cond:
+            return [self._view(j) for j in self.jobs.values()]
+
+    def get(self, job_id) -> dict | None:
+        """작업 하나의 상태 (snapshot() 항목과 같은 형식; 없으면 None)"""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            return self._view(job) if job else None
+
+    def _view(self, j) -> dict:
+        return {
+            'id': j['id'],
+            'url': j['item']['url'],
+            'state': PAUSED if j['state'] in (PENDING, RUNNING) and self.is_paused(j['id']) else j['state'],
+            'priority': j['priority'],
+            'expected_bytes': j['expected_bytes'],
+            'finished': j.get('finished') is not None,  # 끝남 확정 (실행 중 취소는 워커가 finish()한 뒤)
+        }
+
+    def _set_paused(self, job_id, paused: bool):
+        with self._cond:
+            if job_id is None:
+                self.batch_paused = paused
+            elif job_id in self.jobs:
+                self.jobs[job_id]['paused'] = paused
+            else:
+                return False
+            self._cond.notify_all()
+        return self._notify(True)
+
+
+class ControlServer:
+    """
+    로컬 제어 소켓 (127.0.0.1, 줄 단위 텍스트 명령)
+    명령: status | pause [id] | resume [id] | cancel <id|all> | priority <id> <n>
+    예시: echo "pause 3" | nc 127.0.0.1 47800
+    """
+
+    def __init__(self, controller: JobController, port: int, host: str = '127.0.0.1'):
+        self.controller = controller
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self) -> bool:
+        controller = self.controller
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw in self.rfile:
+                    line = raw.decode('utf-8', errors='replace').strip()
+                    if not line:
+                        continue
+                    reply = execute_command(controller, line)
+                    self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode('utf-8'))
+
+        try:
+            socketserver.ThreadingTCPServer.allow_reuse_address = True
+            self._server = socketserver.ThreadingTCPServer((self.host, self.port), Handler)
+            self._server.daemon_threads = True
+        except OSError as e:
+            Logger.warning(f"제어 소켓을 열 수 없습니다 ({self.host}:{self.port}): {e}")
+            return False
+
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return True
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def execute_command(controller: JobController, line: str) -> dict:
+    """텍스트 명령 한 줄을 해석하여 JobController에 적용합니다. (키보드/소켓 공용)"""
+    parts = line.split()
+    cmd, args = '', []
+
+    def _job_id(i=0):
+        if len(args) <= i or args[i] == 'all':
+            return None
+        return int(args[i])
+
+    try:
+        cmd, args = parts[0].lower(), parts[1:]  # 빈 명령은 IndexError → 잘못된 인자
+        if cmd == 'status':
+            return {'ok': True, 'batch_paused': controller.batch_paused, 'jobs': controller.snapshot()}
+        if cmd == 'pause':
+            return {'ok': controller.pause(_job_id())}
+        if cmd == 'resume':
+            return {'ok': controller.resume(_job_id())}
+        if cmd == 'cancel':
+            if not args:
+                return {'ok': False, 'error': "cancel <id|all>"}
+            return {'ok': controller.cancel(_job_id())}
+        if cmd == 'priority':
+            return {'ok': controller.set_priority(int(args[0]), int(args[1]))}
+    except (ValueError, IndexError):
+        return {'ok': False, 'error': f"잘못된 인자: {line}"}
+    return {'ok': False, 'error': f"알 수 없는 명령: {cmd}"}
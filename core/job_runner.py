@@ -0,0 +1,141 @@
+import os
+
+from core.chapter_splitter import ChapterSplitter
+from core.downloader import Downloader
+from core.egress import EgressPool
+from core.live_recorder import live_settings_from_config
+from core.stream_cache import StreamCache
+from core.verifier import OutputVerifier
+from core.ydl_pool import YDLPool
+from utils.dedupe import OutputIndex, make_dedupe_key
+from utils.storage import find_job_outputs, link_or_copy
+from utils.system import extract_video_id
+from utils.unavailable import UnavailableCache
+from ui.logger import Logger
+
+
+class JobRunner:
+    """
+    다운로드 항목 하나를 실행합니다. (대화형 배치와 데몬이 공용으로 사용)
+    이전 출력물 재사용 → 다운로드 → 출력 색인 기록 → 중복 폴더(mirrors)에 링크
+    """
+
+    def __init__(self, downloader: Downloader, output_index: OutputIndex):
+        self.downloader = downloader
+        self.output_index = output_index
+
+    @classmethod
+    def from_config(cls, config, ydl_pool: YDLPool = None):
+        """설정(스테이징/스트림 캐시/송신 경로)에 맞춰 다운로드 파이프라인 전체를 구성합니다. (데몬/워커 모드용)"""
+        stream_cache = None
+        if config.get('stream_cache_dir'):
+            stream_cache = StreamCache(config.get('stream_cache_dir'), config.get('stream_cache_max_bytes'))
+        downloader = Downloader(
+            ydl_pool=ydl_pool if ydl_pool else YDLPool(),
+            staging_dir=config.get('staging_dir') or None,
+            stream_cache=stream_cache,
+            egress_pool=EgressPool.from_config(config),
+            verifier=OutputVerifier.from_config(config),
+            unavailable=UnavailableCache.from_config(config),
+            chapter_splitter=ChapterSplitter.from_config(config),
+            live_settings=live_settings_from_config(config),
+        )
+        return cls(downloader, OutputIndex())
+
+    def counters(self) -> dict:
+        """
+        구성 요소별 누적 통계 (스트림 캐시 / 검증 / 챕터 분할 / 접근 불가 기록 / 송신 경로별 카운터)
+        프로세스 백엔드는 자식의 작업 전후 차이를 부모의 add_counters()로 합산해 배치 요약에 반영합니다.
+        """
+        d = self.downloader
+        counters = {
+            'stream_cache': dict(d.stream_cache.stats) if d.stream_cache else {},
+            'verifier': dict(d.verifier.stats) if d.verifier else {},
+            'chapters': dict(d.chapter_splitter.stats),
+            'unavailable': dict(d.unavailable.stats) if d.unavailable else {},
+            'egress': {},
+        }
+        if d.egress_pool:
+            counters['egress'] = {e.spec: dict(e.counters) for e in d.egress_pool.egresses}
+        return counters
+
+    def add_counters(self, delta: dict):
+        """다른 프로세스에서 집계한 counters() 차이를 이 러너의 구성 요소 통계에 더합니다."""
+        d = self.downloader
+        targets = {
+            'stream_cache': d.stream_cache.stats if d.stream_cache else None,
+            'verifier': d.verifier.stats if d.verifier else None,
+            'chapters': d.chapter_splitter.stats,
+            'unavailable': d.unavailable.stats if d.unavailable else None,
+        }
+        if d.egress_pool:
+            targets.update((f"egress:{e.spec}", e.counters) for e in d.egress_pool.egresses)
+        flat = dict(delta)
+        flat.update((f"egress:{spec}", c) for spec, c in (flat.pop('egress', None) or {}).items())
+        for name, values in flat.items():
+            target = targets.get(name)
+            if target is None:
+                continue
+            for key, value in values.items():
+                target[key] = target.get(key, 0) + value
+
+    def run(self, item: dict, global_options: dict, progress_callback=None, job_id=None) -> list:
+        # 이 작업에서 남기는 로그에 작업 ID / URL / 진행 단계를 함께 기록
+        with Logger.context(job=job_id, url=item['url'], stage='prepare'):
+            return self._run(item, global_options, progress_callback)
+
+    def _run(self, item: dict, global_options: dict, progress_callback) -> list:
+        options = global_options.copy()
+        if item.get('flags'):
+            options.update(item['flags'])
+
+        if not os.path.exists(item['path']):
+            os.makedirs(item['path'], exist_ok=True)
+
+        if 'dedupe_key' in item:
+            key = item['dedupe_key']
+        else:
+            key = make_dedupe_key(item.get('id') or extract_video_id(item['url']), options)
+
+        existing = self.output_index.lookup(key)
+        if existing:
+            # 이전 실행의 출력물(구간/챕터별 파일 전체)을 재사용
+            placed = [place_output(path, item['path']) for path in existing]
+            res = [{'status': 'success', 'filepath': placed[0], 'deduped': True}]
+            if len(placed) > 1:
+                res[0]['filepaths'] = placed
+        else:
+            res = self.downloader.download([item['url']], item['path'], options, progress_callback)
+            if res and res[0]['status'] == 'success':
+                self.output_index.record(key, output_paths(res[0]))
+
+        if res and res[0]['status'] == 'success':
+            for mirror_dir in item.get('mirrors') or []:
+                for path in output_paths(res[0]):
+                    place_output(path, mirror_dir)
+        return res
+
+
+def counters_delta(before: dict, after: dict) -> dict:
+    """counters() 두 시점의 차이 (중첩 dict의 숫자 값만)"""
+    delta = {}
+    for key, value in after.items():
+        if isinstance(value, dict):
+            delta[key] = counters_delta(before.get(key) or {}, value)
+        else:
+            delta[key] = value - (before.get(key) or 0)
+    return delta
+
+
+def output_paths(result: dict) -> list:
+    """성공 결과의 모든 결과물 경로 (구간/챕터 분할/라이브 롤링 파일은 'filepaths'에 전체 목록)"""
+    return result.get('filepaths') or [result['filepath']]
+
+
+def place_output(filepath: str, dest_dir: str) -> str:
+    """완성 파일(+ 같은 이름의 자막/썸네일)을 다른 폴더에 하드링크(불가 시 복사)"""
+    src_dir = os.path.dirname(filepath)
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    for path in find_job_outputs(src_dir, stem):
+        link_or_copy(path, dest_dir)
+    return os.path.join(dest_dir, os.path.basename(filepath))
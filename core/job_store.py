@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+# 작업 상태
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobStore(ABC):
+    """
+    여러 워커(다른 머신 포함)가 공유하는 작업 저장소 인터페이스
+    - claim: 대기 중이거나 임대(lease)가 만료된 작업을 하나 가져오며 새 lease 토큰을 발급
+    - heartbeat: 토큰이 유효할 때만 임대 기간을 연장 (False면 다른 워커가 회수한 것)
+    - complete/fail: 토큰이 일치할 때만 반영 → 회수된 작업을 늦게 끝낸 워커의 결과는 무시되어 중복 반영 방지
+    """
+
+    @abstractmethod
+    def enqueue(self, items: list, options: dict, priority: int = 0) -> list:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> dict | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def heartbeat(self, job_id: int, token: str, lease_seconds: float) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, job_id: int, token: str, result: dict) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(self, job_id: int, token: str, result: dict, retry: bool = True) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def counts(self) -> dict:
+        raise NotImplementedError
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite 파일 기반 작업 저장소 (공유 스토리지에 두고 여러 프로세스/머신이 사용)
+    임대 획득은 BEGIN IMMEDIATE 트랜잭션으로 직렬화되어 같은 작업이 두 워커에 동시에 배정되지 않습니다.
+    ※ 네트워크 파일시스템은 파일 잠금이 올바르게 동작해야 합니다. (SMB/NFSv4 권장, NFSv3 lockd 필수)
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id            INTEGER PRIMARY KEY AUTOINCREMENT,
+            url           TEXT NOT NULL,
+            path          TEXT NOT NULL,
+            video_id      TEXT,
+            flags         TEXT NOT NULL DEFAULT '{}',
+            options       TEXT NOT NULL DEFAULT '{}',
+            priority      INTEGER NOT NULL DEFAULT 0,
+            state         TEXT NOT NULL DEFAULT 'queued',
+            worker_id     TEXT,
+            lease_token   TEXT,
+            lease_expires REAL,
+            attempts      INTEGER NOT NULL DEFAULT 0,
+            max_attempts  INTEGER NOT NULL DEFAULT 3,
+            result        TEXT,
+            created       REAL NOT NULL,
+            updated       REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (state, priority DESC, id);
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유하지 않고 스레드마다 하나씩 사용
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, items: list, options: dict, priority: int = 0) -> list:
+        now = time.time()
+        conn = self._conn()
+        ids = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for item in items:
+                cur = conn.execute(
+                    "INSERT INTO jobs (url, path, video_id, flags, options, priority, max_attempts, created, updated)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (item['url'], os.path.abspath(item['path']), item.get('id'), json.dumps(item.get('flags') or {}),
+                     json.dumps(options), item.get('priority', priority), self.max_attempts, now, now),
+                )
+                ids.append(cur.lastrowid)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return ids
+
+    def claim(self, worker_id: str, lease_seconds: float) -> dict | None:
+        now = time.time()
+        token = uuid.uuid4().hex
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 시도 횟수를 모두 쓴 채 만료된 임대는 실패 처리
+            conn.execute(
+                "UPDATE jobs SET state = ?, worker_id = NULL, lease_token = NULL, updated = ?"
+                " WHERE state = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (FAILED, now, LEASED, now),
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE state = ? OR (state = ? AND lease_expires < ?)"
+                " ORDER BY priority DESC, id LIMIT 1",
+                (QUEUED, LEASED, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = ?, worker_id = ?, lease_token = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated = ? WHERE id = ?",
+                (LEASED, worker_id, token, now + lease_seconds, now, row['id']),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        job = dict(row)
+        job.update(
+            flags=json.loads(job['flags']), options=json.loads(job['options']),
+            lease_token=token, worker_id=worker_id, attempts=job['attempts'] + 1,
+            reclaimed=(row['state'] == LEASED),
+        )
+        return job
+
+    def heartbeat(self, job_id: int, token: str, lease_seconds: float) -> bool:
+        now = time.time()
+        cur = self._conn().execute(
+            "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND state = ? AND lease_token = ?",
+            (now + lease_seconds, now, job_id, LEASED, token),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, token: str, result: dict) -> bool:
+        return self._finish(job_id, token, DONE, result)
+
+    def fail(self, job_id: int, token: str, result: dict, retry: bool = True) -> bool:
+        """retry=True이고 시도 횟수가 남았으면 대기열로 되돌립니다."""
+        conn = self._conn()
+        row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        state = QUEUED if retry and row and row['attempts'] < row['max_attempts'] else FAILED
+        return self._finish(job_id, token, state, result)
+
+    def counts(self) -> dict:
+        rows = self._conn().execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state").fetchall()
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update({r['state']: r['n'] for r in rows})
+        return counts
+
+    def _finish(self, job_id: int, token: str, state: str, result: dict) -> bool:
+        cur = self._conn().execute(
+            "UPDATE jobs SET state = ?, result = ?, lease_token = NULL, lease_expires = NULL, updated = ?"
+            " WHERE id = ? AND state = ? AND lease_token = ?",
+            (state, json.dumps(result, ensure_ascii=False), time.time(), job_id, LEASED, token),
+        )
+        return cur.rowcount == 1
+
+
+# 저장소 백엔드 등록표: "scheme://..." 형식의 주소로 선택 (scheme이 없으면 SQLite 파일 경로)
+STORE_BACKENDS = {
+    'sqlite': SQLiteJobStore,
+}
+
+
+def open_job_store(uri: str) -> JobStore:
+    scheme, sep, rest = uri.partition('://')
+    if not sep:
+        return SQLiteJobStore(uri)
+    if scheme not in STORE_BACKENDS:
+        raise ValueError(f"지원하지 않는 작업 저장소: {scheme}")
+    return STORE_BACKENDS[scheme](rest)
@@ -0,0 +1,435 @@
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import urljoin, urlparse
+
+from yt_dlp.utils import DownloadCancelled
+
+from ui.logger import Logger
+from utils.storage import finalize_file, format_bytes
+
+LIVE_DEFAULTS = {
+    'chunk_seconds': 600,  # 롤링 파일 하나의 길이(초)
+    'max_bytes': 20 * 1024 ** 3,  # 녹화 파일 전체 용량 상한 (초과 시 가장 오래된 파일 삭제; 0: 제한 없음)
+    'fetch_workers': 4,  # 세그먼트 동시 다운로드 수
+    'max_seconds': 0,  # 녹화 길이 상한(초) (0: 방송이 끝날 때까지)
+}
+LIVE_EDGE_SEGMENTS = 3  # 처음 녹화를 시작할 때 라이브 끝에서 거슬러 받는 세그먼트 수
+SEGMENT_RETRIES = 3
+FETCH_TIMEOUT = 20
+STALL_TARGETS = 6  # 매니페스트가 (목표 길이 x 이 값) 동안 갱신되지 않거나 받을 수 없으면 종료
+LOG_INTERVAL = 60  # 진행 상황 로그 주기(초)
+
+
+def live_settings_from_config(config) -> dict:
+    """설정의 live_* 키를 LiveRecorder 인자로 변환합니다. (값이 없으면 LIVE_DEFAULTS)"""
+    settings = {}
+    for key, default in LIVE_DEFAULTS.items():
+        value = config.get(f"live_{key}")
+        settings[key] = default if value is None else value
+    return settings
+
+
+@dataclass(slots=True)
+class LiveSegment:
+    seq: int
+    url: str
+    duration: float
+    discontinuity: bool = False
+    program_time: float = None  # EXT-X-PROGRAM-DATE-TIME (epoch 초)
+
+
+def parse_playlist(text: str, base_url: str) -> dict:
+    """
+    HLS 재생목록(m3u8)을 해석합니다.
+    마스터: {'variants': [(대역폭, 높이, URL)]}, 미디어: {'target', 'segments', 'ended', 'init', 'encrypted'}
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines or lines[0] != '#EXTM3U':
+        raise ValueError("HLS 재생목록이 아닙니다.")
+    playlist = {'variants': [], 'target': 0.0, 'segments': [], 'ended': False, 'init': None, 'encrypted': False}
+    seq, duration, discontinuity, program_time, variant = 0, None, False, None, None
+    for line in lines[1:]:
+        tag, _, value = line.partition(':')
+        if tag == '#EXT-X-STREAM-INF':
+            attrs = _parse_attributes(value)
+            height = int(attrs['RESOLUTION'].split('x')[1]) if 'x' in attrs.get('RESOLUTION', '') else 0
+            variant = (int(attrs.get('BANDWIDTH') or 0), height)
+        elif tag == '#EXT-X-TARGETDURATION':
+            playlist['target'] = float(value)
+        elif tag == '#EXT-X-MEDIA-SEQUENCE':
+            seq = int(value)
+        elif tag == '#EXTINF':
+            duration = float(value.split(',')[0])
+        elif tag == '#EXT-X-DISCONTINUITY':
+            discontinuity = True
+        elif tag == '#EXT-X-PROGRAM-DATE-TIME':
+            try:
+                program_time = datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                program_time = None
+        elif tag == '#EXT-X-MAP':
+            playlist['init'] = urljoin(base_url, _parse_attributes(value).get('URI', ''))
+        elif tag == '#EXT-X-KEY':
+            playlist['encrypted'] = _parse_attributes(value).get('METHOD', 'NONE') != 'NONE'
+        elif tag == '#EXT-X-ENDLIST':
+            playlist['ended'] = True
+        elif not line.startswith('#'):
+            if variant is not None:
+                playlist['variants'].append(variant + (urljoin(base_url, line),))
+                variant = None
+            elif duration is not None:
+                playlist['segments'].append(LiveSegment(seq, urljoin(base_url, line), duration, discontinuity, program_time))
+                seq += 1
+                duration, discontinuity = None, False
+                program_time = program_time + playlist['segments'][-1].duration if program_time else None
+    return playlist
+
+
+def _parse_attributes(value: str) -> dict:
+    """'BANDWIDTH=800000,RESOLUTION=640x360,CODECS="avc1,mp4a"' → dict (따옴표 안의 쉼표 유지)"""
+    attrs, key, buf, quoted = {}, None, '', False
+    for ch in value + ',':
+        if ch == '"':
+            quoted = not quoted
+        elif ch == '=' and key is None and not quoted:
+            key, buf = buf.strip(), ''
+        elif ch == ',' and not quoted:
+            if key:
+                attrs[key] = buf
+            key, buf = None, ''
+        else:
+            buf += ch
+    return attrs
+
+
+def _urllib_opener(url: str, headers: dict) -> bytes:
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=FETCH_TIMEOUT) as resp:
+        return resp.read()
+
+
+class RollingWriter:
+    """
+    세그먼트를 고정 길이 파일로 이어 씁니다. (작성 중인 파일은 .part, 완성되면 출력 폴더로 이동)
+    완성 파일 전체 크기가 상한을 넘으면 가장 오래된 파일부터 지웁니다.
+    """
+
+    def __init__(self, work_dir: str, output_dir: str, name: str, ext: str, chunk_seconds: float, max_bytes: int):
+        self.work_dir = work_dir
+        self.output_dir = output_dir
+        self.name = name
+        self.ext = ext
+        self.chunk_seconds = chunk_seconds
+        self.max_bytes = max_bytes
+        self.files = []  # [(경로, 크기)] 오래된 순
+        self.stats = {'deleted_files': 0, 'deleted_bytes': 0}
+        self._file = None
+        self._path = None
+        self._seconds = 0.0
+        self._bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size in self.files) + self._bytes
+
+    def write(self, data: bytes, duration: float, init: bytes = None, new_file: bool = False):
+        if self._file is None or new_file or (self.chunk_seconds and self._seconds >= self.chunk_seconds):
+            self._roll(init)
+        self._file.write(data)
+        self._seconds += duration
+        self._bytes += len(data)
+        self._enforce_cap()
+
+    def close(self):
+        """작성 중인 파일을 완성 처리합니다. (비어 있으면 삭제)"""
+        if self._file is None:
+            return
+        self._file.close()
+        part, self._file = self._path, None
+        if not self._bytes:
+            os.remove(part)
+            return
+        path = part[:-len('.part')]
+        os.replace(part, path)
+        if self.work_dir != self.output_dir:
+            path = finalize_file(path, self.output_dir)
+        self.files.append((path, self._bytes))
+        self._bytes = 0
+
+    def _roll(self, init: bytes = None):
+        self.close()
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        name = f"{self.name} [live {stamp}]"
+        index = 1
+        while any(os.path.exists(os.path.join(d, f"{name}.{self.ext}")) for d in (self.work_dir, self.output_dir)):
+            index += 1
+            name = f"{self.name} [live {stamp}-{index}]"
+        self._path = os.path.join(self.work_dir, f"{name}.{self.ext}.part")
+        self._file = open(self._path, 'wb')
+        self._seconds = 0.0
+        self._bytes = 0
+        if init:
+            self._file.write(init)
+            self._bytes += len(init)
+
+    def _enforce_cap(self):
+        while self.max_bytes and self.files and self.total_bytes > self.max_bytes:
+            path, size = self.files.pop(0)
+            try:
+                os.remove(path)
+            except OSError as e:
+                Logger.warning(f"[Live] 오래된 녹화 파일 삭제 실패: {e}")
+            self.stats['deleted_files'] += 1
+            self.stats['deleted_bytes'] += size
+            Logger.info(f"[Live] 용량 상한 초과로 삭제: {os.path.basename(path)}")
+
+
+class LiveRecorder:
+    """
+    HLS 라이브 녹화기
+    재생목록을 목표 길이(TARGETDURATION) 주기로 다시 받아 새 세그먼트를 스레드 풀에서 동시에 받고,
+    받은 순서와 무관하게 시퀀스 순서대로 롤링 파일(RollingWriter)에 씁니다.
+    재생목록 창에서 이미 빠진 세그먼트(폴링 지연/네트워크 단절)나 끝내 받지 못한 세그먼트는 누락으로 기록하고
+    현재 창에서 이어 녹화하며, 시퀀스가 되돌아가면(방송 재시작) 새 파일로 이어 씁니다.
+    지연 지표: lag(재생목록에 나타난 뒤 디스크에 쓰기까지), behind(받지 못한 재생목록 끝부분 길이),
+    edge_lag(PROGRAM-DATE-TIME 기준 실제 시각과의 차이; 태그가 없으면 None)
+    """
+
+    def __init__(self, manifest_url: str, work_dir: str, name: str, output_dir: str = None, chunk_seconds: float = 600,
+                 max_bytes: int = 0, fetch_workers: int = 4, max_seconds: float = 0, max_height: int = None,
+                 headers: dict = None, opener=None, progress_callback=None):
+        self.manifest_url = manifest_url
+        self.work_dir = work_dir
+        self.output_dir = output_dir or work_dir
+        self.name = name  # 파일 이름 앞부분 ('이름 [live 20261019-153000].ts')
+        self.chunk_seconds = chunk_seconds
+        self.max_bytes = max_bytes
+        self.fetch_workers = fetch_workers
+        self.max_seconds = max_seconds
+        self.max_height = max_height
+        self.headers = headers or {}
+        self.opener = opener or _urllib_opener  # (url, headers) -> bytes; yt-dlp 경유 시 ydl.urlopen (프록시/쿠키 적용)
+        self.progress_callback = progress_callback
+        self.writer = None
+        self.metrics = {
+            'segments': 0, 'bytes': 0, 'seconds': 0.0, 'gaps': 0, 'gap_seconds': 0.0, 'failed_segments': 0,
+            'retries': 0, 'restarts': 0, 'lag': None, 'max_lag': 0.0, 'behind': 0.0, 'edge_lag': None,
+            'stopped': None,
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pending = {}  # seq -> (LiveSegment, Future, 처음 본 시각)
+        self._skips = {}  # 누락 구간: 시작 seq -> 다음으로 쓸 seq
+        self._next_fetch = None
+        self._next_write = None
+        self._new_file = False
+        self._init = (None, None)  # (URL, bytes)
+        self._window = []
+        self._target = 2.0
+        self._last_log = 0.0
+
+    @property
+    def files(self) -> list:
+        """완성된(용량 상한으로 지워지지 않은) 녹화 파일 경로 - 오래된 순"""
+        return [path for path, _ in self.writer.files] if self.writer else []
+
+    def stop(self):
+        """다른 스레드에서 녹화를 멈춥니다. (받던 세그먼트까지 쓰고 종료)"""
+        self._stop.set()
+
+    def run(self) -> dict:
+        """방송이 끝나거나 녹화 상한/중지 요청에 도달할 때까지 녹화하고 {'files', 'metrics'}를 반환합니다."""
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='live-fetch')
+        last_change = time.monotonic()
+        last_playlist = None
+        try:
+            while not self._stop.is_set():
+                playlist = self._load_playlist()
+                now = time.monotonic()
+                if playlist is None or playlist['segments'] == last_playlist:
+                    if now - last_change > max(30.0, self._target * STALL_TARGETS):
+                        if not self.metrics['segments']:
+                            raise RuntimeError(f"라이브 재생목록이 {now - last_change:.0f}초 동안 갱신되지 않았습니다.")
+                        # ENDLIST 없이 끝나는 방송이 많으므로 녹화한 것이 있으면 종료로 처리
+                        Logger.info(f"[Live] 재생목록이 {now - last_change:.0f}초 동안 갱신되지 않아 녹화를 마칩니다.")
+                        self._drain(None)
+                        self.metrics['stopped'] = 'stalled'
+                        break
+                    wait_seconds = self._target / 2  # 갱신 없음: 목표 길이의 절반 뒤 재시도 (RFC 8216 6.3.4)
+                else:
+                    last_change, last_playlist = now, playlist['segments']
+                    self._schedule(executor, playlist)
+                    wait_seconds = self._target
+                if playlist and playlist['ended']:
+                    self._drain(None)
+                    self.metrics['stopped'] = 'ended'
+                    break
+                self._drain(now + wait_seconds)
+                if self.max_seconds and self.metrics['seconds'] >= self.max_seconds:
+                    self.metrics['stopped'] = 'max_seconds'
+                    break
+            else:
+                self._drain(None)
+                self.metrics['stopped'] = 'stopped'
+        except DownloadCancelled:
+            # 라이브의 취소는 '녹화 중지': 지금까지 녹화한 파일은 유지
+            self.metrics['stopped'] = 'cancelled'
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.writer:
+                self.writer.close()
+            self.metrics['elapsed'] = round(time.monotonic() - started, 1)
+        if self.writer:
+            self.metrics.update(self.writer.stats)
+        Logger.info(self.summary())
+        return {'files': self.files, 'metrics': dict(self.metrics)}
+
+    def summary(self) -> str:
+        m = self.metrics
+        lag = f"{m['lag']:.1f}초" if m['lag'] is not None else '-'
+        edge = f", 실시간 대비 {m['edge_lag']:.1f}초" if m['edge_lag'] is not None else ''
+        return (f"[Live] 녹화 {m['seconds']:.0f}초 ({m['segments']}개 세그먼트, {format_bytes(m['bytes'])}), "
+                f"지연 {lag} (최대 {m['max_lag']:.1f}초{edge}), 누락 {m['gaps']}개 ({m['gap_seconds']:.0f}초), "
+                f"재시작 {m['restarts']}")
+
+    # --- 재생목록 ---
+    def _load_playlist(self) -> dict | None:
+        try:
+            text = self.opener(self.manifest_url, self.headers).decode('utf-8', errors='replace')
+            playlist = parse_playlist(text, self.manifest_url)
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            Logger.warning(f"[Live] 재생목록 요청 실패: {e}")
+            return None
+        if playlist['variants']:
+            # 마스터 재생목록: 화질 상한 이하에서 가장 높은 대역폭의 미디어 재생목록으로 전환
+            variants = [v for v in playlist['variants'] if not self.max_height or not v[1] or v[1] <= self.max_height]
+            bandwidth, height, url = max(variants or playlist['variants'], key=lambda v: (v[0], v[1]))
+            Logger.info(f"[Live] 미디어 재생목록 선택: {height or '?'}p, {bandwidth // 1000}kbps")
+            self.manifest_url = url
+            return self._load_playlist()
+        if playlist['encrypted']:
+            raise RuntimeError("암호화된 HLS 라이브는 녹화할 수 없습니다.")
+        self._target = playlist['target'] or self._target
+        return playlist
+
+    def _schedule(self, executor: ThreadPoolExecutor, playlist: dict):
+        segments = playlist['segments']
+        if not segments:
+            return
+        self._window = segments
+        first, last = segments[0].seq, segments[-1].seq
+        if self._next_fetch is None:
+            # 라이브 끝부분부터 시작 (끝난 방송이면 처음부터)
+            start = first if playlist['ended'] else max(first, last - LIVE_EDGE_SEGMENTS + 1)
+            self._next_fetch = self._next_write = start
+        elif last < self._next_fetch - 1 - len(segments):
+            # 시퀀스가 크게 되돌아감: 방송 재시작 → 받던 것을 모두 쓰고 새 파일로
+            Logger.warning(f"[Live] 미디어 시퀀스가 {self._next_fetch} → {first}로 되돌아감 (방송 재시작으로 처리)")
+            self._drain(None)
+            self.metrics['restarts'] += 1
+            self._next_fetch = self._next_write = max(first, last - LIVE_EDGE_SEGMENTS + 1)
+            self._new_file = True
+        elif first > self._next_fetch:
+            # 받기 전에 재생목록 창에서 빠진 세그먼트: 누락 기록 후 현재 창에서 이어서
+            missed = first - self._next_fetch
+            with self._lock:
+                self.metrics['gaps'] += missed
+                self.metrics['gap_seconds'] += missed * self._target
+            Logger.warning(f"[Live] 세그먼트 {missed}개 누락 (시퀀스 {self._next_fetch}~{first - 1}; 재생목록 창에서 빠짐)")
+            self._skips[self._next_fetch] = first
+            self._next_fetch = first
+
+        init_url = playlist['init']
+        if init_url and init_url != self._init[0]:
+            init = self._fetch(init_url)
+            if init is None:
+                return  # 초기화 세그먼트 없이는 이어 쓸 수 없으므로 다음 폴링에서 재시도
+            self._init = (init_url, init)
+            self._new_file = self.writer is not None
+        seen = time.monotonic()
+        for segment in segments:
+            if segment.seq < self._next_fetch:
+                continue
+            self._pending[segment.seq] = (segment, executor.submit(self._fetch, segment.url), seen)
+            self._next_fetch = segment.seq + 1
+
+    def _fetch(self, url: str) -> bytes | None:
+        for attempt in range(SEGMENT_RETRIES):
+            try:
+                return self.opener(url, self.headers)
+            except Exception as e:
+                if attempt + 1 == SEGMENT_RETRIES:
+                    Logger.warning(f"[Live] 세그먼트 받기 실패: {os.path.basename(urlparse(url).path)} ({e})")
+                    return None
+                with self._lock:
+                    self.metrics['retries'] += 1
+                time.sleep(0.5 * 2 ** attempt)
+
+    # --- 순서대로 쓰기 ---
+    def _drain(self, deadline: float | None):
+        """다음 순서의 세그먼트가 준비되는 대로 씁니다. (deadline: 이 시각까지만 대기, None: 받던 것을 모두 쓸 때까지)"""
+        while True:
+            if self._next_write in self._skips:
+                self._next_write = self._skips.pop(self._next_write)
+                continue
+            entry = self._pending.get(self._next_write)
+            if entry is None:
+                if deadline is not None:
+                    time.sleep(max(0.0, deadline - time.monotonic()))
+                return
+            segment, future, seen = entry
+            if not future.done():
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                wait([future], timeout=timeout, return_when=FIRST_COMPLETED)
+                if not future.done():
+                    return
+            del self._pending[self._next_write]
+            self._next_write += 1
+            data = future.result()
+            if data is None:
+                self.metrics['failed_segments'] += 1
+                self.metrics['gaps'] += 1
+                self.metrics['gap_seconds'] += segment.duration
+                continue
+            self._write(segment, data, seen)
+            if self.max_seconds and self.metrics['seconds'] >= self.max_seconds:
+                return
+
+    def _write(self, segment: LiveSegment, data: bytes, seen: float):
+        if self.writer is None:
+            ext = 'mp4' if self._init[1] else (os.path.splitext(urlparse(segment.url).path)[1][1:].lower() or 'ts')
+            ext = ext if ext in ('mp4', 'ts', 'aac', 'mp3') else 'ts'
+            self.writer = RollingWriter(self.work_dir, self.output_dir, self.name, ext, self.chunk_seconds, self.max_bytes)
+        new_file = self._new_file or segment.discontinuity
+        self._new_file = False
+        self.writer.write(data, segment.duration, init=self._init[1], new_file=new_file)
+
+        m = self.metrics
+        m['segments'] += 1
+        m['bytes'] += len(data)
+        m['seconds'] += segment.duration
+        m['lag'] = round(time.monotonic() - seen, 2)
+        m['max_lag'] = max(m['max_lag'], m['lag'])
+        m['behind'] = round(sum(s.duration for s in self._window if s.seq >= self._next_write), 2)
+        if segment.program_time:
+            m['edge_lag'] = round(time.time() - segment.program_time - segment.duration, 2)
+
+        now = time.monotonic()
+        if now - self._last_log >= LOG_INTERVAL:
+            self._last_log = now
+            Logger.info(self.summary())
+        if self.progress_callback:
+            percent = min(100.0, m['seconds'] / self.max_seconds * 100) if self.max_seconds else 0
+            self.progress_callback({
+                'status': 'downloading', 'percent': percent,
+                'speed': f"lag {m['lag']:.1f}s",
+                'filename': f"LIVE {m['seconds'] / 60:.0f}m {format_bytes(self.writer.total_bytes)}",
+                'live': {key: m[key] for key in ('lag', 'behind', 'edge_lag', 'gaps', 'segments')},
+            })
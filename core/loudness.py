@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ui.logger import Logger
+from utils.storage import file_lock
+
+LOUDNESS_CACHE_FILE = 'loudness_cache.json'
+
+# EBU R128 기본 목표값 (통합 음량 / 트루 피크 / 음량 범위)
+DEFAULT_TARGET = {'I': -16.0, 'TP': -1.5, 'LRA': 11.0}
+
+# loudnorm 1차 패스 출력 중 소스 고유의 측정값 (목표값과 무관하므로 목표가 달라도 재사용 가능)
+MEASURED_KEYS = ('input_i', 'input_tp', 'input_lra', 'input_thresh')
+
+HASH_CHUNK = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """파일 내용의 SHA-256 (같은 원본을 다른 이름/경로로 다시 받아도 같은 키가 되도록 내용 기준)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_loudnorm_filter(target: dict, measured: dict | None) -> str:
+    """측정값이 있으면 정확한 2차 패스(linear) 필터, 없으면 1패스(dynamic) 필터를 만듭니다."""
+    args = f"loudnorm=I={target['I']}:TP={target['TP']}:LRA={target['LRA']}"
+    if measured:
+        args += (f":measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+                 f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}:linear=true")
+    return args
+
+
+class LoudnessAnalyzer:
+    """
+    loudnorm 1차 패스(측정) 실행기 + 측정값 캐시
+    측정값은 원본 내용 해시로 저장되므로, 같은 원본을 다른 형식/비트레이트로 다시 내보낼 때는 분석 패스를 건너뜁니다.
+    분석은 전용 스레드 풀에서 실행되어 배치 내 여러 트랙이 동시에 측정됩니다.
+    """
+
+    def __init__(self, ffmpeg_path: str, cache_path: str = LOUDNESS_CACHE_FILE, max_workers: int = None):
+        self.ffmpeg_path = ffmpeg_path
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 2,
+                                            thread_name_prefix='loudness')
+        self.entries = {}
+        self.stats = {'hits': 0, 'analyzed': 0, 'failed': 0}
+        self._load()
+
+    def submit(self, path: str) -> Future:
+        """분석을 예약하고 측정값(dict 또는 None)을 돌려줄 Future를 반환합니다."""
+        return self._executor.submit(self.measure, path)
+
+    def measure(self, path: str) -> dict | None:
+        if not self.ffmpeg_path or not os.path.isfile(path):
+            return None
+        key = hash_file(path)
+
+        with self._lock:
+            if key in self.entries:
+                self.stats['hits'] += 1
+                return self.entries[key]
+            # 같은 원본을 여러 작업이 동시에 요청하면 한 번만 분석
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        measured = None
+        try:
+            measured = self._run_first_pass(path)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if measured:
+                    self.entries[key] = measured
+                    self.stats['analyzed'] += 1
+                    self._save()
+                else:
+                    self.stats['failed'] += 1
+            pending.set_result(measured)
+        return measured
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- 내부 헬퍼 ---
+    def _run_first_pass(self, path: str) -> dict | None:
+        cmd = [self.ffmpeg_path, '-hide_banner', '-nostats', '-i', path, '-vn',
+               '-af', build_loudnorm_filter(DEFAULT_TARGET, None) + ':print_format=json', '-f', 'null', '-']
+        try:
+            proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            Logger.warning(f"음량 분석 실패: {os.path.basename(path)} ({e})")
+            return None
+
+        # loudnorm은 통계 JSON을 stderr 마지막에 출력
+        match = re.search(r'\{[^{}]*"input_i"[^{}]*\}', proc.stderr.decode('utf-8', errors='replace'))
+        if not match:
+            return None
+        try:
+            stats = json.loads(match.group(0))
+            measured = {k: float(stats[k]) for k in MEASURED_KEYS}
+        except (KeyError, ValueError):
+            return None
+        # 무음 트랙(-inf)은 정규화 대상이 아님
+        return measured if all(abs(v) != float('inf') for v in measured.values()) else None
+
+    def _load(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.entries.update(json.load(f))
+        except Exception as e:
+            Logger.warning(f"음량 캐시 로드 중 오류: {e}")
+
+    def _save(self):
+        """
+        파일 잠금 안에서 디스크 캐시를 다시 읽어 병합한 뒤 원자적으로 교체합니다. (lock 보유 상태에서 호출)
+        convert의 프로세스 풀처럼 여러 프로세스가 같은 캐시를 써도 서로의 측정값을 덮어쓰지 않습니다.
+        """
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with file_lock(f"{self.cache_path}.lock"):
+                mine = dict(self.entries)
+                self._load()
+                self.entries.update(mine)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, indent=2)
+                os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            Logger.warning(f"음량 캐시 저장 실패: {e}")
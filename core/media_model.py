@@ -0,0 +1,105 @@
+import sys
+from dataclasses import asdict, dataclass, field
+
+# 수천 개 항목의 재생목록을 분석해도 메모리가 크게 늘지 않도록,
+# yt-dlp의 원본 info dict 대신 선택기/UI에 필요한 필드만 숫자 타입으로 보관하는 경량 모델입니다.
+# 반복되는 짧은 문자열(ext, 코덱)은 intern하여 항목 간에 공유합니다.
+
+
+def _intern(value) -> str:
+    return sys.intern(value) if isinstance(value, str) else ''
+
+
+@dataclass(slots=True)
+class VideoFormat:
+    format_id: str
+    ext: str
+    height: int
+    fps: float
+    codec: str
+    vbr: float          # kbps (없으면 0)
+    filesize: int       # bytes (없으면 0)
+    hdr: bool
+
+    @property
+    def res(self) -> str:
+        return f"{self.height}p"
+
+
+@dataclass(slots=True)
+class AudioFormat:
+    format_id: str
+    ext: str
+    abr: float          # kbps (없으면 0)
+    codec: str
+    asr: int            # Hz (없으면 0)
+    filesize: int
+
+
+@dataclass(slots=True)
+class FormatSet:
+    """화질 내림차순으로 정렬된 영상/오디오 포맷 목록"""
+    video: tuple = ()
+    audio: tuple = ()
+
+    @classmethod
+    def from_raw(cls, raw_formats: list) -> 'FormatSet':
+        video, audio = [], []
+        for f in raw_formats or []:
+            if not f.get('format_id') or not f.get('ext'): continue
+            filesize = int(f.get('filesize') or f.get('filesize_approx') or 0)
+            vcodec, acodec = f.get('vcodec'), f.get('acodec')
+
+            # Audio Only
+            if vcodec == 'none' and acodec != 'none':
+                audio.append(AudioFormat(
+                    format_id=f['format_id'], ext=_intern(f['ext']), abr=float(f.get('abr') or 0),
+                    codec=_intern(acodec), asr=int(f.get('asr') or 0), filesize=filesize,
+                ))
+            # Video
+            elif vcodec != 'none':
+                if not f.get('height'): continue
+                video.append(VideoFormat(
+                    format_id=f['format_id'], ext=_intern(f['ext']), height=int(f['height']),
+                    fps=float(f.get('fps') or 0), codec=_intern(vcodec), vbr=float(f.get('vbr') or 0),
+                    filesize=filesize, hdr='HDR' in (f.get('dynamic_range') or ''),
+                ))
+
+        video.sort(key=lambda x: (x.height, x.fps), reverse=True)
+        audio.sort(key=lambda x: x.abr, reverse=True)
+        return cls(tuple(video), tuple(audio))
+
+    def to_dict(self) -> dict:
+        return {'video': [asdict(f) for f in self.video], 'audio': [asdict(f) for f in self.audio]}
+
+
+@dataclass(slots=True)
+class VideoMeta:
+    """영상 하나의 분석 결과 (원본 info dict는 변환 직후 버려집니다)"""
+    id: str
+    title: str
+    duration: int = 0
+    thumbnail: str = None
+    view_count: int = None
+    uploader: str = None
+    upload_date: str = None
+    chapters: int = 0  # 챕터 수 (챕터 분할 안내용)
+    formats: FormatSet = field(default_factory=FormatSet)
+
+    @classmethod
+    def from_info(cls, info: dict) -> 'VideoMeta':
+        return cls(
+            id=info.get('id'),
+            title=info.get('title'),
+            duration=int(info.get('duration') or 0),
+            thumbnail=info.get('thumbnail'),
+            view_count=info.get('view_count'),
+            uploader=info.get('uploader'),
+            upload_date=info.get('upload_date'),
+            chapters=len(info.get('chapters') or []),
+            formats=FormatSet.from_raw(info.get('formats')),
+        )
+
+    @property
+    def max_height(self) -> int:
+        return self.formats.video[0].height if self.formats.video else 0
@@ -1,8 +1,12 @@
-import yt_dlp
 from urllib.parse import parse_qs, urlparse
+from core.media_model import FormatSet, VideoFormat, VideoMeta
+from core.parser import fanout_source_options
+from core.ydl_pool import YDLPool
+from ui.logger import Logger
 
 class MetadataAnalyzer:
-    def __init__(self):
+    def __init__(self, ydl_pool: YDLPool = None):
+        self.ydl_pool = ydl_pool if ydl_pool else YDLPool()
         self.ydl_opts = {
             'quiet': True,
             'no_warnings': True,
@@ -13,13 +17,14 @@ class MetadataAnalyzer:
             'noplaylist': True, 
         }
 
-    def get_video_info(self, url: str) -> dict:
+    def get_video_info(self, url: str) -> VideoMeta | None:
         """
         URL을 받아 영상의 제목, 썸네일, 그리고 사용 가능한 포맷 리스트를 반환합니다.
         ('noplaylist=True' 설정 덕분에 멈추지 않고 즉시 결과를 반환합니다.)
+        원본 info dict는 경량 모델(VideoMeta)로 변환한 뒤 보관하지 않습니다.
         """
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            with self.ydl_pool.acquire(self.ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
                 
                 if not info: return None
@@ -31,66 +36,55 @@ class MetadataAnalyzer:
                         # 첫 번째 영상의 정보를 찾아서 반환 (옵션 선택용)
                         for entry in info['entries']:
                             if entry and 'formats' in entry:
-                                return {
-                                    'id': entry.get('id'),
-                                    'title': entry.get('title'),
-                                    '_type': 'video', # UI가 단일 영상처럼 처리하도록 video로 설정
-                                    'thumbnail': entry.get('thumbnail'),
-                                    'duration': entry.get('duration'),
-                                    'formats': self._parse_formats(entry.get('formats', []))
-                                }
+                                return VideoMeta.from_info(entry)
                     return None
 
                 # [Case 2] 일반적인 단일 영상 (대부분 여기로 옴)
-                return {
-                    'id': info.get('id'),
-                    'title': info.get('title'),
-                    '_type': 'video',
-                    'duration': info.get('duration'),
-                    'thumbnail': info.get('thumbnail'),
-                    'view_count': info.get('view_count'),
-                    'formats': self._parse_formats(info.get('formats', []))
-                }
+                return VideoMeta.from_info(info)
 
         except Exception as e:
-            # print(f"[Error] 메타데이터 분석 실패: {e}")
+            Logger.debug(f"메타데이터 분석 실패 ({url}): {e}")
             return None
 
-    def _parse_formats(self, raw_formats: list) -> dict:
-        parsed = { 'video': [], 'audio': [] }
+    @staticmethod
+    def select_formats(formats: FormatSet, options: dict) -> tuple:
+        """
+        Downloader._build_ydl_opts의 포맷 선택 규칙(bestvideo[height<=N]+bestaudio / bestaudio)을 흉내내어
+        (비디오 포맷 또는 None, 오디오 포맷 또는 None)을 반환합니다.
+        """
+        audio = formats.audio[0] if formats.audio else None
+        if options.get('renditions'):
+            options = fanout_source_options(options['renditions'])  # 멀티 출력은 모든 결과물을 만들 원본 하나
+        if options.get('ext') in ['mp3', 'flac', 'wav', 'aac', 'm4a']:
+            return None, audio
+        height = options.get('height')
+        video = next((f for f in formats.video if not height or f.height <= height), None)
+        return video, audio
+
+    @staticmethod
+    def format_size(f, duration: int = None) -> int:
+        """포맷 하나의 크기(bytes). 크기 정보가 없으면 비트레이트 x 길이로 추정합니다."""
+        if not f: return 0
+        if f.filesize: return f.filesize
+        kbps = f.vbr if isinstance(f, VideoFormat) else f.abr
+        if kbps and duration: return int(kbps * 1000 / 8 * duration)
+        return 0
 
-        for f in raw_formats:
-            if not f.get('format_id') or not f.get('ext'): continue
-            filesize = f.get('filesize') or f.get('filesize_approx') or 0
+    @staticmethod
+    def clip_duration(options: dict, duration: int = None):
+        """시간 구간(time_ranges)이 지정되면 실제로 받을 길이(초), 아니면 영상 길이를 반환합니다. (챕터는 분석 전이라 전체로 간주)"""
+        ranges = options.get('time_ranges')
+        if not ranges or not duration or options.get('chapters'):
+            return duration
+        return min(duration, sum(max(0, min(end if end is not None else duration, duration) - start) for start, end in ranges))
 
-            # Audio Only
-            if f.get('vcodec') == 'none' and f.get('acodec') != 'none':
-                parsed['audio'].append({
-                    'id': f['format_id'],
-                    'ext': f['ext'],
-                    'abr': f.get('abr', 0),
-                    'codec': f.get('acodec'),
-                    'asr': f.get('asr'),
-                    'filesize': filesize
-                })
-            # Video
-            elif f.get('vcodec') != 'none':
-                if not f.get('height'): continue
-                parsed['video'].append({
-                    'id': f['format_id'],
-                    'ext': f['ext'],
-                    'res': f"{f.get('height')}p",
-                    'fps': f.get('fps'),
-                    'codec': f.get('vcodec'),
-                    'vbr': f.get('vbr', 0),
-                    'filesize': filesize,
-                    'hdr': 'HDR' in f.get('dynamic_range', '') 
-                })
+    @classmethod
+    def estimate_download_size(cls, formats: FormatSet, options: dict, duration: int = None) -> int:
+        """select_formats로 고른 포맷들의 예상 다운로드 크기(bytes) 합계 (구간 다운로드는 길이 비율만큼)"""
+        total = sum(cls.format_size(f, duration) for f in cls.select_formats(formats, options))
+        clip = cls.clip_duration(options, duration)
+        return int(total * clip / duration) if duration and clip is not None else total
 
-        parsed['video'].sort(key=lambda x: (int(x['res'][:-1]), x['fps']), reverse=True)
-        parsed['audio'].sort(key=lambda x: x['abr'] or 0, reverse=True)
-        return parsed
-    
     def get_playlist_items(self, url: str) -> list:
         """
         재생목록 URL을 받아 포함된 모든 영상의 정보(URL, 제목) 리스트를 반환합니다.
@@ -112,7 +106,7 @@ class MetadataAnalyzer:
                 'ignoreerrors': True,
             }
             
-            with yt_dlp.YoutubeDL(list_opts) as ydl:
+            with self.ydl_pool.acquire(list_opts) as ydl:
                 info = ydl.extract_info(target_url, download=False)
                 
                 if not info: return []
@@ -129,10 +123,11 @@ class MetadataAnalyzer:
                         if video_url:
                             items.append({
                                 'url': video_url,
+                                'id': entry.get('id'),
                                 'title': entry.get('title', 'Unknown')
                             })
                 return items
                 
         except Exception as e:
-            print(f"[Error] 재생목록 추출 실패: {e}")
+            Logger.error(f"재생목록 추출 실패: {e}")
             return []
\ No newline at end of file
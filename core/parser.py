@@ -1,10 +1,36 @@
 import re
 
+# 확장 목록 정의 (변환 전용 모드의 입력 파일 판별에도 사용)
+VIDEO_EXTS = ['mp4', 'mkv', 'webm', 'avi', 'mov', 'wmv', 'flv', '3gp', 'ts', 'ogv', 'mpg']
+AUDIO_EXTS = ['mp3', 'm4a', 'flac', 'wav', 'aac', 'opus', 'ogg', 'wma', 'alac', 'aiff', 'pcm']
+
+TIME_PATTERN = r'(?:\d+:){0,2}\d+(?:\.\d+)?'
+
+RENDITION_SEPARATOR = ';'
+# 결과물마다가 아니라 다운로드(작업) 단위로 적용되는 옵션 (멀티 출력 시 모든 부분의 값을 합침)
+JOB_LEVEL_KEYS = ('subtitles', 'thumbnail', 'metadata', 'time_ranges', 'chapters', 'split_chapters', 'split_exact')
+
+
+def parse_timestamp(text: str) -> float:
+    """'1:02:03', '2:45', '90', '90.5' 형식의 시각을 초 단위로 변환합니다."""
+    seconds = 0.0
+    for part in text.split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
 def parse_quality_string(input_str: str) -> dict:
     """
     사용자 입력 문자열을 파싱하여 옵션 딕셔너리로 변환합니다.
     FFmpeg 지원 포맷을 대폭 확장하여 지원합니다.
+    ';'로 여러 결과물을 나열하면(예: "mp4 1080p ; mp3 BR_192k ; flac 24bit") 각각을 options['renditions']에 담습니다.
     """
+    if input_str and RENDITION_SEPARATOR in input_str:
+        parts = [part.strip() for part in input_str.split(RENDITION_SEPARATOR) if part.strip()]
+        if len(parts) > 1:
+            return _parse_renditions(parts)
+        input_str = parts[0] if parts else ""  # "720p;" 처럼 빈 부분만 덧붙은 경우
+
     options = {
         # Video
         'height': None,
@@ -19,6 +45,8 @@ def parse_quality_string(input_str: str) -> dict:
         'bit_depth': None,
         'audio_channels': None,
         'audio_codec': None,
+        'loudnorm': False,
+        'loudnorm_target': None,
         
         # Common
         'ext': None,
@@ -29,6 +57,17 @@ def parse_quality_string(input_str: str) -> dict:
         'use_original': False,
         'use_best_quality': False,
         'use_upscale': False,
+
+        # Sections (구간 다운로드)
+        'time_ranges': [],
+        'chapters': [],
+
+        # Chapter split (다운로드 후 챕터별 파일로 분할; exact: 키프레임이 아닌 경계는 재인코딩)
+        'split_chapters': False,
+        'split_exact': False,
+
+        # Fan-out (한 번 다운로드 → 여러 결과물; 각 항목은 이 딕셔너리와 같은 형태)
+        'renditions': [],
     }
     
     if not input_str:
@@ -36,10 +75,6 @@ def parse_quality_string(input_str: str) -> dict:
 
     tokens = input_str.lower().split()
     
-    # 확장 목록 정의
-    VIDEO_EXTS = ['mp4', 'mkv', 'webm', 'avi', 'mov', 'wmv', 'flv', '3gp', 'ts', 'ogv', 'mpg']
-    AUDIO_EXTS = ['mp3', 'm4a', 'flac', 'wav', 'aac', 'opus', 'ogg', 'wma', 'alac', 'aiff', 'pcm']
-    
     VIDEO_CODECS = ['av1', 'vp9', 'vp8', 'h264', 'h265', 'hevc', 'prores', 'theora', 'mpeg4']
     AUDIO_CODECS = ['aac', 'opus', 'vorbis', 'mp3', 'flac', 'alac', 'pcm', 'ac3', 'eac3']
 
@@ -71,6 +106,25 @@ def parse_quality_string(input_str: str) -> dict:
             options['sample_rate'] = int(val * 1000)
             continue
             
+        # [Audio] Loudness target (LUFS_14 / LUFS_-23 → 통합 음량 목표, 정규화 활성화)
+        if match := re.match(r'^lufs_-?(\d+(?:\.\d+)?)$', token):
+            options['loudnorm'] = True
+            options['loudnorm_target'] = -float(match.group(1))
+            continue
+
+        # [Section] 시간 구간 (RANGE_1:30-2:45, RANGE_1:00:00- = 끝까지) - 여러 개 지정 가능
+        if match := re.match(rf'^range_({TIME_PATTERN})-({TIME_PATTERN})?$', token):
+            # 끝이 시작보다 앞선 구간도 그대로 담아 옵션 점검(validate_options)에서 거부
+            start = parse_timestamp(match.group(1))
+            end = parse_timestamp(match.group(2)) if match.group(2) else None
+            options['time_ranges'].append([start, end])
+            continue
+
+        # [Section] 챕터 제목 정규식 (CHAPTER_intro, CHAPTER_part.[23]) - 대소문자 무시
+        if match := re.match(r'^chapter_(.+)$', token):
+            options['chapters'].append(match.group(1))
+            continue
+
         # [Audio] Bit Depth (8bit ~ 64bit)
         if match := re.match(r'^(\d+)bit$', token):
             options['bit_depth'] = int(match.group(1))
@@ -95,8 +149,44 @@ def parse_quality_string(input_str: str) -> dict:
         elif token in ['best', 'bestquality']: options['use_best_quality'] = True
         elif token == 'upscale': options['use_upscale'] = True
         elif token == 'enhance': options['use_enhance'] = True
+        elif token in ['loudnorm', 'normalize']: options['loudnorm'] = True
         elif token == 'sub': options['subtitles'] = True
         elif token == 'thumb': options['thumbnail'] = True
         elif token == 'meta': options['metadata'] = True
+        elif token == 'split': options['split_chapters'] = True
+        elif token == 'split_exact':
+            options['split_chapters'] = True
+            options['split_exact'] = True
+
+    return options
+
 
-    return options
\ No newline at end of file
+def _parse_renditions(parts: list) -> dict:
+    """
+    멀티 출력 옵션: 최상위 값은 첫 결과물 기준이고, 작업 단위 옵션(자막/구간 등)은 모든 부분을 합칩니다.
+    """
+    parsed = [parse_quality_string(part) for part in parts]
+    # 작업 단위 토큰만 있는 부분(예: "1080p mp4 ; sub")은 결과물을 만들지 않고 옵션만 합침
+    defaults = parse_quality_string("")
+    renditions = [r for r in parsed if any(r[key] != defaults[key] for key in r if key not in JOB_LEVEL_KEYS)]
+    options = dict(renditions[0] if renditions else defaults)
+    for key in JOB_LEVEL_KEYS:
+        if isinstance(options[key], list):
+            options[key] = [value for r in parsed for value in r[key]]
+        else:
+            options[key] = any(r[key] for r in parsed)
+    if len(renditions) > 1:
+        options['renditions'] = renditions
+    return options
+
+
+def fanout_source_options(renditions: list) -> dict:
+    """
+    모든 결과물을 만들 수 있는 원본 다운로드 조건
+    비디오 결과물이 하나라도 있으면 그중 가장 높은 해상도(+오디오), 모두 오디오면 오디오만 받습니다.
+    """
+    videos = [r for r in renditions if r.get('ext') not in AUDIO_EXTS]
+    if not videos:
+        return {'height': None, 'ext': 'm4a', 'audio_only': True}
+    heights = [r.get('height') for r in videos]
+    return {'height': max(heights) if all(heights) else None, 'ext': None, 'audio_only': False}
@@ -0,0 +1,177 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from yt_dlp.networking import Request
+
+from core.catalog import expand_collection
+from core.media_model import VideoMeta
+from core.metadata import MetadataAnalyzer
+from utils.storage import get_free_space
+
+AUDIO_MODE_EXTS = ('mp3', 'flac', 'wav', 'aac', 'm4a')  # Downloader._is_audio_mode와 동일
+LOSSLESS_EXTS = ('flac', 'wav', 'alac', 'aiff')
+BANDWIDTH_SAMPLE_BYTES = 4 * 1024 ** 2  # 대역폭 측정용 범위 요청 크기
+
+# 후처리 CPU 시간 추정표 (미디어 1초당 코어-초, 일반적인 데스크톱 1코어 기준의 대략값)
+CPU_COST = {
+    'merge': 0.002,          # 스트림 복사 병합 (재인코딩 없음)
+    'audio_encode': 0.02,    # 오디오 디코드 + 인코딩
+    'loudnorm_measure': 0.015,  # 음량 정규화 1패스 측정 (디코드 + ebur128)
+    'enhance': 0.01,         # DSP 필터
+}
+# 비디오 재인코딩 (1080p 기준, 해상도에 비례)
+VIDEO_ENCODE_COST = {'libx264': 0.6, 'h264': 0.6, 'libx265': 1.5, 'h265': 1.5, 'hevc': 1.5,
+                     'vp9': 2.0, 'av1': 4.0}
+REFERENCE_PIXELS = 1920 * 1080
+
+SIZE_SUFFIXES = {'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+
+def parse_bandwidth(text: str) -> int:
+    """'12M', '800k', '1500000' 형식의 대역폭(bytes/s)을 정수로 변환합니다."""
+    value = str(text).strip().lower().rstrip('b/s')
+    unit = SIZE_SUFFIXES.get(value[-1:], 1)
+    return int(float(value.rstrip('kmg')) * unit)
+
+
+class BatchPlanner:
+    """
+    배치 실행 전 비용 추정 (dry-run)
+    입력을 펼쳐 항목마다 MetadataAnalyzer로 분석하고, Downloader와 같은 포맷 선택 규칙으로
+    다운로드 크기 / 결과물 크기 / 전송 시간 / 후처리 CPU 시간과 필요한 디스크 공간을 계산합니다.
+    아무것도 다운로드하지 않습니다. (대역폭 측정 시 첫 항목의 앞부분 몇 MB만 받음)
+    """
+
+    def __init__(self, analyzer: MetadataAnalyzer, config, max_workers: int = 4):
+        self.analyzer = analyzer
+        self.config = config
+        self.max_workers = max_workers
+
+    def plan(self, tasks: list, options: dict, bandwidth: int = None) -> dict:
+        entries = []
+        for group in tasks:
+            for url in group['urls']:
+                entries.extend(e['url'] for e in expand_collection(self.analyzer, url))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            metas = list(executor.map(self.analyzer.get_video_info, entries))
+
+        bandwidth_source = 'configured'
+        bandwidth = bandwidth or self.config.get('plan_bandwidth') or None
+        if not bandwidth:
+            first = next((url for url, meta in zip(entries, metas) if meta), None)
+            bandwidth = self.measure_bandwidth(first, options) if first else None
+            bandwidth_source = 'measured' if bandwidth else 'unknown'
+
+        items = [self._plan_item(url, meta, options, bandwidth) for url, meta in zip(entries, metas)]
+        return {
+            'options': {k: v for k, v in options.items() if v},
+            'bandwidth_bps': bandwidth,
+            'bandwidth_source': bandwidth_source,
+            'items': items,
+            'totals': self._totals(items),
+        }
+
+    def measure_bandwidth(self, url: str, options: dict) -> int | None:
+        """선택될 포맷의 앞부분을 범위 요청으로 받아 실제 전송 속도(bytes/s)를 측정합니다."""
+        if options.get('ext') in AUDIO_MODE_EXTS:
+            fmt = 'bestaudio/best'
+        else:
+            fmt = f"bestvideo[height<={options['height']}]/best" if options.get('height') else 'bestvideo/best'
+        try:
+            with self.analyzer.ydl_pool.acquire(dict(self.analyzer.ydl_opts, format=fmt)) as ydl:
+                info = ydl.extract_info(url, download=False)
+                f = (info.get('requested_formats') or [info])[0]
+                headers = dict(f.get('http_headers') or {}, Range=f"bytes=0-{BANDWIDTH_SAMPLE_BYTES - 1}")
+                start = time.perf_counter()
+                received = 0
+                with ydl.urlopen(Request(f['url'], headers=headers)) as resp:
+                    while received < BANDWIDTH_SAMPLE_BYTES and (chunk := resp.read(256 * 1024)):
+                        received += len(chunk)
+                elapsed = time.perf_counter() - start
+            return int(received / elapsed) if received and elapsed > 0 else None
+        except Exception:
+            return None
+
+    # --- 항목별 추정 ---
+    def _plan_item(self, url: str, meta: VideoMeta | None, options: dict, bandwidth: int | None) -> dict:
+        if not meta:
+            return {'url': url, 'status': 'unavailable'}
+        video, audio = self.analyzer.select_formats(meta.formats, options)
+        duration = self.analyzer.clip_duration(options, meta.duration) or 0
+        download = self.analyzer.estimate_download_size(meta.formats, options, meta.duration)
+        # 멀티 출력은 결과물마다 크기/CPU를 더함 (디코드는 한 번이라 CPU는 약간 과대 추정)
+        outputs = options.get('renditions') or [options]
+        sections = {key: options.get(key) for key in ('time_ranges', 'chapters')}
+        return {
+            'url': url,
+            'status': 'ok',
+            'title': meta.title,
+            'duration': duration,
+            'video_format': video.format_id if video else None,
+            'resolution': video.res if video else None,
+            'audio_format': audio.format_id if audio else None,
+            'download_bytes': download,
+            'output_bytes': sum(self._estimate_output_bytes(download, duration, dict(r, **sections)) for r in outputs),
+            'transfer_seconds': round(download / bandwidth, 1) if bandwidth and download else None,
+            'cpu_seconds': round(sum(self._estimate_cpu_seconds(video, duration, dict(r, **sections)) for r in outputs), 1),
+        }
+
+    @staticmethod
+    def _estimate_output_bytes(download: int, duration: int, options: dict) -> int:
+        ext = options.get('ext')
+        if ext not in AUDIO_MODE_EXTS or not duration:
+            return download  # 비디오는 스트림 복사 병합 (재인코딩 시에도 비슷한 크기로 가정)
+        if ext in LOSSLESS_EXTS:
+            rate = options.get('sample_rate') or (48000 if options.get('loudnorm') else 44100)
+            pcm = rate * 2 * (options.get('bit_depth') or 16) // 8 * duration
+            return pcm if ext == 'wav' else int(pcm * 0.6)  # FLAC은 PCM의 약 60%
+        return int((options.get('audio_bitrate') or 192) * 1000 / 8 * duration)
+
+    @staticmethod
+    def _estimate_cpu_seconds(video, duration: int, options: dict) -> float:
+        audio_mode = options.get('ext') in AUDIO_MODE_EXTS
+        post = options.get('use_enhance') or options.get('audio_channels') or options.get('use_upscale') or options.get('loudnorm')
+        post = post or options.get('time_ranges') or options.get('chapters')  # 구간 다운로드는 정밀 컷 재인코딩 패스
+        cost = 0.0
+        if audio_mode:
+            cost += CPU_COST['audio_encode']
+        else:
+            cost += CPU_COST['merge']
+            if post:
+                # 심화 후처리 패스는 비디오를 다시 인코딩 (코덱 미지정 시 FFmpeg 기본값 libx264)
+                codec = options.get('video_codec') or 'libx264'
+                height = options['height'] if options.get('use_upscale') and options.get('height') else (video.height if video else 1080)
+                cost += VIDEO_ENCODE_COST.get(codec, 1.0) * (height * height * 16 / 9) / REFERENCE_PIXELS
+                cost += CPU_COST['audio_encode']
+        if options.get('loudnorm'):
+            cost += CPU_COST['loudnorm_measure']
+        if options.get('use_enhance'):
+            cost += CPU_COST['enhance']
+        return cost * duration
+
+    def _totals(self, items: list) -> dict:
+        ok = [i for i in items if i['status'] == 'ok']
+        output_dir = self.config.get('default_output_dir')
+        download = sum(i['download_bytes'] for i in ok)
+        output = sum(i['output_bytes'] for i in ok)
+        # 동시 작업 수만큼 원본 + 결과물이 잠시 공존하므로 가장 큰 원본들을 여유분으로 더함
+        largest = sorted((i['download_bytes'] for i in ok), reverse=True)[:self.config.get('max_workers') or 1]
+        required = output + sum(largest)
+        free = get_free_space(output_dir)
+        transfer = [i['transfer_seconds'] for i in ok if i['transfer_seconds'] is not None]
+        return {
+            'items': len(items),
+            'resolved': len(ok),
+            'unavailable': len(items) - len(ok),
+            'duration': sum(i['duration'] for i in ok),
+            'download_bytes': download,
+            'output_bytes': output,
+            'transfer_seconds': round(sum(transfer), 1) if transfer else None,
+            'cpu_seconds': round(sum(i['cpu_seconds'] for i in ok), 1),
+            'output_dir': os.path.abspath(output_dir),
+            'required_disk_bytes': required,
+            'free_disk_bytes': free,
+            'fits': free is None or required <= free,
+        }
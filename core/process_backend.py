@@ -0,0 +1,130 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.config import DEFAULT_CONFIG
+from core.job_control import JobCancelled
+
+# 자식 프로세스 전역 상태 (프로세스마다 자신만의 Downloader/YoutubeDL 풀을 소유)
+_runner = None
+_events = None
+_flags = None
+
+# 자식 → 부모 진행 이벤트 / 제어 상태 확인 주기 (IPC 왕복을 줄이기 위한 제한)
+FLAG_POLL_INTERVAL = 0.5
+
+
+def build_default_runner(config: dict):
+    from core.job_runner import JobRunner
+    return JobRunner.from_config(config)
+
+
+def _init_worker(config: dict, events, flags, runner_factory):
+    global _runner, _events, _flags
+    _runner = runner_factory(config)
+    _events = events
+    _flags = flags
+
+
+def _run_job(job_id: int, item: dict, options: dict) -> tuple:
+    """(결과 리스트, 이 작업 동안의 통계 차이)를 반환합니다. 통계는 부모의 배치 요약에 합산됩니다."""
+    last = {'percent': -1, 'flag_check': 0.0}
+
+    def cb(d):
+        # 진행률은 1% 단위 변화나 상태 변화만 부모로 전송
+        percent = int(d.get('percent') or 0)
+        if d['status'] != 'downloading' or percent != last['percent']:
+            last['percent'] = percent
+            _events.put((job_id, {k: d.get(k) for k in ('status', 'percent', 'speed', 'filename')}))
+
+        # 일시정지/취소 상태 확인 (협조적 중단)
+        now = time.monotonic()
+        if now - last['flag_check'] < FLAG_POLL_INTERVAL:
+            return
+        last['flag_check'] = now
+        while True:
+            state = _flags.get(job_id)
+            if state == 'cancelled':
+                raise JobCancelled()
+            if state != 'paused':
+                return
+            time.sleep(FLAG_POLL_INTERVAL)
+
+    counters = getattr(_runner, 'counters', None)  # 통계가 없는 러너(벤치마크용 가짜 러너 등)도 허용
+    before = counters() if counters else None
+    results = _runner.run(item, options, cb, job_id)
+    if not counters:
+        return results, None
+    from core.job_runner import counters_delta
+    return results, counters_delta(before, counters())
+
+
+class ProcessBackend:
+    """
+    프로세스 기반 작업 실행기
+    yt-dlp 추출(JSON 파싱, 서명 해독, 포맷 정렬)은 순수 파이썬 연산이라 스레드로는 GIL 경합이 생기므로,
+    워커 프로세스마다 Downloader를 하나씩 두고 작업을 나눠 실행합니다.
+    진행 이벤트는 큐를 통해 부모의 진행률 화면으로 전달됩니다.
+    """
+
+    def __init__(self, config, max_workers: int, runner_factory=build_default_runner):
+        config_snapshot = dict(DEFAULT_CONFIG)
+        config_snapshot.update(getattr(config, 'config', config))
+
+        self._manager = mp.Manager()
+        self._flags = self._manager.dict()
+        self._events = mp.Queue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(config_snapshot, self._events, self._flags, runner_factory),
+        )
+        self._drain_thread = None
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.deltas = []  # 작업별 자식 통계 차이 (collect_counters로 부모 러너에 합산)
+
+    def run(self, job_id: int, item: dict, options: dict) -> list:
+        """작업 하나를 워커 프로세스에서 실행하고 결과를 기다립니다. (부모의 디스패처 스레드에서 호출)"""
+        results, delta = self._pool.submit(_run_job, job_id, item, options).result()
+        if delta:
+            with self._stats_lock:
+                self.deltas.append(delta)
+        return results
+
+    def collect_counters(self, runner):
+        """자식 프로세스에서 모은 통계를 부모 runner의 구성 요소 통계에 더합니다. (배치 요약 출력 전)"""
+        with self._stats_lock:
+            deltas, self.deltas = self.deltas, []
+        for delta in deltas:
+            runner.add_counters(delta)
+
+    def start_events(self, handler):
+        """자식 프로세스의 진행 이벤트를 handler(job_id, d)로 전달하는 스레드를 시작합니다."""
+        def drain():
+            while not self._stop.is_set():
+                try:
+                    job_id, d = self._events.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                handler(job_id, d)
+
+        self._drain_thread = threading.Thread(target=drain, daemon=True)
+        self._drain_thread.start()
+
+    def sync_flags(self, snapshot: list):
+        """JobController 상태(일시정지/취소)를 자식 프로세스가 읽는 공유 딕셔너리에 반영합니다."""
+        for job in snapshot:
+            if job['state'] in ('paused', 'cancelled'):
+                self._flags[job['id']] = job['state']
+            else:
+                self._flags.pop(job['id'], None)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+        self._stop.set()
+        if self._drain_thread:
+            self._drain_thread.join(timeout=1)
+        self._manager.shutdown()
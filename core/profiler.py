@@ -0,0 +1,270 @@
+import gc
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from ui.logger import Logger
+from utils.storage import format_bytes
+
+PROFILE_ENV = 'YTDL_PROFILE'  # 명령줄 --profile 값 (설정의 profile_mode보다 우선)
+PROFILE_MODES = ('light', 'full')
+
+# 모드별 기본값: light는 운영 중 켜 두어도 되는 수준 (tracemalloc 없음, 드문 샘플링)
+MODE_DEFAULTS = {
+    'light': {'interval': 30.0, 'snapshot_every': 0},
+    'full': {'interval': 2.0, 'snapshot_every': 30},  # 샘플 30회마다 tracemalloc 스냅샷
+}
+TRACE_FRAMES = 5  # 할당 위치 추적 깊이 (깊을수록 정확하지만 tracemalloc 메모리 사용 증가)
+MAX_TIMELINE = 2000  # 시계열이 길어지면 절반으로 솎아 내 메모리 사용을 제한
+TOP_SITES = 15
+
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_rss() -> int | None:
+    """현재 프로세스의 RSS(bytes). 지원하지 않는 플랫폼이면 None"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_thread_cpu(native_id: int) -> float | None:
+    """스레드 하나의 누적 CPU 시간(초, user + system). /proc이 없으면 None"""
+    try:
+        with open(f'/proc/self/task/{native_id}/stat', 'r') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _thread_label(thread: threading.Thread) -> str:
+    """작업 단계가 없는 스레드는 이름 접두어로 묶음 (verify_0, verify_1 → (verify))"""
+    return "(" + re.sub(r'[_-]\d+$', '', thread.name) + ")"
+
+
+def _package_of(filename: str) -> str:
+    """할당 위치 파일을 패키지 단위로 묶음 (yt_dlp, rich, concurrent, core ...)"""
+    parts = filename.replace('\\', '/').split('/')
+    for marker in ('site-packages', 'dist-packages'):
+        if marker in parts:
+            return parts[parts.index(marker) + 1]
+    if os.path.abspath(filename).startswith(_PROJECT_ROOT + os.sep):
+        return os.path.relpath(filename, _PROJECT_ROOT).replace('\\', '/').split('/')[0]
+    return f"stdlib:{os.path.splitext(parts[-1])[0] if parts[-1] != '__init__.py' else parts[-2]}"
+
+
+class BatchProfiler:
+    """
+    긴 배치용 메모리 / CPU 프로파일러 (명시적으로 켠 경우에만 동작)
+    백그라운드 스레드가 주기적으로 RSS, 프로세스/자식 프로세스 CPU, 작업 단계별 스레드 CPU를 기록하고,
+    full 모드에서는 tracemalloc 스냅샷으로 할당 위치별 증가량을 추적합니다.
+    watch()로 등록한 값(대기 futures 수, 진행 표시 작업 수 등)도 함께 기록해 메모리 증가 원인을 좁힐 수 있습니다.
+    """
+
+    def __init__(self, mode: str = 'light', interval: float = None, report_dir: str = 'profiles'):
+        self.mode = mode
+        self.interval = interval or MODE_DEFAULTS[mode]['interval']
+        self.snapshot_every = MODE_DEFAULTS[mode]['snapshot_every']
+        self.report_dir = report_dir
+        self.timeline = []
+        self.stage_cpu = {}      # 단계 → CPU 초 (/proc 지원 시)
+        self.stage_samples = {}  # 단계 → 샘플 시점에 그 단계에 있던 스레드 수 누적 (모든 플랫폼)
+        self._watches = {}
+        self._thread_cpu = {}
+        self._baseline = None
+        self._latest = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+        self._started_at = None
+        self._cpu_start = None
+
+    @classmethod
+    def from_config(cls, config):
+        """--profile(환경변수) 또는 설정의 profile_mode가 켜져 있을 때만 프로파일러를 만듭니다."""
+        mode = os.environ.get(PROFILE_ENV) or config.get('profile_mode')
+        if mode not in PROFILE_MODES:
+            return None
+        return cls(mode, config.get('profile_interval') or None, config.get('profile_dir') or 'profiles')
+
+    def watch(self, name: str, fn):
+        """샘플마다 기록할 값 (예: lambda: len(futures)); 예외가 나면 None으로 기록"""
+        self._watches[name] = fn
+
+    def start(self):
+        self._started = time.monotonic()
+        self._started_at = datetime.now()
+        self._cpu_start = os.times()
+        if self.mode == 'full' and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        self._sample()
+        if self.mode == 'full':
+            self._baseline = self._take_snapshot()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._thread.start()
+        Logger.info(f"프로파일링 시작: {self.mode} 모드, {self.interval:g}초 간격")
+
+    def stop(self) -> dict:
+        """샘플링을 멈추고 보고서를 저장한 뒤 요약을 반환합니다."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 5)
+        self._sample()
+        if self.mode == 'full':
+            self._latest = self._take_snapshot()
+        report = self._build_report()
+        if tracemalloc.is_tracing() and self.mode == 'full':
+            tracemalloc.stop()
+        self._baseline = self._latest = None
+        report['report_path'] = self._write_report(report)
+        return report
+
+    # --- 샘플링 ---
+    def _run(self):
+        count = 0
+        while not self._stop.wait(self.interval):
+            count += 1
+            try:
+                self._sample()
+                if self.snapshot_every and count % self.snapshot_every == 0:
+                    self._latest = self._take_snapshot()
+            except Exception as e:
+                Logger.debug(f"프로파일 샘플 실패: {e}")
+
+    def _sample(self):
+        stages = Logger.thread_stages()
+        alive = {}
+        for thread in threading.enumerate():
+            if thread is self._thread:
+                continue
+            label = stages.get(thread.ident) or _thread_label(thread)
+            self.stage_samples[label] = self.stage_samples.get(label, 0) + 1
+            cpu = read_thread_cpu(thread.native_id) if thread.native_id else None
+            if cpu is None:
+                continue
+            # 시작 시점에 이미 있던 스레드는 그때까지의 CPU를 제외, 도중에 생긴 스레드는 0부터
+            previous = self._thread_cpu.get(thread.native_id, 0.0 if self.timeline else cpu)
+            self.stage_cpu[label] = self.stage_cpu.get(label, 0.0) + max(0.0, cpu - previous)
+            alive[thread.native_id] = cpu
+        self._thread_cpu = alive
+
+        times = os.times()
+        point = {
+            't': round(time.monotonic() - self._started, 1),
+            'rss': read_rss(),
+            'cpu': round(times.user + times.system - self._cpu_start.user - self._cpu_start.system, 2),
+            'children_cpu': round(times.children_user + times.children_system
+                                  - self._cpu_start.children_user - self._cpu_start.children_system, 2),
+            'threads': threading.active_count(),
+            'gc': list(gc.get_count()),
+        }
+        if tracemalloc.is_tracing():
+            point['traced'], point['traced_peak'] = tracemalloc.get_traced_memory()
+        for name, fn in self._watches.items():
+            try:
+                point[name] = fn()
+            except Exception:
+                point[name] = None
+        self.timeline.append(point)
+        if len(self.timeline) > MAX_TIMELINE:
+            self.timeline = self.timeline[::2]
+
+    def _take_snapshot(self):
+        if not tracemalloc.is_tracing():
+            return None
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+    # --- 보고서 ---
+    def _build_report(self) -> dict:
+        first, last = self.timeline[0], self.timeline[-1]
+        rss = [p['rss'] for p in self.timeline if p['rss'] is not None]
+        hours = max(last['t'], 1) / 3600
+        report = {
+            'mode': self.mode,
+            'interval': self.interval,
+            'started': self._started_at.isoformat(timespec='seconds'),
+            'duration': last['t'],
+            'rss_start': rss[0] if rss else None,
+            'rss_end': rss[-1] if rss else None,
+            'rss_peak': max(rss) if rss else None,
+            'rss_growth_per_hour': int((rss[-1] - rss[0]) / hours) if rss else None,
+            'cpu_seconds': last['cpu'],
+            'children_cpu_seconds': last['children_cpu'],  # FFmpeg 등 자식 프로세스
+            'stage_cpu': {k: round(v, 2) for k, v in sorted(self.stage_cpu.items(), key=lambda kv: -kv[1])},
+            'stage_samples': dict(sorted(self.stage_samples.items(), key=lambda kv: -kv[1])),
+            'watches': {name: {'start': first.get(name), 'end': last.get(name),
+                               'max': max((p.get(name) for p in self.timeline if p.get(name) is not None), default=None)}
+                        for name in self._watches},
+            'timeline': self.timeline,
+        }
+        if self._latest is not None:
+            report['top_sites'] = [
+                {'site': str(stat.traceback[0]), 'size': stat.size, 'count': stat.count,
+                 'traceback': [str(frame) for frame in stat.traceback]}
+                for stat in self._latest.statistics('traceback')[:TOP_SITES]
+            ]
+            report['packages'] = self._group_by_package(self._latest)
+            if self._baseline is not None:
+                diff = self._latest.compare_to(self._baseline, 'lineno')
+                report['growth_sites'] = [
+                    {'site': str(stat.traceback[0]), 'size_diff': stat.size_diff, 'size': stat.size, 'count_diff': stat.count_diff}
+                    for stat in sorted(diff, key=lambda s: -s.size_diff)[:TOP_SITES] if stat.size_diff > 0
+                ]
+                baseline = self._group_by_package(self._baseline)
+                report['package_growth'] = {pkg: size - baseline.get(pkg, 0) for pkg, size in report['packages'].items()}
+        return report
+
+    @staticmethod
+    def _group_by_package(snapshot) -> dict:
+        totals = {}
+        for stat in snapshot.statistics('filename'):
+            pkg = _package_of(stat.traceback[0].filename)
+            totals[pkg] = totals.get(pkg, 0) + stat.size
+        return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+    def _write_report(self, report: dict) -> str | None:
+        os.makedirs(self.report_dir, exist_ok=True)
+        path = os.path.join(self.report_dir, f"profile_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.json")
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            return path
+        except OSError as e:
+            Logger.warning(f"프로파일 보고서 저장 실패: {e}")
+            return None
+
+
+def log_profile_summary(report: dict):
+    """프로파일 보고서의 핵심 지표를 로그로 요약합니다."""
+    def size(value):
+        return format_bytes(value) if value is not None else '알 수 없음'
+
+    Logger.info(f"[Profile] {report['duration']:.0f}초, RSS {size(report['rss_start'])} → {size(report['rss_end'])} "
+                f"(최대 {size(report['rss_peak'])}, 시간당 {size(report['rss_growth_per_hour'])}), "
+                f"CPU {report['cpu_seconds']:.1f}초 + 자식 프로세스 {report['children_cpu_seconds']:.1f}초")
+    if report['stage_cpu']:
+        Logger.info("[Profile] 단계별 CPU: " + ", ".join(f"{k} {v:.1f}s" for k, v in list(report['stage_cpu'].items())[:8]))
+    else:
+        Logger.info("[Profile] 단계별 샘플: " + ", ".join(f"{k} {v}" for k, v in list(report['stage_samples'].items())[:8]))
+    for name, values in report['watches'].items():
+        Logger.info(f"[Profile] {name}: {values['start']} → {values['end']} (최대 {values['max']})")
+    for pkg, diff in list(report.get('package_growth', {}).items())[:5]:
+        Logger.info(f"[Profile] 할당 증가 {pkg}: {'+' if diff >= 0 else ''}{size(diff)}")
+    for site in report.get('growth_sites', [])[:5]:
+        Logger.info(f"[Profile] 증가 위치 {site['site']}: +{size(site['size_diff'])} ({site['count_diff']:+d}개)")
+    if report.get('report_path'):
+        Logger.info(f"[Profile] 보고서: {report['report_path']}")
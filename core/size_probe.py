@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from core.job_control import PENDING, JobController
+from core.metadata import MetadataAnalyzer
+
+
+class SizeProber:
+    """
+    SJF 스케줄링용 예상 크기 수집기
+    대기 중인 작업의 메타데이터를 백그라운드에서 분석해 JobController에 예상 다운로드 크기를 채웁니다.
+    배치 시작을 늦추지 않도록 실행은 바로 시작하고, 크기를 아직 모르는 작업은 중앙값으로 취급됩니다.
+    """
+
+    def __init__(self, analyzer: MetadataAnalyzer, controller: JobController, max_workers: int = 2):
+        self.analyzer = analyzer
+        self.controller = controller
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='size-probe')
+
+    def probe(self, job_id: int, item: dict, options: dict):
+        if item.get('expected_bytes'):
+            return
+        self._executor.submit(self._probe_one, job_id, item, options)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _probe_one(self, job_id: int, item: dict, options: dict):
+        job = self.controller.jobs.get(job_id)
+        if not job or job['state'] != PENDING:
+            return  # 이미 실행 중이거나 끝난 작업은 분석할 필요 없음
+        meta = self.analyzer.get_video_info(item['url'])
+        if meta:
+            opts = dict(options, **(item.get('flags') or {}))
+            self.controller.set_expected_bytes(job_id, self.analyzer.estimate_download_size(meta.formats, opts, meta.duration))
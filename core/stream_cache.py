@@ -0,0 +1,226 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+from ui.logger import Logger
+from utils.storage import file_lock
+
+INDEX_NAME = 'index.json'
+
+# 캐시된 오디오를 대체 스트림으로 인정하는 최소 비트레이트 비율 (요청 포맷 대비)
+AUDIO_EQUIV_RATIO = 0.75
+
+
+class StreamCache:
+    """
+    다운로드한 원본 오디오/비디오 스트림을 (영상 ID, 포맷 ID) 키로 보관하는 용량 제한 LRU 캐시
+    같은 영상을 다른 형식(mp3, flac 등)으로 다시 받을 때 재다운로드 없이 변환만 수행할 수 있게 합니다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'evicted_bytes': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(video_id: str, format_id: str) -> str:
+        return f"{video_id}:{format_id}"
+
+    # --- 조회 ---
+    def get(self, video_id: str, format_id: str) -> str | None:
+        path = self._touch(video_id, format_id)
+        with self._lock:
+            self.stats['hits' if path else 'misses'] += 1
+        return path
+
+    def _touch(self, video_id: str, format_id: str) -> str | None:
+        """캐시 파일 경로를 반환하고 사용 시각을 갱신합니다. (통계 집계 없음)"""
+        key = self.make_key(video_id, format_id)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and os.path.isfile(entry['path']):
+                entry['last_used'] = time.time()
+                self._save()
+                return entry['path']
+            if entry:
+                del self.entries[key]  # 외부에서 삭제된 파일
+            return None
+
+    def cached_format_ids(self, video_id: str) -> set:
+        prefix = f"{video_id}:"
+        with self._lock:
+            return {k[len(prefix):] for k in self.entries if k.startswith(prefix)}
+
+    def resolve(self, info: dict) -> list | None:
+        """
+        yt-dlp가 선택한 포맷(requested_formats)이 모두 캐시에 있으면 스트림 경로 리스트를 반환합니다.
+        정확히 같은 포맷이 없으면 동급 포맷(같은 해상도/더 높은 fps, 비슷한 비트레이트의 오디오)으로 대체합니다.
+        """
+        video_id = info.get('id')
+        if not video_id:
+            return None
+        with self._lock:
+            self._merge_disk()  # 다른 프로세스(프로세스 워커/데몬)가 저장한 스트림도 보이도록
+        paths = self._resolve_paths(video_id, info)
+        with self._lock:
+            self.stats['hits' if paths else 'misses'] += 1  # resolve 한 번에 한 번만 집계
+        return paths
+
+    def _resolve_paths(self, video_id: str, info: dict) -> list | None:
+        cached_ids = self.cached_format_ids(video_id)
+        if not cached_ids:
+            return None
+
+        available = {f.get('format_id'): f for f in info.get('formats') or []}
+        format_ids = []
+        for req in info.get('requested_formats') or [info]:
+            format_id = req.get('format_id')
+            if format_id not in cached_ids:
+                format_id = self._find_equivalent(req, cached_ids, available)
+            if not format_id:
+                return None
+            format_ids.append(format_id)
+
+        paths = [self._touch(video_id, format_id) for format_id in format_ids]
+        return paths if all(paths) else None
+
+    # --- 저장 / 정리 ---
+    def store(self, video_id: str, format_id: str, src_path: str):
+        """완료된 스트림 파일을 캐시에 등록합니다. (같은 디스크면 하드링크, 아니면 복사)"""
+        if not video_id or not format_id or not os.path.isfile(src_path):
+            return
+        key = self.make_key(video_id, format_id)
+        ext = os.path.splitext(src_path)[1]
+        dest = os.path.join(self.cache_dir, f"{video_id}.f{format_id}{ext}")
+
+        with self._lock:
+            if key in self.entries and os.path.isfile(self.entries[key]['path']):
+                self.entries[key]['last_used'] = time.time()
+                self._save()
+                return
+        try:
+            if os.path.exists(dest): os.remove(dest)
+            try:
+                os.link(src_path, dest)
+            except OSError:
+                shutil.copyfile(src_path, dest)
+        except OSError as e:
+            Logger.warning(f"스트림 캐시 저장 실패: {e}")
+            return
+
+        with self._lock:
+            self.entries[key] = {'path': dest, 'size': os.path.getsize(dest), 'last_used': time.time()}
+            self.stats['stores'] += 1
+            self._save(evict=True)
+
+    def discard(self, video_id: str):
+        """손상이 의심되는 영상의 캐시 스트림을 모두 지웁니다. (다음 시도는 새로 다운로드)"""
+        prefix = f"{video_id}:"
+        with self._lock:
+            for key in [k for k in self.entries if k.startswith(prefix)]:
+                entry = self.entries.pop(key)
+                try:
+                    os.remove(entry['path'])
+                except OSError:
+                    pass
+            self._save()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(e['size'] for e in self.entries.values())
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            self._merge_disk()  # 사용량은 다른 프로세스(프로세스 백엔드 워커)가 저장한 항목까지 포함
+        stats = dict(self.stats)
+        stats['bytes'] = self.total_bytes()
+        stats['max_bytes'] = self.max_bytes
+        stats['entries'] = len(self.entries)
+        return stats
+
+    # --- 내부 헬퍼 ---
+    def _evict(self):
+        """용량 예산을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (lock 보유 상태에서 호출)"""
+        total = sum(e['size'] for e in self.entries.values())
+        for key, entry in sorted(self.entries.items(), key=lambda kv: kv[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry['path'])
+            except OSError:
+                pass
+            total -= entry['size']
+            del self.entries[key]
+            self.stats['evictions'] += 1
+            self.stats['evicted_bytes'] += entry['size']
+
+    @staticmethod
+    def _find_equivalent(req: dict, cached_ids: set, available: dict) -> str | None:
+        # 오디오/비디오 구성이 같은 포맷만 대체 (통합 포맷 요청에 비디오 전용 스트림을 쓰면 소리가 빠짐)
+        has_video = req.get('vcodec') != 'none'
+        has_audio = req.get('acodec') != 'none'
+        for format_id in cached_ids:
+            f = available.get(format_id)
+            if not f or (f.get('vcodec') != 'none') != has_video or (f.get('acodec') != 'none') != has_audio:
+                continue
+            if not has_video:
+                if (f.get('abr') or 0) >= (req.get('abr') or 0) * AUDIO_EQUIV_RATIO:
+                    return format_id
+            elif f.get('height') == req.get('height') and (f.get('fps') or 0) >= (req.get('fps') or 0):
+                return format_id
+        return None
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, INDEX_NAME)
+
+    def _read_index(self) -> dict:
+        path = self._index_path()
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            Logger.warning(f"스트림 캐시 색인 로드 중 오류: {e}")
+            return {}
+
+    def _load(self):
+        self.entries = self._read_index()
+
+    def _merge_disk(self):
+        """
+        디스크 색인과 병합합니다. (lock 보유 상태에서 호출)
+        다른 프로세스가 저장한 항목은 추가하고, 사용 시각은 더 최근 값을 쓰며, 파일이 사라진 항목(다른 프로세스가 정리)은 뺍니다.
+        """
+        for key, entry in self._read_index().items():
+            mine = self.entries.get(key)
+            if mine is None:
+                self.entries[key] = entry
+            elif entry.get('last_used', 0) > mine['last_used']:
+                mine['last_used'] = entry['last_used']
+        for key in [k for k, e in self.entries.items() if not os.path.isfile(e['path'])]:
+            del self.entries[key]
+
+    def _save(self, evict: bool = False):
+        """
+        파일 잠금 안에서 디스크 색인을 다시 읽어 병합한 뒤 원자적으로 교체합니다. (lock 보유 상태에서 호출)
+        여러 프로세스가 같은 캐시 폴더를 써도 서로의 기록을 덮어쓰지 않습니다.
+        """
+        path = self._index_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with file_lock(f"{path}.lock"):
+                self._merge_disk()
+                if evict:
+                    self._evict()  # 모든 프로세스의 항목을 합친 뒤 용량 예산 적용
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, indent=2)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            Logger.warning(f"스트림 캐시 색인 저장 실패: {e}")
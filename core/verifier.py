@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from core.ffmpeg_caps import AUDIO_EXT_CODECS
+from ui.logger import Logger
+from utils.storage import file_digest
+
+# 길이 허용 오차: 예상 길이 대비 이 비율 또는 DURATION_SLACK초 중 큰 값보다 짧으면 잘린 파일로 판단
+DURATION_TOLERANCE = 0.02
+DURATION_SLACK = 2.0
+TAIL_SECONDS = 10  # 마지막 패킷 확인을 위해 읽는 끝부분 길이
+
+
+class OutputVerifier:
+    """
+    결과물 무결성 검증기 (작은 전용 스레드 풀)
+    내용 해시(최종 이동 중 계산한 값 재사용)와 ffprobe 점검(길이 / 스트림 구성 / 코덱 / 끝부분 패킷)을 수행합니다.
+    ffprobe가 없으면 해시와 파일 크기만 확인합니다.
+    """
+
+    def __init__(self, ffprobe_path: str = None, max_workers: int = 2):
+        self.ffprobe_path = ffprobe_path
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='verify')
+        self.stats = {'verified': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """설정에서 검증을 끈 경우 None"""
+        if not config.get('verify_outputs'):
+            return None
+        return cls(max_workers=config.get('verify_workers') or 2)
+
+    def submit(self, path: str, expect: dict) -> Future:
+        """
+        검증을 예약하고 결과를 돌려줄 Future를 반환합니다.
+        expect: {'duration': 초 또는 None, 'video': bool, 'audio': bool}
+        결과: {'ok', 'hash', 'duration', 'streams', 'problem'}
+        """
+        return self._executor.submit(self.verify, path, expect)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def verify(self, path: str, expect: dict) -> dict:
+        result = {'ok': False, 'hash': None, 'duration': None, 'streams': None, 'problem': None}
+        if not os.path.isfile(path) or os.path.getsize(path) == 0:
+            result['problem'] = "결과물이 없거나 비어 있습니다."
+            return self._count(result)
+        result['hash'] = file_digest(path)
+        if self.ffprobe_path:
+            result['problem'] = self._probe(path, expect, result)
+        result['ok'] = result['problem'] is None
+        return self._count(result)
+
+    def _count(self, result: dict) -> dict:
+        with self._lock:
+            self.stats['verified' if result['ok'] else 'failed'] += 1
+        return result
+
+    # --- ffprobe 점검 ---
+    def _probe(self, path: str, expect: dict, result: dict) -> str | None:
+        expected = expect.get('duration')
+        cmd = [self.ffprobe_path, '-v', 'error', '-of', 'json',
+               '-show_entries', 'format=duration:stream=codec_type,codec_name:packet=pts_time']
+        # 끝부분 패킷만 읽어 마지막 시각 확인 (예상 길이를 모르면 첫 패킷만)
+        cmd += ['-read_intervals', f"{max(0.0, expected - TAIL_SECONDS)}%" if expected else '%+#1', path]
+        try:
+            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=120)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            Logger.warning(f"ffprobe 실행 실패: {os.path.basename(path)} ({e})")
+            return None  # 검사 도구 문제는 결과물 결함으로 보지 않음
+        if proc.returncode != 0:
+            return f"ffprobe가 파일을 읽지 못했습니다: {proc.stderr.decode('utf-8', errors='replace').strip()[:200]}"
+        try:
+            data = json.loads(proc.stdout or b'{}')
+        except ValueError:
+            return "ffprobe 출력 해석 실패"
+
+        streams = data.get('streams') or []
+        result['streams'] = '+'.join(s.get('codec_name') or '?' for s in streams)
+        try:
+            result['duration'] = round(float(data.get('format', {}).get('duration')), 2)
+        except (TypeError, ValueError):
+            pass
+
+        kinds = {s.get('codec_type') for s in streams}
+        if not streams:
+            return "스트림이 없습니다."
+        if expect.get('video') and 'video' not in kinds:
+            return "비디오 스트림이 없습니다."
+        if expect.get('audio') and 'audio' not in kinds:
+            return "오디오 스트림이 없습니다."
+        ext = os.path.splitext(path)[1][1:].lower()
+        codec = AUDIO_EXT_CODECS.get(ext)
+        if codec and not expect.get('video') and not any((s.get('codec_name') or '').startswith(codec) for s in streams):
+            return f"{ext} 파일에 {codec} 오디오가 없습니다. ({result['streams']})"
+
+        if expected:
+            minimum = expected - max(DURATION_SLACK, expected * DURATION_TOLERANCE)
+            if result['duration'] is not None and result['duration'] < minimum:
+                return f"길이가 짧습니다: {result['duration']}초 / 예상 {expected}초"
+            # 헤더 길이는 정상이어도 데이터가 중간에 끊긴 경우 (끝부분 패킷이 없음)
+            last = max((float(p['pts_time']) for p in data.get('packets') or [] if p.get('pts_time')), default=None)
+            if last is None or last < minimum:
+                return f"끝부분 데이터가 없습니다. (마지막 패킷 {last}초 / 예상 {expected}초)"
+        return None
@@ -0,0 +1,121 @@
+import os
+import socket
+import threading
+
+from core.config import ConfigManager
+from core.job_control import JobCancelled
+from core.job_runner import JobRunner
+from core.job_store import JobStore
+from ui.logger import Logger
+
+
+class QueueWorker:
+    """
+    공유 작업 저장소에서 작업을 임대(lease)받아 기존 다운로드 파이프라인으로 처리하는 워커
+    여러 머신/프로세스에서 같은 저장소를 가리키도록 실행하면 하나의 큰 배치를 함께 처리합니다.
+    - 하트비트 스레드가 처리 중인 작업의 임대를 주기적으로 연장
+    - 임대를 잃으면(다른 워커가 회수) 진행률 훅에서 다운로드를 중단하고 결과를 보고하지 않음
+    """
+
+    def __init__(self, store: JobStore, runner: JobRunner = None, config: ConfigManager = None,
+                 threads: int = None, lease_seconds: float = 60, poll_interval: float = 5, worker_id: str = None):
+        self.store = store
+        self.config = config if config else ConfigManager()
+        self.runner = runner if runner else JobRunner.from_config(self.config)
+        self.threads = threads or self.config.get('max_workers')
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.stats = {'done': 0, 'failed': 0, 'lost': 0}
+        self._active = {}  # job_id -> {'token': ..., 'lost': bool}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self, exit_when_empty: bool = False):
+        """워커 스레드와 하트비트 스레드를 띄우고 모두 끝날 때까지 블록합니다."""
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat.start()
+        workers = [threading.Thread(target=self._work_loop, args=(exit_when_empty,), daemon=True)
+                   for _ in range(self.threads)]
+        for t in workers: t.start()
+        try:
+            for t in workers:
+                while t.is_alive():
+                    t.join(timeout=0.5)
+        except KeyboardInterrupt:
+            Logger.warning("워커 중단: 처리 중인 작업은 임대 만료 후 다른 워커가 회수합니다.")
+        finally:
+            self._stop.set()
+        return self.stats
+
+    def stop(self):
+        self._stop.set()
+
+    # --- 내부 루프 ---
+    def _work_loop(self, exit_when_empty: bool):
+        while not self._stop.is_set():
+            job = self.store.claim(self.worker_id, self.lease_seconds)
+            if job is None:
+                if exit_when_empty and not self._has_unfinished_jobs():
+                    return
+                self._stop.wait(self.poll_interval)
+                continue
+            self._process(job)
+
+    def _has_unfinished_jobs(self) -> bool:
+        counts = self.store.counts()
+        return counts['queued'] > 0 or counts['leased'] > 0
+
+    def _process(self, job: dict):
+        job_id, token = job['id'], job['lease_token']
+        with self._lock:
+            self._active[job_id] = {'token': token, 'lost': False}
+        if job.get('reclaimed'):
+            Logger.info(f"[Worker] 만료된 임대 회수: #{job_id} (시도 {job['attempts']})")
+
+        def cb(d):
+            if self._active[job_id]['lost'] or self._stop.is_set():
+                raise JobCancelled()
+
+        item = {'url': job['url'], 'id': job.get('video_id'), 'path': job['path'], 'flags': job['flags']}
+        try:
+            res = self.runner.run(item, job['options'], cb, job_id)
+            result = res[0] if res else {'status': 'error', 'msg': 'No result'}
+        except JobCancelled:
+            result = None
+        except Exception as e:
+            result = {'status': 'error', 'msg': str(e)}
+        finally:
+            with self._lock:
+                lost = self._active.pop(job_id)['lost']
+
+        if result is None or lost:
+            # 임대를 잃은 작업은 결과를 보고하지 않음 (새 임대를 가진 워커가 처리)
+            self._count('lost')
+            return
+        if result.get('status') == 'success':
+            reported = self.store.complete(job_id, token, result)
+            key = 'done'
+        else:
+            # 접근 불가(비공개/삭제 등)로 분류된 실패는 다른 워커가 다시 시도해도 같으므로 바로 실패 처리
+            reported = self.store.fail(job_id, token, result, retry=not result.get('unavailable'))
+            key = 'failed'
+        self._count(key if reported else 'lost')
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _heartbeat_loop(self):
+        interval = max(self.lease_seconds / 3, 0.5)
+        while not self._stop.wait(interval):
+            with self._lock:
+                active = list(self._active.items())
+            for job_id, entry in active:
+                if self.store.heartbeat(job_id, entry['token'], self.lease_seconds):
+                    continue
+                with self._lock:
+                    if self._active.get(job_id) is not entry:
+                        continue  # 하트비트 직전에 정상 완료된 작업
+                    entry['lost'] = True
+                Logger.warning(f"[Worker] 작업 #{job_id}의 임대를 잃었습니다. 처리를 중단합니다.")
@@ -0,0 +1,114 @@
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import yt_dlp
+
+# 작업마다 달라지는 파라미터: 풀 키(fingerprint) 계산에서 제외하고 대여 시점에 교체합니다.
+# (download_ranges는 작업마다 새로 만드는 콜백이라 repr에 메모리 주소가 들어가 키가 매번 달라짐)
+PER_JOB_KEYS = ('outtmpl', 'progress_hooks', 'logger', 'download_ranges')
+
+
+class YDLPool:
+    """
+    워커 스레드별 YoutubeDL 인스턴스 풀
+    YoutubeDL 생성 시 발생하는 추출기/쿠키/HTTP 핸들러 초기화 비용을 작업마다 반복하지 않도록
+    옵션 지문(fingerprint)별로 인스턴스를 재사용합니다.
+    """
+
+    def __init__(self, max_per_thread: int = 4):
+        self.max_per_thread = max_per_thread
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances = []  # close_all()에서 정리할 전체 인스턴스 목록
+        self.stats = {'created': 0, 'reused': 0, 'evicted': 0}
+
+    @staticmethod
+    def fingerprint(opts: dict) -> str:
+        """작업별 파라미터를 제외한 옵션을 직렬화하여 풀 키로 사용합니다."""
+        stable = {k: v for k, v in opts.items() if k not in PER_JOB_KEYS}
+        return json.dumps(stable, sort_keys=True, default=repr)
+
+    @contextmanager
+    def acquire(self, opts: dict):
+        """현재 스레드 전용 인스턴스를 대여하고, 작업별 파라미터(PER_JOB_KEYS)만 작업용으로 교체합니다."""
+        cache = self._thread_cache()
+        key = self.fingerprint(opts)
+        ydl = cache.pop(key, None)
+
+        if ydl is None:
+            ydl = self._create(opts)
+        else:
+            self._count('reused')
+        cache[key] = ydl  # LRU: 최근 사용 키를 뒤로
+
+        # 한 스레드가 너무 많은 옵션 조합을 만들면 오래된 인스턴스부터 정리
+        while len(cache) > self.max_per_thread:
+            _, old = cache.popitem(last=False)
+            self._close(old)
+            self._count('evicted')
+
+        self._apply_job_params(ydl, opts)
+        try:
+            yield ydl
+        finally:
+            # 다음 작업에 이전 작업의 콜백이 호출되지 않도록 비웁니다.
+            ydl._progress_hooks = []
+            ydl.params.pop('logger', None)
+            ydl.params.pop('download_ranges', None)
+
+    def size(self) -> int:
+        """살아 있는 YoutubeDL 인스턴스 수 (모든 스레드 합계)"""
+        with self._lock:
+            return len(self._instances)
+
+    def close_all(self):
+        """쿠키 저장 및 커넥션 정리를 위해 모든 인스턴스를 닫습니다."""
+        with self._lock:
+            instances, self._instances = self._instances, []
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+    # --- 내부 헬퍼 ---
+    def _thread_cache(self) -> OrderedDict:
+        cache = getattr(self._local, 'instances', None)
+        if cache is None:
+            cache = self._local.instances = OrderedDict()
+        return cache
+
+    def _create(self, opts: dict):
+        base = {k: v for k, v in opts.items() if k not in PER_JOB_KEYS}
+        ydl = yt_dlp.YoutubeDL(base)
+        with self._lock:
+            self._instances.append(ydl)
+        self._count('created')
+        return ydl
+
+    def _close(self, ydl):
+        with self._lock:
+            if ydl in self._instances:
+                self._instances.remove(ydl)
+        try:
+            ydl.close()
+        except Exception:
+            pass
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _apply_job_params(ydl, opts: dict):
+        outtmpl = opts.get('outtmpl') or {}
+        ydl.params['outtmpl'] = dict(outtmpl) if isinstance(outtmpl, dict) else outtmpl
+        ydl._parse_outtmpl()
+        ydl._progress_hooks = list(opts.get('progress_hooks') or [])
+        if opts.get('logger'):
+            ydl.params['logger'] = opts['logger']
+        if opts.get('download_ranges'):
+            ydl.params['download_ranges'] = opts['download_ranges']
@@ -1,5 +1,6 @@
 import sys
 import os
+import argparse
 from ui.logger import Logger
 
 # 로컬 모듈 경로 인식 (Dev 모드용)
@@ -8,16 +9,299 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     # 핵심 컨트롤러 불러오기
     from core.controller import AppController
+    from core.config import ConfigManager
+    from core.profiler import PROFILE_ENV
 except ImportError as e:
     print(f"[Critical Error] 필수 모듈 로드 실패: {e}")
     sys.exit(1)
 
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="YouTube Downloader Pro")
+    parser.add_argument('--log-level', choices=['debug', 'info', 'warning', 'error'],
+                        help="로그 레벨 (기본: 설정의 log_level)")
+    parser.add_argument('--profile', choices=['light', 'full'],
+                        help="배치 메모리/CPU 프로파일링 (light: 운영용 저부하, full: tracemalloc 할당 추적)")
+    sub = parser.add_subparsers(dest='command')
+
+    p_daemon = sub.add_parser('daemon', help="상주 모드로 실행 (로컬 HTTP 작업 API)")
+    p_daemon.add_argument('--port', type=int, help="API 포트 (기본: settings.json의 daemon_port)")
+
+    p_submit = sub.add_parser('submit', help="데몬에 작업 제출")
+    p_submit.add_argument('urls', nargs='+')
+    p_submit.add_argument('-o', '--options', help="옵션 키워드 (예: 'mp3 BR_320k')")
+    p_submit.add_argument('-p', '--preset', help="프리셋 이름")
+    p_submit.add_argument('-d', '--output-dir', help="저장 경로")
+    p_submit.add_argument('--priority', type=int, default=0)
+    p_submit.add_argument('--playlist', action='store_true', help="재생목록 전체 다운로드")
+    p_submit.add_argument('-w', '--wait', action='store_true', help="완료될 때까지 진행률 표시")
+
+    p_jobs = sub.add_parser('jobs', help="데몬 작업 목록/상태 조회")
+    p_jobs.add_argument('job_id', nargs='?', type=int)
+
+    for action in ('cancel', 'pause', 'resume'):
+        p_action = sub.add_parser(action, help=f"데몬 작업 {action}")
+        p_action.add_argument('job_id', type=int)
+
+    p_watch = sub.add_parser('watch', help="데몬 진행 이벤트 스트림 보기")
+    p_watch.add_argument('job_ids', nargs='*', type=int)
+
+    p_worker = sub.add_parser('worker', help="공유 작업 저장소의 작업을 임대받아 처리 (멀티 노드)")
+    p_worker.add_argument('--store', required=True, help="작업 저장소 (SQLite 파일 경로 또는 'sqlite://경로')")
+    p_worker.add_argument('--threads', type=int, help="동시 처리 수 (기본: max_workers)")
+    p_worker.add_argument('--lease', type=float, default=60, help="임대 기간(초)")
+    p_worker.add_argument('--exit-when-empty', action='store_true', help="대기열이 비면 종료")
+
+    p_enqueue = sub.add_parser('enqueue', help="공유 작업 저장소에 작업 등록")
+    p_enqueue.add_argument('--store', required=True)
+    p_enqueue.add_argument('inputs', nargs='+', help="URL 또는 URL 목록 파일")
+    p_enqueue.add_argument('-o', '--options', help="옵션 키워드")
+    p_enqueue.add_argument('-d', '--output-dir', help="저장 경로")
+    p_enqueue.add_argument('--priority', type=int, default=0)
+
+    p_queue = sub.add_parser('queue', help="공유 작업 저장소 상태 조회")
+    p_queue.add_argument('--store', required=True)
+
+    p_catalog = sub.add_parser('catalog', help="미디어 없이 메타데이터 카탈로그만 수집 (JSONL.gz + SQLite)")
+    p_catalog.add_argument('inputs', nargs='+', help="영상/재생목록/채널 URL 또는 URL 목록 파일")
+    p_catalog.add_argument('-d', '--output-dir', help="카탈로그 저장 경로 (기본: <저장 경로>/Catalog)")
+    p_catalog.add_argument('--workers', type=int, help="동시 분석 수 (기본: max_workers)")
+
+    p_convert = sub.add_parser('convert', help="로컬 미디어 폴더에 옵션을 일괄 적용 (다운로드 없이 변환만)")
+    p_convert.add_argument('source', help="원본 폴더")
+    p_convert.add_argument('-o', '--options', help="옵션 키워드 (예: 'mp3 BR_192k loudnorm')")
+    p_convert.add_argument('-p', '--preset', help="프리셋 이름")
+    p_convert.add_argument('-d', '--output-dir', help="출력 폴더 (기본: <원본 폴더>_converted)")
+    p_convert.add_argument('--workers', type=int, help="동시 변환 프로세스 수 (기본: CPU 코어 수)")
+
+    p_plan = sub.add_parser('plan', help="다운로드 없이 배치 비용 추정 (크기/전송 시간/CPU 시간/디스크)")
+    p_plan.add_argument('inputs', nargs='+', help="영상/재생목록/채널 URL 또는 URL 목록 파일")
+    p_plan.add_argument('-o', '--options', help="옵션 키워드 (예: '1080p mp4')")
+    p_plan.add_argument('-p', '--preset', help="프리셋 이름")
+    p_plan.add_argument('--bandwidth', help="대역폭 bytes/s (예: 12M; 기본: plan_bandwidth 설정 또는 실측)")
+    p_plan.add_argument('--json', action='store_true', help="표 대신 JSON으로 출력")
+
+    p_record = sub.add_parser('record', help="라이브 방송 녹화 (HLS 롤링 파일; 방송 URL 또는 .m3u8 주소)")
+    p_record.add_argument('url')
+    p_record.add_argument('-d', '--output-dir', help="저장 경로")
+    p_record.add_argument('-o', '--options', help="옵션 키워드 (화질 상한 등; 예: '720p')")
+    p_record.add_argument('--name', help="파일 이름 (.m3u8 주소를 직접 녹화할 때; 기본: live)")
+    p_record.add_argument('--chunk', type=float, help="롤링 파일 하나의 길이(초) (기본: live_chunk_seconds)")
+    p_record.add_argument('--max-bytes', help="녹화 전체 용량 상한 (예: 10G; 기본: live_max_bytes)")
+    p_record.add_argument('--duration', type=float, help="녹화 길이 상한(초) (기본: 방송이 끝날 때까지)")
+
+    for p in (p_submit, p_jobs, p_watch) + tuple(sub.choices[a] for a in ('cancel', 'pause', 'resume')):
+        p.add_argument('--port', type=int, help="데몬 API 포트")
+    return parser
+
+def check_options(options: dict) -> bool:
+    """FFmpeg 인코더/필터 기준으로 불가능한 옵션 조합을 작업 등록 전에 걸러냅니다."""
+    from core.ffmpeg_handler import FFmpegHandler
+    problems = FFmpegHandler().validate_options(options)
+    for msg in problems:
+        Logger.error(f"옵션 오류: {msg}")
+    return not problems
+
+def run_client_command(args):
+    """데몬 클라이언트 명령 처리"""
+    import json
+    from ui.client import DaemonClient, print_jobs, watch_jobs
+
+    client = DaemonClient(args.port or ConfigManager().get('daemon_port'))
+    try:
+        if args.command == 'submit':
+            reply = client.submit(args.urls, args.options, args.preset, args.output_dir, args.priority, args.playlist)
+            if 'error' in reply:
+                Logger.error(reply['error']); return
+            Logger.success(f"작업 제출됨: {reply['jobs']}")
+            if args.wait: watch_jobs(client, reply['jobs'])
+        elif args.command == 'jobs':
+            if args.job_id: print(json.dumps(client.get_job(args.job_id), indent=2, ensure_ascii=False))
+            else: print_jobs(client.list_jobs())
+        elif args.command in ('cancel', 'pause', 'resume'):
+            print(json.dumps(client.action(args.job_id, args.command), ensure_ascii=False))
+        elif args.command == 'watch':
+            for event in client.iter_events(set(args.job_ids) or None):
+                print(json.dumps(event, ensure_ascii=False))
+    except OSError as e:
+        Logger.error(f"데몬에 연결할 수 없습니다: {e}")
+
+def run_queue_command(args):
+    """공유 작업 저장소(멀티 노드) 명령 처리"""
+    from core.job_store import open_job_store
+    from core.parser import parse_quality_string
+    from ui.console import print_unavailable
+    from utils.system import parse_input_string
+    from utils.unavailable import UnavailableCache
+
+    store = open_job_store(args.store)
+    if args.command == 'worker':
+        from core.worker import QueueWorker
+        from core.profiler import BatchProfiler, log_profile_summary
+        worker = QueueWorker(store, threads=args.threads, lease_seconds=args.lease)
+        Logger.info(f"워커 시작: {worker.worker_id} (스레드 {worker.threads}개, 임대 {args.lease:.0f}초)")
+        profiler = BatchProfiler.from_config(ConfigManager())
+        if profiler:
+            profiler.start()
+        try:
+            stats = worker.run(exit_when_empty=args.exit_when_empty)
+        finally:
+            if profiler: log_profile_summary(profiler.stop())
+        Logger.success(f"워커 종료: {stats}")
+    elif args.command == 'enqueue':
+        base_dir = args.output_dir or ConfigManager().get('default_output_dir')
+        items = []
+        for group in parse_input_string(' '.join(args.inputs)):
+            save_path = os.path.join(base_dir, group['group_name']) if group['source'] == 'file' else base_dir
+            items.extend({'url': url, 'path': save_path, 'flags': {'noplaylist': True}} for url in group['urls'])
+        options = parse_quality_string(args.options or "")
+        if not check_options(options): return
+        # [Negative cache] 최근 접근 불가로 기록된 영상은 공유 저장소에 넣지 않음
+        unavailable = UnavailableCache.from_config(ConfigManager())
+        if unavailable:
+            items, skipped = unavailable.filter_items(items)
+            if skipped: print_unavailable(skipped)
+        ids = store.enqueue(items, options, args.priority)
+        Logger.success(f"{len(ids)}개 작업 등록됨")
+    elif args.command == 'queue':
+        Logger.info(f"작업 저장소 상태: {store.counts()}")
+
+def run_catalog_command(args):
+    """메타데이터 카탈로그 수집 (미디어 다운로드 없음)"""
+    from core.catalog import CatalogExporter
+    from core.metadata import MetadataAnalyzer
+    from utils.system import parse_input_string
+
+    config = ConfigManager()
+    out_dir = args.output_dir or os.path.join(config.get('default_output_dir'), "Catalog")
+    exporter = CatalogExporter(MetadataAnalyzer(), out_dir, args.workers or config.get('max_workers'))
+    try:
+        stats = exporter.export(parse_input_string(' '.join(args.inputs)))
+    finally:
+        exporter.close()
+    Logger.success(f"카탈로그 완료: 수집 {stats['fetched']}, 건너뜀 {stats['skipped']}, 실패 {stats['failed']} → {out_dir}")
+
+def run_convert_command(args):
+    """로컬 미디어 폴더 일괄 변환 (변환 전용 모드)"""
+    from core.converter import LibraryConverter
+    from core.parser import parse_quality_string
+
+    option_str = args.options or ""
+    if args.preset:
+        presets = ConfigManager().get_presets()
+        if args.preset not in presets:
+            Logger.error(f"프리셋을 찾을 수 없습니다: {args.preset}"); return
+        option_str = f"{presets[args.preset]} {option_str}"
+    if not os.path.isdir(args.source):
+        Logger.error(f"폴더가 아닙니다: {args.source}"); return
+
+    options = parse_quality_string(option_str)
+    if not check_options(options): return
+    out_dir = args.output_dir or os.path.abspath(args.source).rstrip(os.sep) + "_converted"
+    converter = LibraryConverter(args.source, out_dir, options, args.workers)
+    stats = converter.run(lambda src, res: Logger.info(f"{res['status']}: {os.path.relpath(src, args.source)}"))
+    Logger.success(f"변환 완료: 변환 {stats['converted']}, 건너뜀 {stats['skipped']}, 실패 {stats['failed']} (로그: {converter.log_path})")
+
+def run_plan_command(args):
+    """dry-run 계획: 항목별/전체 크기, 전송 시간, 후처리 CPU 시간, 필요 디스크 공간"""
+    import json
+    from core.metadata import MetadataAnalyzer
+    from core.parser import parse_quality_string
+    from core.planner import BatchPlanner, parse_bandwidth
+    from ui.console import print_plan
+    from utils.system import parse_input_string
+
+    config = ConfigManager()
+    option_str = args.options or ""
+    if args.preset:
+        presets = config.get_presets()
+        if args.preset not in presets:
+            Logger.error(f"프리셋을 찾을 수 없습니다: {args.preset}"); return
+        option_str = f"{presets[args.preset]} {option_str}"
+
+    planner = BatchPlanner(MetadataAnalyzer(), config, config.get('max_workers'))
+    plan = planner.plan(parse_input_string(' '.join(args.inputs)), parse_quality_string(option_str),
+                        parse_bandwidth(args.bandwidth) if args.bandwidth else None)
+    if args.json:
+        print(json.dumps(plan, indent=2, ensure_ascii=False))
+    else:
+        print_plan(plan)
+
+def run_record_command(args):
+    """라이브 녹화: .m3u8 주소는 yt-dlp 없이 바로 녹화하고, 방송 URL은 다운로드 파이프라인(라이브 감지)으로 처리"""
+    from urllib.parse import urlparse
+    from core.job_runner import JobRunner
+    from core.live_recorder import LiveRecorder, live_settings_from_config
+    from core.parser import parse_quality_string
+    from core.planner import parse_bandwidth
+
+    config = ConfigManager()
+    settings = live_settings_from_config(config)
+    if args.chunk: settings['chunk_seconds'] = args.chunk
+    if args.max_bytes: settings['max_bytes'] = parse_bandwidth(args.max_bytes)
+    if args.duration: settings['max_seconds'] = args.duration
+    out_dir = args.output_dir or config.get('default_output_dir')
+    os.makedirs(out_dir, exist_ok=True)
+    options = parse_quality_string(args.options or "")
+
+    if urlparse(args.url).path.endswith('.m3u8'):
+        recorder = LiveRecorder(args.url, out_dir, args.name or 'live', max_height=options.get('height'), **settings)
+        try:
+            result = recorder.run()
+        except KeyboardInterrupt:
+            Logger.info("녹화를 중지했습니다.")
+            result = {'files': recorder.files, 'metrics': recorder.metrics}
+        for path in result['files']:
+            Logger.success(f"녹화 파일: {path}")
+        return
+
+    downloader = JobRunner.from_config(config).downloader
+    downloader.live_settings.update(settings)
+    for res in downloader.download([args.url], out_dir, options):
+        if res['status'] == 'success':
+            for path in res.get('filepaths') or [res['filepath']]:
+                Logger.success(f"녹화 파일: {path}")
+        else:
+            Logger.error(f"녹화 실패: {res['msg']}")
+
+def configure_logging(level: str = None):
+    """설정의 로그 레벨/회전 로그 파일을 적용합니다. (명령줄 --log-level이 우선)"""
+    config = ConfigManager()
+    Logger.configure(level or config.get('log_level'), config.get('log_file') or None,
+                     config.get('log_max_bytes'), config.get('log_backups'))
+
 def main():
     """
     프로그램 진입점
-    모든 로직은 AppController에게 위임합니다.
+    인자가 없으면 대화형 모드(AppController), 있으면 데몬/클라이언트 명령으로 동작합니다.
     """
+    args = build_arg_parser().parse_args()
+    configure_logging(args.log_level)
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile  # 설정의 profile_mode보다 우선
     try:
+        if args.command == 'daemon':
+            from core.daemon import run_daemon
+            run_daemon(args.port)
+            return
+        if args.command == 'catalog':
+            run_catalog_command(args)
+            return
+        if args.command == 'convert':
+            run_convert_command(args)
+            return
+        if args.command == 'plan':
+            run_plan_command(args)
+            return
+        if args.command == 'record':
+            run_record_command(args)
+            return
+        if args.command in ('worker', 'enqueue', 'queue'):
+            run_queue_command(args)
+            return
+        if args.command:
+            run_client_command(args)
+            return
+
         app = AppController()
         app.run()
     except KeyboardInterrupt:
@@ -32,4 +316,4 @@ def main():
             except: pass
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
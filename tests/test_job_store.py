@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from core.job_store import DONE, FAILED, LEASED, QUEUED, SQLiteJobStore
+from core.worker import QueueWorker
+
+LEASE = 0.05
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteJobStore(str(tmp_path / 'jobs.db'), max_attempts=2)
+
+
+def enqueue(store, count=1):
+    return store.enqueue([{'url': f"https://youtu.be/job{i:07d}", 'path': '.'} for i in range(count)], {})
+
+
+def test_two_workers_claim_different_jobs(store):
+    enqueue(store, 2)
+    a = store.claim('a', 60)
+    b = store.claim('b', 60)
+    assert a['id'] != b['id']
+    assert a['lease_token'] != b['lease_token']
+    assert store.claim('c', 60) is None
+    assert store.counts()[LEASED] == 2
+
+
+def test_stale_token_is_rejected_after_lease_expires(store):
+    enqueue(store)
+    first = store.claim('a', LEASE)
+    time.sleep(LEASE * 2)
+
+    second = store.claim('b', 60)
+    assert second['id'] == first['id']
+    assert second['reclaimed'] and second['attempts'] == 2
+
+    # 회수당한 워커의 늦은 보고/하트비트는 무시
+    assert not store.heartbeat(first['id'], first['lease_token'], 60)
+    assert not store.complete(first['id'], first['lease_token'], {'status': 'success'})
+    assert not store.fail(first['id'], first['lease_token'], {'status': 'error'})
+
+    assert store.heartbeat(second['id'], second['lease_token'], 60)
+    assert store.complete(second['id'], second['lease_token'], {'status': 'success'})
+    assert store.counts()[DONE] == 1
+
+
+def test_expired_leases_run_out_of_attempts(store):
+    enqueue(store)
+    for _ in range(2):
+        assert store.claim('a', LEASE) is not None
+        time.sleep(LEASE * 2)
+
+    assert store.claim('b', 60) is None
+    assert store.counts()[FAILED] == 1
+
+
+def test_fail_requeues_until_attempts_run_out(store):
+    enqueue(store)
+    job = store.claim('a', 60)
+    assert store.fail(job['id'], job['lease_token'], {'status': 'error'})
+    assert store.counts()[QUEUED] == 1
+
+    job = store.claim('a', 60)
+    assert store.fail(job['id'], job['lease_token'], {'status': 'error'})
+    assert store.counts()[FAILED] == 1
+
+
+class _Runner:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def run(self, item, options, progress_callback=None, job_id=None):
+        self.calls += 1
+        return [dict(self.result, url=item['url'])]
+
+
+def test_worker_does_not_retry_unavailable_videos(store):
+    enqueue(store)
+    runner = _Runner({'status': 'error', 'unavailable': 'private', 'msg': 'Private video'})
+    worker = QueueWorker(store, runner=runner, threads=1, lease_seconds=60, poll_interval=0.01, worker_id='w')
+
+    stats = worker.run(exit_when_empty=True)
+    assert runner.calls == 1
+    assert stats['failed'] == 1
+    assert store.counts()[FAILED] == 1
@@ -0,0 +1,102 @@
+import json
+import urllib.error
+import urllib.request
+
+from rich.table import Table
+
+from ui.logger import console
+
+
+class DaemonClient:
+    """데몬 HTTP API를 호출하는 얇은 CLI 클라이언트"""
+
+    def __init__(self, port: int, host: str = '127.0.0.1'):
+        self.base_url = f"http://{host}:{port}"
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                return json.loads(resp.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            return json.loads(e.read().decode('utf-8') or '{}')
+
+    def submit(self, urls, options=None, preset=None, output_dir=None, priority=0, playlist=False):
+        return self._request('POST', '/jobs', {
+            'urls': urls, 'options': options, 'preset': preset,
+            'output_dir': output_dir, 'priority': priority, 'playlist': playlist,
+        })
+
+    def list_jobs(self):
+        return self._request('GET', '/jobs').get('jobs', [])
+
+    def get_job(self, job_id):
+        return self._request('GET', f'/jobs/{job_id}')
+
+    def action(self, job_id, action):
+        return self._request('POST', f'/jobs/{job_id}/{action}', {})
+
+    def stats(self):
+        return self._request('GET', '/stats')
+
+    def iter_events(self, job_ids=None):
+        """
+        진행 이벤트 스트림을 한 줄(JSON)씩 반환하는 이터레이터
+        반환 시점에 이미 구독이 열려 있으므로, 이후 발생한 이벤트는 순회를 늦게 시작해도 놓치지 않습니다.
+        """
+        resp = urllib.request.urlopen(self.base_url + '/events')
+        return self._read_events(resp, job_ids)
+
+    @staticmethod
+    def _read_events(resp, job_ids):
+        with resp:
+            for raw in resp:
+                event = json.loads(raw.decode('utf-8'))
+                if job_ids and event.get('id') not in job_ids:
+                    continue
+                yield event
+
+
+def print_jobs(jobs):
+    table = Table(title="[Daemon Jobs]", show_header=True, header_style="bold magenta")
+    table.add_column("ID", justify="right"); table.add_column("State", style="cyan")
+    table.add_column("%", justify="right"); table.add_column("Prio", justify="right")
+    table.add_column("URL", style="dim"); table.add_column("Result", style="green")
+    for j in jobs:
+        result = (j.get('result') or {}).get('status', '')
+        table.add_row(str(j['id']), str(j.get('state')), f"{j.get('percent') or 0:.0f}",
+                      str(j.get('priority')), j['url'], result)
+    console.print(table)
+
+
+def watch_jobs(client: DaemonClient, job_ids: list):
+    """제출한 작업이 모두 끝날 때까지 진행 이벤트를 출력합니다."""
+    remaining = set(job_ids)
+
+    def finished(job_id, result):
+        if job_id not in remaining:
+            return  # 상태 조회와 이벤트 양쪽에서 본 경우
+        console.print(f"[bold green]#{job_id} {result.get('status')}[/bold green] {result.get('filepath') or result.get('msg') or ''}")
+        remaining.discard(job_id)
+
+    # 구독을 먼저 열고 상태를 한 번 조회: 구독 전에 이미 끝난 작업(중복/접근 불가 기록/검증 실패)의 완료 이벤트를 놓치지 않음
+    events = client.iter_events(set(job_ids))
+    for job_id in job_ids:
+        job = client.get_job(job_id)
+        if job.get('result'):
+            finished(job_id, job['result'])
+        elif job.get('state') == 'cancelled':
+            finished(job_id, {'status': 'cancelled'})  # 취소됨 (실행 중이던 작업은 곧 중단)
+        elif job.get('error'):
+            finished(job_id, {'status': 'unknown', 'msg': job['error']})  # 보관 기간이 지나 정리된 작업
+    if not remaining:
+        return
+    for event in events:
+        if event['event'] == 'progress' and event.get('status') == 'downloading':
+            console.print(f"[cyan]#{event['id']}[/cyan] {event.get('percent') or 0:.1f}% {event.get('speed') or ''}")
+        elif event['event'] == 'finished':
+            finished(event['id'], event.get('result') or {})
+            if not remaining:
+                return
@@ -1,11 +1,8 @@
 import questionary
-from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, DownloadColumn, TransferSpeedColumn
-from ui.logger import Logger
-
-console = Console()
+from ui.logger import Logger, console
 
 class ConsoleUI:
     """사용자 입력(Input)과 화면 출력(Output)을 전담하는 클래스"""
@@ -36,23 +33,24 @@ class ConsoleUI:
     def show_video_info(self, info):
         if not info: return
         console.print(Panel(
-            f"[bold white]{info.get('title')}[/bold white]\n[dim]길이: {info.get('duration')}초[/dim]",
+            f"[bold white]{info.title}[/bold white]\n[dim]길이: {info.duration}초"
+            + (f" / 챕터 {info.chapters}개" if info.chapters else "") + "[/dim]",
             title="Target Info", border_style="blue"
         ))
-        self._print_format_table(info.get('formats', {}))
+        self._print_format_table(info.formats)
 
     def _print_format_table(self, formats):
         v_table = Table(title="[Video]", show_header=True, header_style="bold magenta")
         v_table.add_column("ID", justify="center"); v_table.add_column("Res", style="green")
         v_table.add_column("FPS"); v_table.add_column("Codec", style="dim"); v_table.add_column("Ext", style="yellow")
-        for f in formats.get('video', [])[:6]:
-            v_table.add_row(f['id'], f['res'], str(f['fps']), f['codec'], f['ext'])
+        for f in formats.video[:6]:
+            v_table.add_row(f.format_id, f.res, f"{f.fps:g}", f.codec, f.ext)
         
         a_table = Table(title="[Audio]", show_header=True, header_style="bold cyan")
         a_table.add_column("ID", justify="center"); a_table.add_column("Abr", style="green")
         a_table.add_column("Codec", style="dim"); a_table.add_column("Ext", style="yellow")
-        for f in formats.get('audio', [])[:4]:
-            a_table.add_row(f['id'], f"{f['abr']}k", f['codec'], f['ext'])
+        for f in formats.audio[:4]:
+            a_table.add_row(f.format_id, f"{f.abr:g}k", f.codec, f.ext)
 
         console.print(v_table)
         console.print(a_table)
@@ -94,7 +92,9 @@ class ConsoleUI:
 
     def confirm_options(self, options):
         # 보기 좋게 필터링해서 보여주기
-        filtered = {k: v for k, v in options.items() if v}
+        filtered = {k: v for k, v in options.items() if v and k != 'renditions'}
+        if options.get('renditions'):
+            filtered['renditions'] = [{k: v for k, v in r.items() if v} for r in options['renditions']]
         Logger.info(f"적용될 옵션 확인: {filtered}")
         
         choice = questionary.select(
@@ -147,8 +147,11 @@ class ConsoleUI:
         table.add_section()
 
         # 3. Common
+        table.add_row("Sections", "RANGE_start-end / CHAPTER_regex", "RANGE_1:30-2:45, RANGE_1:00:00- (to end), CHAPTER_intro")
+        table.add_row("Chapter Split", "split / split_exact", "split (one file per chapter, stream copy), split_exact (re-encode off-keyframe starts)")
+        table.add_row("Multi Output", "';' separated", "mp4 1080p ; mp3 BR_192k ; flac 24bit (one download, one FFmpeg pass)")
         table.add_row("General", "Flag", "original (No Convert), bestQuality (Auto)")
-        table.add_row("Extras", "Flag", "sub (Subtitle), thumb (Thumbnail), meta (Metadata)")
+        table.add_row("Extras", "Flag", "sub (Subtitle), thumb (Thumbnail), meta (Metadata catalog only, no media)")
 
         console.print(table)
         console.print("[dim]※ Space separated (e.g. '1080p 60fps av1' or 'mp3 BR_320k enhance')[/dim]\n")
@@ -161,8 +164,9 @@ class ConsoleUI:
             choices=[
                 "1. 저장 디렉토리 변경",
                 "2. 최대 동시 작업 수 변경",
-                "3. 프리셋 관리 (Presets)",
-                "4. 메인 메뉴로 돌아가기"
+                "3. 임시 작업 폴더 변경 (Staging)",
+                "4. 프리셋 관리 (Presets)",
+                "5. 메인 메뉴로 돌아가기"
             ]
         ).ask()
 
@@ -183,6 +187,13 @@ class ConsoleUI:
         path = questionary.path("새 저장 경로 (취소하려면 엔터):").ask()
         return path if path and path.strip() else None
 
+    def ask_settings_staging_directory(self, current):
+        console.print(f"[dim]현재 작업 폴더: {current or '(사용 안 함: 출력 폴더에 직접 기록)'}[/dim]")
+        console.print("[dim]tmpfs/NVMe 등 빠른 로컬 디스크를 지정하면 중간 파일을 그곳에서 처리합니다.[/dim]")
+        path = questionary.path("새 작업 폴더 (취소: 엔터, 사용 안 함: '-'):").ask()
+        if not path or not path.strip(): return None
+        return "" if path.strip() == '-' else path.strip()
+
     def ask_settings_workers(self, current):
         console.print(f"[dim]현재 작업 수: {current}[/dim]")
         val = questionary.text("최대 동시 작업 수 (1~8) (취소: 'b'):").ask()
@@ -215,4 +226,58 @@ class ConsoleUI:
             SpinnerColumn(), TextColumn("[bold blue]{task.fields[filename]}"), BarColumn(),
             "[progress.percentage]{task.percentage:>3.0f}%", DownloadColumn(), TransferSpeedColumn(),
             console=console
-        )
\ No newline at end of file
+        )
+
+def print_plan(plan: dict):
+    """dry-run 계획(BatchPlanner.plan 결과)을 표로 출력합니다."""
+    from utils.storage import format_bytes
+
+    def fmt_time(seconds):
+        if seconds is None: return "-"
+        m, s = divmod(int(seconds), 60)
+        h, m = divmod(m, 60)
+        return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+    table = Table(title="[Dry-run Plan]", show_header=True, header_style="bold magenta")
+    table.add_column("#", justify="right"); table.add_column("Title", style="cyan", max_width=40)
+    table.add_column("Length", justify="right"); table.add_column("Format", style="dim")
+    table.add_column("Download", justify="right"); table.add_column("Output", justify="right")
+    table.add_column("Transfer", justify="right"); table.add_column("CPU", justify="right")
+    for idx, item in enumerate(plan['items'], 1):
+        if item['status'] != 'ok':
+            table.add_row(str(idx), f"[red]분석 실패[/red] {item['url']}", "-", "-", "-", "-", "-", "-")
+            continue
+        fmt = '+'.join(filter(None, [item['video_format'], item['audio_format']]))
+        if item['resolution']: fmt += f" ({item['resolution']})"
+        table.add_row(str(idx), item['title'], fmt_time(item['duration']), fmt,
+                      format_bytes(item['download_bytes']), format_bytes(item['output_bytes']),
+                      fmt_time(item['transfer_seconds']), fmt_time(item['cpu_seconds']))
+    console.print(table)
+
+    t = plan['totals']
+    bw = plan['bandwidth_bps']
+    console.print(f"항목 {t['resolved']}/{t['items']}개 (분석 실패 {t['unavailable']}), 총 길이 {fmt_time(t['duration'])}")
+    console.print(f"다운로드 {format_bytes(t['download_bytes'])} → 결과물 {format_bytes(t['output_bytes'])}")
+    console.print(f"전송 시간 {fmt_time(t['transfer_seconds'])} "
+                  f"(대역폭 {format_bytes(bw) + '/s' if bw else '알 수 없음'}, {plan['bandwidth_source']}), "
+                  f"후처리 CPU {fmt_time(t['cpu_seconds'])} (코어-시간)")
+    free = format_bytes(t['free_disk_bytes']) if t['free_disk_bytes'] is not None else '알 수 없음'
+    style = "green" if t['fits'] else "bold red"
+    console.print(f"[{style}]필요 디스크 {format_bytes(t['required_disk_bytes'])} / 여유 공간 {free} ({t['output_dir']})[/{style}]")
+
+
+def print_unavailable(skipped: list):
+    """접근 불가 기록으로 큐에서 뺀 항목을 분류별로 요약해 출력합니다."""
+    from collections import Counter
+    from datetime import datetime
+    from rich.markup import escape
+
+    counts = Counter(entry['reason'] for entry in skipped)
+    table = Table(title=f"[접근 불가 기록으로 건너뜀: {len(skipped)}개]", show_header=True, header_style="bold yellow")
+    table.add_column("Video"); table.add_column("Reason", style="yellow")
+    table.add_column("Recorded", style="dim"); table.add_column("Message", style="dim", max_width=50)
+    for entry in skipped:
+        recorded = datetime.fromtimestamp(entry['time']).strftime('%Y-%m-%d %H:%M')
+        table.add_row(entry['id'] or entry['url'], entry['reason'], recorded, escape(entry['message']))
+    console.print(table)
+    console.print("분류별: " + ", ".join(f"{reason} {n}" for reason, n in counts.most_common()))
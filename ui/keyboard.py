@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+
+HELP_TEXT = "[p] 전체 일시정지/재개 | [번호+p] 작업 일시정지/재개 | [번호+c] 작업 취소 | [번호+ +/-] 우선순위"
+
+
+class KeyboardControl:
+    """
+    진행률 대시보드가 떠 있는 동안 단축키 입력을 받아 JobController에 전달합니다.
+    숫자를 먼저 입력하면 해당 번호의 작업을 대상으로, 숫자 없이 입력하면 배치 전체를 대상으로 합니다.
+    """
+
+    def __init__(self, controller, on_change=None):
+        self.controller = controller
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread = None
+        self._buffer = ""
+
+    def start(self):
+        if not sys.stdin or not sys.stdin.isatty():
+            return False
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    def handle_key(self, key: str):
+        if key.isdigit():
+            self._buffer += key
+            return
+
+        job_id = int(self._buffer) if self._buffer else None
+        self._buffer = ""
+
+        if key in ('p', ' '):
+            self.controller.toggle_pause(job_id)
+        elif key == 'c' and job_id is not None:
+            self.controller.cancel(job_id)
+        elif key in ('+', '=') and job_id is not None:
+            self.controller.bump_priority(job_id, 1)
+        elif key == '-' and job_id is not None:
+            self.controller.bump_priority(job_id, -1)
+        else:
+            return
+
+        if self.on_change:
+            self.on_change()
+
+    # --- OS별 키 입력 루프 ---
+    def _loop(self):
+        if os.name == 'nt':
+            self._loop_windows()
+        else:
+            self._loop_posix()
+
+    def _loop_windows(self):
+        import msvcrt
+        while not self._stop.is_set():
+            if msvcrt.kbhit():
+                self.handle_key(msvcrt.getwch().lower())
+            else:
+                self._stop.wait(0.1)
+
+    def _loop_posix(self):
+        import select
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        old_attrs = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            while not self._stop.is_set():
+                ready, _, _ = select.select([sys.stdin], [], [], 0.1)
+                if ready:
+                    self.handle_key(sys.stdin.read(1).lower())
+        finally:
+            # questionary 메뉴가 정상 동작하도록 터미널 모드 복구
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
@@ -1,25 +1,214 @@
 # ui/logger.py
+import atexit
+import contextvars
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
 from rich.console import Console
+from rich.markup import escape
 
 console = Console()
 
+LEVELS = {'debug': logging.DEBUG, 'info': logging.INFO, 'success': logging.INFO + 5,
+          'warning': logging.WARNING, 'error': logging.ERROR}
+LEVEL_STYLES = {
+    logging.DEBUG: "[dim][DEBUG][/dim]",
+    logging.INFO: "[bold cyan][INFO][/bold cyan]",
+    logging.INFO + 5: "[bold green][SUCCESS][/bold green]",
+    logging.WARNING: "[bold yellow][WARNING][/bold yellow]",
+    logging.ERROR: "[bold red][ERROR][/bold red]",
+}
+QUEUE_MAX = 10000  # 출력이 밀려도 메모리가 무한히 늘지 않도록 (초과분은 버리고 개수만 기록)
+
+# 현재 스레드(작업)의 로그 문맥: job / url / stage
+_context = contextvars.ContextVar('log_context', default={})
+# 스레드 ID → 현재 단계 (다른 스레드에서 읽을 수 있도록; 프로파일러의 단계별 CPU 집계용)
+_thread_stages = {}
+
+
+def _publish_stage():
+    stage = _context.get().get('stage')
+    if stage is None:
+        _thread_stages.pop(threading.get_ident(), None)
+    else:
+        _thread_stages[threading.get_ident()] = stage
+
+
+class _LogWriter:
+    """
+    백그라운드 로그 기록기 (프로세스마다 하나)
+    워커 스레드는 큐에 넣기만 하고(put_nowait) 콘솔/파일 출력은 이 스레드가 전담합니다.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=QUEUE_MAX)
+        self.level = LEVELS.get(os.environ.get('YTDL_LOG_LEVEL', '').lower(), logging.INFO)
+        self.console_level = self.level
+        self.file_level = self.level
+        self.file_handler = None
+        self.dropped = 0
+        self.pid = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, level: int, msg: str):
+        if level < self.level:
+            return
+        self._ensure_started()
+        record = (time.time(), level, str(msg), _context.get(), threading.current_thread().name)
+        if threading.current_thread() is threading.main_thread():
+            # 메인 스레드(대화형 흐름)는 앞선 로그를 비운 뒤 바로 출력해 입력 프롬프트와 순서를 맞춤
+            self.flush()
+            self._write(*record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 2.0):
+        """지금까지 넣은 로그가 모두 출력될 때까지 기다립니다. (대화형 입력 직전 / 종료 시)"""
+        if self.pid != os.getpid():
+            return
+        done = threading.Event()
+        try:
+            self.queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def _ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self._start_lock:
+            if self.pid == os.getpid():
+                return
+            if self.pid is not None:
+                # fork된 자식 프로세스: 파일 회전은 부모만 담당하고, 상속된 큐는 새로 만듦
+                self.file_handler = None
+                self.queue = queue.Queue(maxsize=QUEUE_MAX)
+            self.pid = os.getpid()
+            threading.Thread(target=self._run, name='log-writer', daemon=True).start()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if isinstance(record, threading.Event):
+                record.set()
+                continue
+            try:
+                self._write(*record)
+            except Exception:
+                pass  # 로그 출력 실패가 작업에 영향을 주지 않도록
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                self._write(time.time(), logging.WARNING, f"로그 큐가 가득 차 {dropped}개를 버렸습니다.", {}, 'log-writer')
+
+    def _write(self, created: float, level: int, msg: str, ctx: dict, thread: str):
+        prefix = ""
+        if ctx:
+            prefix = ' '.join(f"#{v}" if k == 'job' else str(v) for k, v in ctx.items() if k != 'url' and v is not None)
+        if level >= self.console_level:
+            label = f"[dim]({escape(prefix)})[/dim] " if prefix else ""
+            console.print(f"{LEVEL_STYLES.get(level, '')} {label}{escape(msg)}")  # 파일명의 '[live ...]' 등이 마크업으로 먹히지 않도록
+        if self.file_handler and level >= self.file_level:
+            fields = ' '.join(f"{k}={v}" for k, v in ctx.items() if v is not None)
+            record = logging.makeLogRecord({
+                'created': created, 'levelno': level, 'levelname': logging.getLevelName(level),
+                'msg': f"[{thread}] {fields + ' | ' if fields else ''}{msg}",
+            })
+            self.file_handler.handle(record)
+
+
+_writer = _LogWriter()
+logging.addLevelName(LEVELS['success'], 'SUCCESS')
+atexit.register(_writer.flush)
+
+
 class Logger:
+    """
+    레벨별 로그 (debug < info < success < warning < error)
+    워커 스레드의 호출은 큐에 넣기만 하므로 터미널/파일 I/O로 멈추지 않습니다.
+    Logger.context(job=..., url=..., stage=...) 안에서 남긴 로그에는 작업 문맥이 함께 기록됩니다.
+    """
+
+    @staticmethod
+    def configure(level: str = 'info', log_file: str = None, max_bytes: int = 5 * 1024 ** 2, backups: int = 3,
+                  console_level: str = None):
+        """출력 레벨과 회전 로그 파일을 설정합니다. (console_level 미지정 시 level과 동일)"""
+        _writer.flush()
+        _writer.console_level = LEVELS.get(console_level or level, logging.INFO)
+        _writer.file_level = LEVELS.get(level, logging.INFO)
+        if _writer.file_handler:
+            _writer.file_handler.close()
+            _writer.file_handler = None
+        if log_file:
+            handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s %(message)s'))
+            _writer.file_handler = handler
+        # 어느 출력에도 쓰이지 않을 레벨은 호출 시점에 바로 버림 (큐에 넣지 않음)
+        _writer.level = min(_writer.console_level, _writer.file_level) if log_file else _writer.console_level
+
+    @staticmethod
+    def is_debug() -> bool:
+        return _writer.level <= logging.DEBUG
+
+    @staticmethod
+    @contextmanager
+    def context(**fields):
+        """현재 스레드의 로그 문맥에 필드를 추가합니다. (중첩 시 안쪽 값이 우선)"""
+        token = _context.set({**_context.get(), **fields})
+        _publish_stage()
+        try:
+            yield
+        finally:
+            _context.reset(token)
+            _publish_stage()
+
+    @staticmethod
+    def stage(name: str):
+        """
+        현재 작업의 진행 단계를 바꿉니다. 바깥 Logger.context가 끝날 때 함께 원복되므로
+        반드시 Logger.context(...) 안에서 호출합니다. (Downloader.download / JobRunner.run이 문맥을 엶)
+        """
+        _context.set({**_context.get(), 'stage': name})
+        _publish_stage()
+
+    @staticmethod
+    def thread_stages() -> dict:
+        """실행 중인 작업 스레드별 현재 단계 {스레드 ID: 단계}"""
+        return dict(_thread_stages)
+
+    @staticmethod
+    def flush():
+        _writer.flush()
+
+    @staticmethod
+    def debug(msg):
+        _writer.submit(logging.DEBUG, msg)
+
     @staticmethod
     def info(msg):
-        console.print(f"[bold cyan][INFO][/bold cyan] {msg}")
+        _writer.submit(logging.INFO, msg)
 
     @staticmethod
     def success(msg):
-        console.print(f"[bold green][SUCCESS][/bold green] {msg}")
+        _writer.submit(LEVELS['success'], msg)
 
     @staticmethod
     def warning(msg):
-        console.print(f"[bold yellow][WARNING][/bold yellow] {msg}")
+        _writer.submit(logging.WARNING, msg)
 
     @staticmethod
     def error(msg):
-        console.print(f"[bold red][ERROR][/bold red] {msg}")
+        _writer.submit(logging.ERROR, msg)
 
     @staticmethod
     def ask(msg):
-        console.print(f"\n[bold magenta][ASK][/bold magenta] {msg}")
\ No newline at end of file
+        # 입력 프롬프트는 앞선 로그가 모두 출력된 뒤 바로(동기) 표시
+        _writer.flush()
+        console.print(f"\n[bold magenta][ASK][/bold magenta] {msg}")
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+
+from utils.storage import file_lock
+from utils.system import extract_video_id
+from ui.logger import Logger
+
+INDEX_FILE = 'output_index.json'
+
+# 출력 결과에 영향을 주지 않는 옵션 (중복 판별 키에서 제외)
+NON_OUTPUT_KEYS = ('noplaylist',)
+
+
+def make_dedupe_key(video_id: str, options: dict) -> str | None:
+    """영상 ID + 실제 출력 옵션으로 중복 판별 키를 만듭니다."""
+    if not video_id:
+        return None
+    effective = {k: v for k, v in options.items() if k not in NON_OUTPUT_KEYS and v}
+    return f"{video_id}|{json.dumps(effective, sort_keys=True, default=str)}"
+
+
+def group_duplicates(queue_items: list, global_options: dict) -> tuple:
+    """
+    배치 내 중복 항목을 하나로 묶습니다.
+    같은 키의 첫 항목만 다운로드 대상으로 남기고, 나머지의 저장 경로는 'mirrors'로 모읍니다.
+    반환: (중복 제거된 항목 리스트, 제거된 항목 수)
+    """
+    primary_by_key = {}
+    result = []
+    merged = 0
+
+    for item in queue_items:
+        opts = global_options.copy()
+        opts.update(item.get('flags') or {})
+        key = make_dedupe_key(item.get('id') or extract_video_id(item['url']), opts)
+        item = dict(item, dedupe_key=key, mirrors=[])
+
+        primary = primary_by_key.get(key) if key else None
+        if primary is None:
+            if key: primary_by_key[key] = item
+            result.append(item)
+            continue
+
+        merged += 1
+        if item['path'] != primary['path'] and item['path'] not in primary['mirrors']:
+            primary['mirrors'].append(item['path'])
+
+    return result, merged
+
+
+class OutputIndex:
+    """
+    이전 실행의 출력물 색인 (중복 키 → 파일 경로 목록)
+    같은 영상/옵션을 다시 요청하면 다운로드 대신 기존 파일을 링크합니다.
+    구간/챕터 분할/라이브 녹화처럼 결과물이 여러 개인 작업은 전체 목록을 기록합니다.
+    """
+
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries.update(json.load(f))
+        except Exception as e:
+            Logger.warning(f"출력 색인 로드 중 오류: {e}")
+
+    def lookup(self, key: str) -> list | None:
+        """색인에 있고 모두 아직 디스크에 남아 있는 파일 경로 목록을 반환합니다. (하나라도 없으면 None → 다시 다운로드)"""
+        if not key:
+            return None
+        with self._lock:
+            paths = self.entries.get(key)
+        if isinstance(paths, str):
+            paths = [paths]  # 이전 형식 (단일 경로)
+        return paths if paths and all(os.path.isfile(p) for p in paths) else None
+
+    def record(self, key: str, filepaths: list):
+        if not key or not filepaths:
+            return
+        with self._lock:
+            # 다른 프로세스(프로세스 워커/데몬/멀티 노드)의 기록을 덮어쓰지 않도록 파일 잠금 안에서 디스크 내용과 병합 후 원자적 교체
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with file_lock(f"{self.path}.lock"):
+                    self.load()
+                    self.entries[key] = [os.path.abspath(p) for p in filepaths]
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(self.entries, f, indent=2, ensure_ascii=False)
+                    os.replace(tmp_path, self.path)
+            except Exception as e:
+                Logger.warning(f"출력 색인 저장 실패: {e}")
@@ -1,24 +1,59 @@
 import csv
 import os
 from datetime import datetime
+from ui.logger import Logger
+from utils.storage import file_lock
 
 HISTORY_FILE = 'download_history.csv'
+HEADER = ['Date', 'Title', 'URL', 'Filepath', 'Hash', 'Duration', 'Streams']
+_header_checked = False
 
-def log_success(title, url, filepath):
-    """다운로드 성공 기록을 CSV에 남깁니다."""
+def log_success(title, url, filepath, check: dict = None):
+    """다운로드 성공 기록을 CSV에 남깁니다. (check: 결과물 검증 결과 - 해시 / ffprobe 길이 / 스트림 코덱)"""
     now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    file_exists = os.path.exists(HISTORY_FILE)
-    
+    check = check or {}
+
     try:
-        # [수정됨] encoding='utf-8' -> 'utf-8-sig' (엑셀 호환성 해결)
-        with open(HISTORY_FILE, 'a', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            # 파일이 처음 생성될 때만 헤더 작성
-            if not file_exists:
-                writer.writerow(['Date', 'Title', 'URL', 'Filepath'])
-            
-            writer.writerow([now, title, url, filepath])
+        # 헤더 변환(파일 전체 재작성) 중에 다른 스레드/프로세스가 추가한 행이 사라지지 않도록 추가도 같은 잠금 안에서
+        with file_lock(f"{HISTORY_FILE}.lock"):
+            _append_row([now, title, url, filepath, check.get('hash') or '', check.get('duration') or '',
+                         check.get('streams') or ''])
     except Exception as e:
         # 기록 실패가 프로그램 전체 에러로 이어지지 않게 예외 처리
-        print(f"[Warning] 기록 저장 실패: {e}")
\ No newline at end of file
+        Logger.warning(f"기록 저장 실패: {e}")
+
+
+def _append_row(row: list):
+    """기록 한 줄을 추가합니다. (잠금 보유 상태에서 호출)"""
+    file_exists = os.path.exists(HISTORY_FILE)
+    if file_exists and not _header_checked:
+        try:
+            _upgrade_header()
+        except Exception as e:
+            Logger.warning(f"기록 파일 헤더 변환 실패 (다음 기록 때 다시 시도): {e}")
+    # [수정됨] encoding='utf-8' -> 'utf-8-sig' (엑셀 호환성 해결)
+    with open(HISTORY_FILE, 'a', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        # 파일이 처음 생성될 때만 헤더 작성
+        if not file_exists:
+            writer.writerow(HEADER)
+        writer.writerow(row)
+
+
+def _upgrade_header():
+    """
+    검증 열이 없던 이전 형식의 기록 파일은 헤더만 새 형식으로 바꿉니다. (기존 행은 빈 값으로 취급; 잠금 보유 상태에서 호출)
+    성공한 뒤에만 확인 완료로 표시하므로 실패하면 다음 기록 때 다시 시도합니다. (프로세스당 한 번)
+    """
+    global _header_checked
+    with open(HISTORY_FILE, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        rows = [header] + list(reader) if header and len(header) < len(HEADER) else None
+    if rows:
+        rows[0] = HEADER
+        tmp_path = f"{HISTORY_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', newline='', encoding='utf-8-sig') as f:
+            csv.writer(f).writerows(rows)
+        os.replace(tmp_path, HISTORY_FILE)
+    _header_checked = True
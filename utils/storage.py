@@ -0,0 +1,209 @@
+import errno
+import hashlib
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+
+# 작업 중인 파일로 간주하여 최종 이동에서 제외할 확장자
+PARTIAL_SUFFIXES = ('.part', '.ytdl', '.temp', '.incoming')
+# 이름 중간에 표시가 있는 중간 파일 (병합 전 포맷별 조각 'x.f137.mp4', 병합 중 'x.temp.mkv')
+_INTERMEDIATE = re.compile(r'\.(?:f\d[\w-]*|temp)\.[^.]+$')
+
+# 결과물 무결성 해시 (BLAKE2b-256: SHA-256보다 빠르고 같은 수준의 충돌 저항성)
+DIGEST_ALGO = 'blake2b-256'
+COPY_CHUNK = 1024 * 1024
+
+# 최종 이동(다른 디스크 복사) 중에 계산한 해시 - 검증 단계에서 파일을 다시 읽지 않도록 보관
+_inline_digests = {}
+INLINE_DIGEST_MAX = 4096
+_digest_lock = threading.Lock()
+
+
+class InsufficientSpaceError(Exception):
+    """사전 점검에서 여유 공간이 부족한 경우"""
+
+
+def get_free_space(path: str) -> int | None:
+    """경로(또는 가장 가까운 상위 폴더)가 속한 디스크의 여유 공간(bytes)을 반환합니다."""
+    probe = os.path.abspath(path)
+    while probe and not os.path.exists(probe):
+        parent = os.path.dirname(probe)
+        if parent == probe: break
+        probe = parent
+    try:
+        return shutil.disk_usage(probe).free
+    except OSError:
+        return None
+
+
+def check_free_space(path: str, required_bytes: int, label: str = ""):
+    """필요 용량보다 여유 공간이 적으면 InsufficientSpaceError를 발생시킵니다. (용량을 알 수 없으면 통과)"""
+    if not required_bytes:
+        return
+    free = get_free_space(path)
+    if free is not None and free < required_bytes:
+        raise InsufficientSpaceError(
+            f"{label or path}: 여유 공간 부족 (필요 {format_bytes(required_bytes)}, 남은 공간 {format_bytes(free)})"
+        )
+
+
+def format_bytes(num: int) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(num) < 1024:
+            return f"{num:.1f}{unit}"
+        num /= 1024
+    return f"{num:.1f}TB"
+
+
+def get_staging_dir(staging_root: str, output_dir: str, job_key: str = None) -> str:
+    """
+    출력 폴더별 스테이징 폴더 경로를 반환합니다. job_key를 주면 그 아래 작업 전용 하위 폴더를 씁니다.
+    같은 출력 폴더(와 같은 작업)는 항상 같은 스테이징 폴더를 쓰므로, 중단된 .part 파일을 다음 실행에서 이어받을 수 있습니다.
+    작업마다 폴더를 나누므로 동시에 도는 다른 작업의 중간 파일을 최종 이동에서 건드리지 않습니다.
+    """
+    key = hashlib.sha1(os.path.abspath(output_dir).encode('utf-8')).hexdigest()[:12]
+    path = os.path.join(staging_root, f"ytdl_{key}")
+    if job_key:
+        path = os.path.join(path, f"job_{hashlib.sha1(job_key.encode('utf-8')).hexdigest()[:12]}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def remove_empty_dir(path: str):
+    """다 옮긴 작업 전용 스테이징 폴더 정리 (남은 파일이 있으면 다음 실행의 이어받기를 위해 그대로 둠)"""
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    프로세스 간 배타 잠금 (잠금 파일 기준)
+    여러 프로세스가 같은 색인 파일을 읽고 → 병합하고 → 쓰는 구간을 보호합니다.
+    """
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # 약 10초 재시도 후 OSError
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def find_job_outputs(work_dir: str, stem: str) -> list:
+    """
+    폴더에서 특정 항목(파일명 stem)에 속한 완성 파일만 찾습니다. (영상, 자막, 썸네일 등)
+    'Part 1'의 부속 파일은 'Part 1.en.vtt'처럼 점 바로 뒤에 공백이 없으므로 'Part 1. Intro.mp4'는 제외합니다.
+    """
+    outputs = []
+    for name in os.listdir(work_dir):
+        if name != stem and not (name.startswith(stem + '.') and not name[len(stem) + 1:].startswith(' ')):
+            continue
+        if name.endswith(PARTIAL_SUFFIXES) or _INTERMEDIATE.search(name):
+            continue
+        path = os.path.join(work_dir, name)
+        if os.path.isfile(path):
+            outputs.append(path)
+    return outputs
+
+
+def finalize_file(src: str, dest_dir: str) -> str:
+    """
+    완성된 파일을 최종 폴더로 원자적으로 옮깁니다.
+    - 같은 디스크: os.replace (rename 한 번)
+    - 다른 디스크(NAS 등): 숨김 임시 이름으로 한 번 순차 복사 후 rename
+      → 최종 폴더에는 완성된 파일만 나타나고, 쓰기는 정확히 한 번 발생합니다.
+    """
+    dest = os.path.join(dest_dir, os.path.basename(src))
+    if os.path.abspath(src) == os.path.abspath(dest):
+        return dest
+
+    os.makedirs(dest_dir, exist_ok=True)
+    try:
+        os.replace(src, dest)
+        return dest
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    incoming = os.path.join(dest_dir, f".{os.path.basename(src)}.incoming")
+    try:
+        digest = copy_with_digest(src, incoming)
+        os.replace(incoming, dest)
+    except Exception:
+        if os.path.exists(incoming): os.remove(incoming)
+        raise
+    os.remove(src)
+    with _digest_lock:
+        _inline_digests[os.path.abspath(dest)] = digest
+        if len(_inline_digests) > INLINE_DIGEST_MAX:  # 검증을 끈 경우에도 무한히 쌓이지 않도록
+            _inline_digests.pop(next(iter(_inline_digests)))
+    return dest
+
+
+def _new_digest():
+    return hashlib.blake2b(digest_size=32)
+
+
+def copy_with_digest(src: str, dest: str) -> str:
+    """파일을 순차 복사하면서 지나가는 바이트로 해시를 계산합니다. ('blake2b-256:<hex>')"""
+    digest = _new_digest()
+    with open(src, 'rb') as fin, open(dest, 'wb') as fout:
+        while chunk := fin.read(COPY_CHUNK):
+            digest.update(chunk)
+            fout.write(chunk)
+    return f"{DIGEST_ALGO}:{digest.hexdigest()}"
+
+
+def file_digest(path: str) -> str:
+    """
+    결과물의 내용 해시를 반환합니다. ('blake2b-256:<hex>')
+    최종 이동 중 이미 계산한 값이 있으면 그대로 쓰고(다시 읽지 않음), 없으면 방금 쓴 파일을 한 번 읽습니다.
+    (같은 디스크 이동/직접 기록은 쓰기 직후라 대부분 페이지 캐시에서 읽힘)
+    """
+    with _digest_lock:
+        digest = _inline_digests.pop(os.path.abspath(path), None)
+    if digest:
+        return digest
+    digest = _new_digest()
+    with open(path, 'rb') as f:
+        while chunk := f.read(COPY_CHUNK):
+            digest.update(chunk)
+    return f"{DIGEST_ALGO}:{digest.hexdigest()}"
+
+
+def link_or_copy(src: str, dest_dir: str) -> str:
+    """
+    완성된 파일을 다른 폴더에 배치합니다.
+    하드링크를 우선 사용하여 추가 디스크 쓰기를 없애고, 불가능하면(다른 디스크 등) 복사합니다.
+    """
+    dest = os.path.join(dest_dir, os.path.basename(src))
+    os.makedirs(dest_dir, exist_ok=True)
+    if os.path.exists(dest):
+        if os.path.samefile(src, dest):
+            return dest
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+    return dest
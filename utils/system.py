@@ -1,8 +1,10 @@
 import os
+import re
 import sys
 import shlex
 import subprocess
 import pyperclip
+from urllib.parse import parse_qs, urlparse
 from ui.logger import Logger
 
 def open_file_explorer(path):
@@ -27,6 +29,32 @@ def get_clipboard_url():
         pass
     return None
 
+def extract_video_id(url: str) -> str | None:
+    """네트워크 요청 없이 유튜브 URL에서 영상 ID를 추출합니다. (watch?v=, youtu.be/, shorts/, live/, embed/)"""
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    host = (parsed.hostname or '').lower()
+
+    if host.endswith('youtu.be'):
+        vid = parsed.path.strip('/').split('/')[0]
+        return vid or None
+    if 'youtube.com' in host:
+        qs = parse_qs(parsed.query)
+        if 'v' in qs:
+            return qs['v'][0]
+        if match := re.match(r'^/(?:shorts|live|embed)/([\w-]+)', parsed.path):
+            return match.group(1)
+    return None
+
+def is_collection_url(url: str) -> bool:
+    """재생목록/채널처럼 여러 영상을 담은 URL인지 판별합니다."""
+    if 'list=' in url:
+        return True
+    path = urlparse(url).path
+    return path.startswith(('/playlist', '/@', '/channel/', '/c/', '/user/'))
+
 def parse_input_string(input_str: str) -> list:
     """사용자 입력 문자열(URL 또는 파일 경로)을 파싱하여 작업 목록 반환"""
     if not input_str: return []
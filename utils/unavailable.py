@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+
+from ui.logger import Logger
+from utils.storage import file_lock
+from utils.system import extract_video_id
+
+UNAVAILABLE_FILE = 'unavailable_cache.json'
+
+# 실패 분류별 yt-dlp 오류 문구 (소문자 비교; 앞쪽 분류 우선)
+UNAVAILABLE_MARKERS = {
+    'members_only': ('members-only', 'join this channel to get access'),
+    'private': ('private video', 'this video is private'),
+    'region_blocked': ('not available in your country', 'not made this video available in your country',
+                       'geo restrict', 'blocked it in your country'),
+    # 'Video unavailable'만으로는 판단하지 않음 (일시적 차단도 같은 문구로 시작하므로 뒤따르는 사유로 구분)
+    'removed': ('has been removed', 'no longer available', 'account associated with this video has been terminated',
+                'this video does not exist', 'deleted video'),
+    'login_required': ('sign in to confirm your age', 'age-restricted', 'inappropriate for some users'),
+    'upcoming': ('premieres in', 'this live event will begin', 'scheduled to start'),
+}
+
+# 일시적인 실패(요청 제한 등): 접근 불가 문구가 함께 있어도 기록하지 않고 일반 재시도
+# 예) "Video unavailable. This content isn't available, try again later."
+TRANSIENT_MARKERS = ('try again later', 'too many requests', 'rate-limited', 'rate limited')
+
+# 분류별 재확인 주기(초): 삭제는 거의 돌아오지 않고, 예정된 라이브/프리미어는 곧 열림
+DEFAULT_TTL = {
+    'removed': 30 * 86400,
+    'private': 7 * 86400,
+    'members_only': 7 * 86400,
+    'region_blocked': 3 * 86400,
+    'login_required': 86400,
+    'upcoming': 3600,
+}
+
+# extract_flat 재생목록 항목의 자리표시 제목 (영상 정보를 추출하지 않고도 알 수 있는 경우)
+FLAT_PLACEHOLDERS = {'[private video]': 'private', '[deleted video]': 'removed'}
+
+
+def classify_unavailable(message: str) -> str | None:
+    """오류 메시지가 영상 자체의 접근 불가(비공개/삭제/멤버십/지역 제한 등)면 분류 이름, 아니면 None"""
+    text = (message or '').lower()
+    if any(m in text for m in TRANSIENT_MARKERS):
+        return None
+    for reason, markers in UNAVAILABLE_MARKERS.items():
+        if any(m in text for m in markers):
+            return reason
+    return None
+
+
+class UnavailableCache:
+    """
+    실행 간에 유지되는 접근 불가 영상 목록 (영상 ID → 분류 / 시각 / 메시지)
+    분류별 TTL 안에는 추출/재시도 없이 건너뛰고, TTL이 지나면 다시 시도합니다.
+    """
+
+    def __init__(self, path: str = UNAVAILABLE_FILE, ttl: dict = None):
+        self.path = path
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.stats = {'skipped': 0, 'recorded': 0}
+        self.load()
+
+    @classmethod
+    def from_config(cls, config):
+        """설정에서 경로를 비운 경우 None"""
+        if not config.get('unavailable_cache'):
+            return None
+        return cls(config.get('unavailable_cache'), config.get('unavailable_ttl'))
+
+    def load(self):
+        self.entries.update(self._read() or {})
+
+    def _read(self) -> dict | None:
+        """디스크의 목록 (파일이 없으면 빈 dict, 읽기 실패 시 None)"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            Logger.warning(f"접근 불가 목록 로드 중 오류: {e}")
+            return None
+
+    def check(self, video_id: str) -> dict | None:
+        """TTL이 지나지 않은 기록이 있으면 {'reason', 'time', 'message'}를 반환합니다."""
+        if not video_id:
+            return None
+        with self._lock:
+            entry = self.entries.get(video_id)
+            if not entry:
+                return None
+            if time.time() - entry['time'] >= self.ttl.get(entry['reason'], 0):
+                return None  # 만료: 다시 시도 (성공/재실패 시 갱신)
+            self.stats['skipped'] += 1
+            return entry
+
+    def filter_items(self, items: list) -> tuple:
+        """
+        큐에 넣을 항목에서 최근 접근 불가로 기록된 영상을 뺍니다. (kept, skipped)
+        재생목록 항목의 자리표시 제목([Private video] 등)은 추출하지 않고 바로 기록합니다.
+        """
+        kept, skipped = [], []
+        for item in items:
+            video_id = item.get('id') or extract_video_id(item['url'])
+            placeholder = FLAT_PLACEHOLDERS.get((item.get('title') or '').lower())
+            known = self.check(video_id)
+            if placeholder and not known:
+                self.record(video_id, placeholder, "재생목록 항목 제목")
+                known = self.check(video_id)
+            if known:
+                skipped.append({'url': item['url'], 'id': video_id, **known})
+            else:
+                kept.append(item)
+        return kept, skipped
+
+    def record(self, video_id: str, reason: str, message: str = ''):
+        if not video_id or not reason:
+            return
+        with self._lock:
+            self._update(video_id, {'reason': reason, 'time': time.time(), 'message': (message or '')[:200]})
+            self.stats['recorded'] += 1
+
+    def forget(self, video_id: str):
+        """다시 받을 수 있게 된 영상 (만료 후 재시도 성공)"""
+        with self._lock:
+            if video_id not in self.entries:
+                return
+            self._update(video_id, None)
+
+    def _update(self, video_id: str, entry: dict | None):
+        """
+        파일 잠금 안에서 디스크 목록을 다시 읽어 이 항목 하나만 바꾼(entry가 None이면 삭제) 뒤 원자적으로 교체합니다. (lock 보유 상태에서 호출)
+        메모리 사본을 병합해 쓰지 않으므로 다른 프로세스의 기록/삭제를 오래된 사본으로 되돌리지 않습니다.
+        """
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with file_lock(f"{self.path}.lock"):
+                entries = self._read()
+                if entries is None:
+                    entries = dict(self.entries)  # 손상된 파일은 메모리 사본으로 대체
+                if entry is None:
+                    entries.pop(video_id, None)
+                else:
+                    entries[video_id] = entry
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            self.entries = entries
+        except Exception as e:
+            Logger.warning(f"접근 불가 목록 저장 실패: {e}")
+            if entry is None:
+                self.entries.pop(video_id, None)
+            else:
+                self.entries[video_id] = entry